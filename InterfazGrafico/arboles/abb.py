@@ -1,10 +1,22 @@
+from bisect import bisect_left
+from typing import Iterable, Iterator
+
+from .agregados import Agregados
+
+
 class Nodo:
     """Clase que representa un nodo de un árbol binario."""
 
+    # Lápida del borrado perezoso; como atributo de clase no ocupa memoria
+    # en los nodos vivos
+    borrado = False
+
     def __init__(self, valor: int) -> None:
         self.valor: int = valor
         self.hijo_izquierdo: Nodo | None = None
         self.hijo_derecho: Nodo | None = None
+        # Altura del subárbol (lápidas incluidas), mantenida al insertar y eliminar
+        self.altura: int = 1
 
     def __repr__(self) -> str:
         return f"Nodo({self.valor})"
@@ -13,29 +25,375 @@ class Nodo:
 class ArbolBinario:
     """Implementación de un Árbol Binario de Búsqueda (ABB)."""
 
+    # Clase de nodo de todas las inserciones y constructores (las subclases la cambian)
+    clase_nodo = Nodo
+    # Proporción de lápidas sobre los nodos físicos a partir de la cual
+    # `eliminar_perezoso` compacta el árbol
+    umbral_compactacion = 0.25
+
     def __init__(self) -> None:
         self.raiz: Nodo | None = None
+        self.borrados = 0
+        # Cantidad, suma y extremos de los valores vivos
+        self.agregados = Agregados()
+
+    @property
+    def _nodos_fisicos(self) -> int:
+        return self.agregados.cantidad + self.borrados
+
+    @classmethod
+    def desde_ordenados(cls, valores: Iterable[int], cantidad: int | None = None) -> "ArbolBinario":
+        """Construye en O(n) un ABB balanceado a partir de valores ya ordenados.
+
+        `valores` se consume una sola vez en orden; si se da `cantidad` puede ser
+        un iterador (no se materializa en memoria).
+        """
+        if cantidad is None:
+            valores = list(valores)
+            cantidad = len(valores)
+        siguiente = iter(valores).__next__
+        suma = 0
+
+        def _construir(n: int) -> Nodo | None:
+            nonlocal suma
+            if n == 0:
+                return None
+            izquierdo = _construir(n // 2)
+            nodo = cls.clase_nodo(siguiente())
+            suma += nodo.valor
+            nodo.hijo_izquierdo = izquierdo
+            nodo.hijo_derecho = _construir(n - n // 2 - 1)
+            nodo.altura = 1 + (izquierdo.altura if izquierdo else 0)
+            return nodo
+
+        arbol = cls()
+        arbol.raiz = _construir(cantidad)
+        arbol.agregados.cantidad = cantidad
+        arbol.agregados.suma = suma
+        arbol._extremos()
+        return arbol
+
+    @classmethod
+    def desde_preorden(cls, valores: Iterable[int]) -> "ArbolBinario":
+        """Reconstruye en O(n) el árbol con la forma exacta que tenía su preorden."""
+        arbol = cls()
+        pila: list[Nodo] = []
+        for valor in valores:
+            nodo = cls.clase_nodo(valor)
+            if not pila:
+                arbol.raiz = nodo
+            elif valor < pila[-1].valor:
+                pila[-1].hijo_izquierdo = nodo
+            else:
+                padre = pila.pop()
+                while pila and pila[-1].valor <= valor:
+                    padre = pila.pop()
+                padre.hijo_derecho = nodo
+            pila.append(nodo)
+        arbol._recalcular()
+        return arbol
+
+    # -------------------- Alturas y agregados --------------------
+    def _actualizar_altura(self, nodo: Nodo) -> bool:
+        """Recalcula la altura de `nodo` a partir de sus hijos; True si cambió."""
+        izquierdo, derecho = nodo.hijo_izquierdo, nodo.hijo_derecho
+        altura = 1 + max(izquierdo.altura if izquierdo else 0, derecho.altura if derecho else 0)
+        if altura == nodo.altura:
+            return False
+        nodo.altura = altura
+        return True
+
+    def _crecer(self, camino: list[Nodo]) -> None:
+        """Alturas tras colgar una hoja bajo `camino[-1]`: solo pueden aumentar."""
+        altura = 2
+        for nodo in reversed(camino):
+            if nodo.altura >= altura:
+                return
+            nodo.altura = altura
+            altura += 1
+
+    def _subir_alturas(self, camino: list[Nodo]) -> None:
+        """Alturas tras desenganchar un nodo bajo `camino[-1]`."""
+        # Si un nodo no cambia de altura, tampoco cambian sus ancestros
+        for nodo in reversed(camino):
+            izquierdo, derecho = nodo.hijo_izquierdo, nodo.hijo_derecho
+            altura = 1 + max(izquierdo.altura if izquierdo else 0, derecho.altura if derecho else 0)
+            if altura == nodo.altura:
+                return
+            nodo.altura = altura
+
+    def _extremos(self) -> None:
+        """Recalcula el mínimo y el máximo vivos con dos descensos O(h)."""
+        agregados = self.agregados
+        if not agregados.cantidad:
+            agregados.minimo = agregados.maximo = None
+            return
+        nodo = self.raiz
+        while nodo.hijo_izquierdo is not None:
+            nodo = nodo.hijo_izquierdo
+        minimo = nodo.valor
+        nodo = self.raiz
+        while nodo.hijo_derecho is not None:
+            nodo = nodo.hijo_derecho
+        maximo = nodo.valor
+        if self.borrados:
+            minimo, maximo = next(self._ascendentes(minimo)), next(self._descendentes(maximo))
+        agregados.minimo, agregados.maximo = minimo, maximo
+
+    def _recalcular(self) -> None:
+        """Rehace alturas, lápidas y agregados en O(n) (árbol armado nodo a nodo)."""
+        agregados = Agregados()
+        borrados = 0
+        orden: list[Nodo] = []
+        pila = [self.raiz] if self.raiz is not None else []
+        while pila:
+            nodo = pila.pop()
+            orden.append(nodo)
+            for hijo in (nodo.hijo_izquierdo, nodo.hijo_derecho):
+                if hijo is not None:
+                    pila.append(hijo)
+        # Postorden invertido: cada nodo después de sus hijos
+        for nodo in reversed(orden):
+            self._actualizar_altura(nodo)
+            if nodo.borrado:
+                borrados += 1
+            else:
+                agregados.agregar(nodo.valor)
+        self.agregados = agregados
+        self.borrados = borrados
+
+    def vaciar(self) -> None:
+        self.raiz = None
+        self.borrados = 0
+        self.agregados = Agregados()
+
+    def estadisticas(self) -> dict:
+        """Cantidad, suma, mínimo, máximo, media y altura en O(1), sin recorrer nodos."""
+        return dict(self.agregados.como_dict(), altura=self.altura(), borrados=self.borrados)
 
     def insertar(self, valor: int) -> None:
-        self.insertar_nodo_recursivo(valor)
+        # Una lápida del mismo valor se revive en vez de colgar un nodo nuevo
+        if self.borrados:
+            lapida = self._nodo_igual(valor, borrado=True)
+            if lapida is not None:
+                lapida.borrado = False
+                self.borrados -= 1
+                self.agregados.agregar(valor)
+                return
+        # Iterativo: un ABB degenerado excede el límite de recursión
+        nuevo = self.clase_nodo(valor)
+        self.agregados.agregar(valor)
+        if self.raiz is None:
+            self.raiz = nuevo
+            return
+        camino: list[Nodo] = []
+        actual = self.raiz
+        while True:
+            camino.append(actual)
+            if valor < actual.valor:
+                if actual.hijo_izquierdo is None:
+                    self._colgar_hoja(actual, nuevo, izquierda=True)
+                    break
+                actual = actual.hijo_izquierdo
+            else:
+                if actual.hijo_derecho is None:
+                    self._colgar_hoja(actual, nuevo, izquierda=False)
+                    break
+                actual = actual.hijo_derecho
+        self._crecer(camino)
+
+    def _colgar_hoja(self, padre: Nodo, hoja: Nodo, izquierda: bool) -> None:
+        """Cuelga `hoja` en un enlace libre de `padre` (las subclases con hilos lo extienden)."""
+        if izquierda:
+            padre.hijo_izquierdo = hoja
+        else:
+            padre.hijo_derecho = hoja
 
     def insertar_nodo_recursivo(self, valor: int) -> None:
         def _insertar(raiz: Nodo | None, valor: int) -> Nodo:
             if raiz is None:
-                return Nodo(valor)
+                return self.clase_nodo(valor)
             if valor < raiz.valor:
                 raiz.hijo_izquierdo = _insertar(raiz.hijo_izquierdo, valor)
             else:
                 raiz.hijo_derecho = _insertar(raiz.hijo_derecho, valor)
+            self._actualizar_altura(raiz)
             return raiz
 
         self.raiz = _insertar(self.raiz, valor)
+        self.agregados.agregar(valor)
+
+    def insertar_lote(self, valores: Iterable[int]) -> None:
+        """Inserta varios valores con un único descenso compartido.
+
+        Los valores ordenados se reparten entre los dos subárboles en cada nodo,
+        así que cada nodo se visita una vez por lote y no una vez por valor.
+        Un grupo que llega a un hueco se cuelga como subárbol balanceado en vez
+        de como la cadena que dejarían las inserciones ordenadas.
+        """
+        ordenados = sorted(valores)
+        if not ordenados:
+            return
+        if self.raiz is None:
+            self.raiz = self.desde_ordenados(ordenados).raiz
+            self.agregados.agregar_ordenados(ordenados)
+            return
+        # Iterativo: un ABB degenerado excede el límite de recursión
+        visitados: list[Nodo] = []
+        pila = [(self.raiz, 0, len(ordenados))]
+        while pila:
+            nodo, inicio, fin = pila.pop()
+            visitados.append(nodo)
+            corte = bisect_left(ordenados, nodo.valor, inicio, fin)
+            if corte > inicio:
+                nodo.hijo_izquierdo = self._colgar(nodo.hijo_izquierdo, ordenados, inicio, corte, pila)
+            if fin > corte:
+                nodo.hijo_derecho = self._colgar(nodo.hijo_derecho, ordenados, corte, fin, pila)
+        # Cada nodo se visitó antes que sus hijos: al revés, los hijos van primero
+        for nodo in reversed(visitados):
+            self._actualizar_altura(nodo)
+        self.agregados.agregar_ordenados(ordenados)
+
+    def _colgar(self, hijo: Nodo | None, valores: list[int], inicio: int, fin: int,
+                pila: list[tuple[Nodo, int, int]]) -> Nodo:
+        if hijo is not None:
+            pila.append((hijo, inicio, fin))
+            return hijo
+        if fin - inicio == 1:
+            return self.clase_nodo(valores[inicio])
+        return self.desde_ordenados(valores[inicio:fin]).raiz
+
+    # -------------------- Eliminar --------------------
+    def _nodo_igual(self, valor: int, borrado: bool = False) -> Nodo | None:
+        """Nodo con `valor` y ese estado de lápida, o None.
+
+        Sin lápidas basta el descenso normal. Con lápidas, al encontrar un
+        igual que no sirve hay que mirar ambos lados: los constructores en
+        bloque pueden dejar repetidos también a la izquierda.
+        """
+        pendientes = [self.raiz]
+        while pendientes:
+            actual = pendientes.pop()
+            while actual is not None:
+                if valor < actual.valor:
+                    actual = actual.hijo_izquierdo
+                elif actual.valor < valor:
+                    actual = actual.hijo_derecho
+                elif actual.borrado == borrado:
+                    return actual
+                else:
+                    if actual.hijo_izquierdo is not None:
+                        pendientes.append(actual.hijo_izquierdo)
+                    actual = actual.hijo_derecho
+        return None
+
+    def eliminar(self, valor: int) -> bool:
+        """Quita físicamente una aparición de `valor`, de forma iterativa; False si no estaba.
+
+        Un nodo con dos hijos toma el valor (y el estado de lápida) de su
+        sucesor, el mínimo del subárbol derecho, y es éste el que se desengancha.
+        """
+        camino: list[Nodo] = []
+        actual = self.raiz
+        while actual is not None and (actual.valor != valor or actual.borrado):
+            if self.borrados and actual.valor == valor:
+                # Lápida con el mismo valor: buscar el nodo vivo con el caso general
+                return self._eliminar_nodo(self._nodo_igual(valor))
+            camino.append(actual)
+            actual = actual.hijo_izquierdo if valor < actual.valor else actual.hijo_derecho
+        if actual is None:
+            return False
+        self._desenganchar(camino, actual)
+        return True
+
+    def _eliminar_nodo(self, nodo: Nodo | None) -> bool:
+        if nodo is None:
+            return False
+        # Se necesitan sus ancestros: se repite el camino por identidad
+        camino: list[Nodo] = []
+        actual = self.raiz
+        # (largo del camino hasta el padre, hijo izquierdo por explorar)
+        pendientes: list[tuple[int, Nodo]] = []
+        while actual is not nodo:
+            if actual is None:
+                largo, actual = pendientes.pop()
+                del camino[largo:]
+                continue
+            camino.append(actual)
+            if nodo.valor < actual.valor:
+                actual = actual.hijo_izquierdo
+            elif actual.valor < nodo.valor:
+                actual = actual.hijo_derecho
+            else:
+                if actual.hijo_izquierdo is not None:
+                    pendientes.append((len(camino), actual.hijo_izquierdo))
+                actual = actual.hijo_derecho
+        self._desenganchar(camino, actual)
+        return True
+
+    def _desenganchar(self, camino: list[Nodo], nodo: Nodo) -> None:
+        """Quita `nodo`, vivo, del árbol; `camino` son sus ancestros desde la raíz."""
+        valor = nodo.valor
+        if nodo.hijo_izquierdo is not None and nodo.hijo_derecho is not None:
+            camino.append(nodo)
+            sucesor = nodo.hijo_derecho
+            while sucesor.hijo_izquierdo is not None:
+                camino.append(sucesor)
+                sucesor = sucesor.hijo_izquierdo
+            nodo.valor = sucesor.valor
+            if nodo.borrado != sucesor.borrado:
+                nodo.borrado = sucesor.borrado
+            nodo = sucesor
+        hijo = nodo.hijo_izquierdo if nodo.hijo_izquierdo is not None else nodo.hijo_derecho
+        self._reemplazar(camino[-1] if camino else None, nodo, hijo)
+        self._subir_alturas(camino)
+        if self.agregados.quitar(valor):
+            self._extremos()
+
+    def _reemplazar(self, padre: Nodo | None, nodo: Nodo, hijo: Nodo | None) -> None:
+        """Pone a `hijo` (su único hijo, o None) en el lugar de `nodo` bajo `padre`."""
+        if padre is None:
+            self.raiz = hijo
+        elif padre.hijo_izquierdo is nodo:
+            padre.hijo_izquierdo = hijo
+        else:
+            padre.hijo_derecho = hijo
+
+    def eliminar_lote(self, valores: Iterable[int]) -> list[int]:
+        """Elimina físicamente cada valor; devuelve los que estaban."""
+        return [valor for valor in valores if self.eliminar(valor)]
+
+    def eliminar_perezoso(self, valor: int) -> bool:
+        """Marca una aparición de `valor` como lápida en O(h), sin reestructurar.
+
+        Las lápidas se saltan en búsquedas y recorridos; cuando superan
+        `umbral_compactacion` de los nodos físicos, el árbol se compacta.
+        """
+        nodo = self._nodo_igual(valor)
+        if nodo is None:
+            return False
+        nodo.borrado = True
+        self.borrados += 1
+        extremo = self.agregados.quitar(valor)
+        if self.borrados > self.umbral_compactacion * self._nodos_fisicos:
+            self.compactar()
+        elif extremo:
+            self._extremos()
+        return True
+
+    def compactar(self) -> None:
+        """Quita todas las lápidas reconstruyendo el árbol balanceado en O(n)."""
+        compacto = type(self).desde_ordenados(list(self.iter_inorden()))
+        self.raiz = compacto.raiz
+        self.agregados = compacto.agregados
+        self.borrados = 0
 
     def inorden_recursivo(self) -> list[int]:
         def _in(nodo: Nodo | None, res: list[int]) -> None:
             if nodo:
                 _in(nodo.hijo_izquierdo, res)
-                res.append(nodo.valor)
+                if not nodo.borrado:
+                    res.append(nodo.valor)
                 _in(nodo.hijo_derecho, res)
 
         resultado: list[int] = []
@@ -45,7 +403,8 @@ class ArbolBinario:
     def preorden_recursivo(self) -> list[int]:
         def _pre(nodo: Nodo | None, res: list[int]) -> None:
             if nodo:
-                res.append(nodo.valor)
+                if not nodo.borrado:
+                    res.append(nodo.valor)
                 _pre(nodo.hijo_izquierdo, res)
                 _pre(nodo.hijo_derecho, res)
 
@@ -58,12 +417,220 @@ class ArbolBinario:
             if nodo:
                 _post(nodo.hijo_izquierdo, res)
                 _post(nodo.hijo_derecho, res)
-                res.append(nodo.valor)
+                if not nodo.borrado:
+                    res.append(nodo.valor)
 
         resultado: list[int] = []
         _post(self.raiz, resultado)
         return resultado
 
+    def postorden_iterativo(self) -> list[int]:
+        """Postorden con una pila explícita (un ABB degenerado excede el límite de recursión).
+
+        Se recorre raíz, derecho, izquierdo y se invierte el resultado.
+        """
+        resultado: list[int] = []
+        pila = [self.raiz] if self.raiz is not None else []
+        while pila:
+            nodo = pila.pop()
+            if not nodo.borrado:
+                resultado.append(nodo.valor)
+            if nodo.hijo_izquierdo is not None:
+                pila.append(nodo.hijo_izquierdo)
+            if nodo.hijo_derecho is not None:
+                pila.append(nodo.hijo_derecho)
+        resultado.reverse()
+        return resultado
+
+    def inorden_morris(self) -> list[int]:
+        """Inorden de Morris: O(1) memoria auxiliar (sin pila ni recursión).
+
+        Enlaza temporalmente cada predecesor con su nodo y deshace el enlace al
+        volver, así que el árbol no debe modificarse ni leerse desde otro hilo
+        durante el recorrido.
+        """
+        resultado: list[int] = []
+        actual = self.raiz
+        while actual is not None:
+            if actual.hijo_izquierdo is None:
+                if not actual.borrado:
+                    resultado.append(actual.valor)
+                actual = actual.hijo_derecho
+                continue
+            predecesor = actual.hijo_izquierdo
+            while predecesor.hijo_derecho is not None and predecesor.hijo_derecho is not actual:
+                predecesor = predecesor.hijo_derecho
+            if predecesor.hijo_derecho is None:
+                predecesor.hijo_derecho = actual
+                actual = actual.hijo_izquierdo
+            else:
+                predecesor.hijo_derecho = None
+                if not actual.borrado:
+                    resultado.append(actual.valor)
+                actual = actual.hijo_derecho
+        return resultado
+
+    def preorden_morris(self) -> list[int]:
+        """Preorden de Morris: O(1) memoria auxiliar (mismas condiciones que `inorden_morris`)."""
+        resultado: list[int] = []
+        actual = self.raiz
+        while actual is not None:
+            if actual.hijo_izquierdo is None:
+                if not actual.borrado:
+                    resultado.append(actual.valor)
+                actual = actual.hijo_derecho
+                continue
+            predecesor = actual.hijo_izquierdo
+            while predecesor.hijo_derecho is not None and predecesor.hijo_derecho is not actual:
+                predecesor = predecesor.hijo_derecho
+            if predecesor.hijo_derecho is None:
+                if not actual.borrado:
+                    resultado.append(actual.valor)
+                predecesor.hijo_derecho = actual
+                actual = actual.hijo_izquierdo
+            else:
+                predecesor.hijo_derecho = None
+                actual = actual.hijo_derecho
+        return resultado
+
+    def iter_inorden(self) -> Iterator[int]:
+        """Genera los valores en inorden de forma perezosa (pila de O(h)).
+
+        No usa Morris porque un generador puede abandonarse a mitad y dejaría
+        enlaces temporales en el árbol; `ArbolBinarioEnhebrado` lo hace sin pila.
+        """
+        pila: list[Nodo] = []
+        actual = self.raiz
+        while pila or actual is not None:
+            while actual is not None:
+                pila.append(actual)
+                actual = actual.hijo_izquierdo
+            actual = pila.pop()
+            if not actual.borrado:
+                yield actual.valor
+            actual = actual.hijo_derecho
+
+    def a_numpy(self, cantidad: int | None = None):
+        """Valores en inorden como arreglo `numpy.int64`, sin lista intermedia.
+
+        Con `cantidad` el arreglo se reserva de antemano y se llena durante el
+        recorrido; sin ella, numpy lo hace crecer a medida que llegan valores.
+        """
+        import numpy as np
+
+        return np.fromiter(self.iter_inorden(), dtype=np.int64, count=-1 if cantidad is None else cantidad)
+
+    def congelar(self, cantidad: int | None = None):
+        """Instantánea inmutable (`ArbolCongelado`) en disposición de Eytzinger; requiere numpy."""
+        from .congelado import ArbolCongelado
+
+        return ArbolCongelado(self.a_numpy(cantidad))
+
+    def sucesor(self, valor: int) -> int | None:
+        """Menor valor estrictamente mayor que `valor`, en O(h) y O(1) memoria."""
+        if self.borrados:
+            return next(self._ascendentes(valor, estricto=True), None)
+        candidato = None
+        actual = self.raiz
+        while actual is not None:
+            if valor < actual.valor:
+                candidato = actual.valor
+                actual = actual.hijo_izquierdo
+            else:
+                actual = actual.hijo_derecho
+        return candidato
+
+    # -------------------- Consultas por cercanía --------------------
+    def _ascendentes(self, valor: int, estricto: bool = False) -> Iterator[int]:
+        """Valores vivos >= `valor` (> si `estricto`) en orden creciente, con pila de O(h)."""
+        pila: list[Nodo] = []
+        actual = self.raiz
+        while actual is not None:
+            if valor < actual.valor or (not estricto and actual.valor == valor):
+                pila.append(actual)
+                actual = actual.hijo_izquierdo
+            else:
+                actual = actual.hijo_derecho
+        while pila:
+            nodo = pila.pop()
+            if not nodo.borrado:
+                yield nodo.valor
+            # Siguiente sucesor: el mínimo del subárbol derecho
+            siguiente = nodo.hijo_derecho
+            while siguiente is not None:
+                pila.append(siguiente)
+                siguiente = siguiente.hijo_izquierdo
+
+    def _descendentes(self, valor: int, estricto: bool = False) -> Iterator[int]:
+        """Valores vivos <= `valor` (< si `estricto`) en orden decreciente, con pila de O(h)."""
+        pila: list[Nodo] = []
+        actual = self.raiz
+        while actual is not None:
+            if actual.valor < valor or (not estricto and actual.valor == valor):
+                pila.append(actual)
+                actual = actual.hijo_derecho
+            else:
+                actual = actual.hijo_izquierdo
+        while pila:
+            nodo = pila.pop()
+            if not nodo.borrado:
+                yield nodo.valor
+            # Siguiente predecesor: el máximo del subárbol izquierdo
+            siguiente = nodo.hijo_izquierdo
+            while siguiente is not None:
+                pila.append(siguiente)
+                siguiente = siguiente.hijo_derecho
+
+    def piso(self, valor: int) -> int | None:
+        """Mayor valor <= `valor` (None si no hay), en O(h)."""
+        if self.borrados:
+            # Una lápida no puede ser candidata: se recorre hacia abajo hasta un vivo
+            return next(self._descendentes(valor), None)
+        candidato = None
+        actual = self.raiz
+        while actual is not None:
+            if actual.valor <= valor:
+                candidato = actual.valor
+                actual = actual.hijo_derecho
+            else:
+                actual = actual.hijo_izquierdo
+        return candidato
+
+    def techo(self, valor: int) -> int | None:
+        """Menor valor >= `valor` (None si no hay), en O(h)."""
+        if self.borrados:
+            return next(self._ascendentes(valor), None)
+        candidato = None
+        actual = self.raiz
+        while actual is not None:
+            if actual.valor >= valor:
+                candidato = actual.valor
+                actual = actual.hijo_izquierdo
+            else:
+                actual = actual.hijo_derecho
+        return candidato
+
+    def k_cercanos(self, valor: int, k: int) -> list[int]:
+        """Los `k` valores más cercanos a `valor`, del más cercano al más lejano.
+
+        Un solo descenso deja en dos pilas el camino de predecesores (< valor)
+        y de sucesores (>= valor); luego se avanza hacia ambos lados como en
+        una mezcla, en O(h + k). A igual distancia va primero el menor.
+        """
+        menores = self._descendentes(valor, estricto=True)
+        mayores = self._ascendentes(valor)
+        menor = next(menores, None)
+        mayor = next(mayores, None)
+        resultado: list[int] = []
+        while len(resultado) < k and (menor is not None or mayor is not None):
+            if mayor is not None and (menor is None or mayor - valor < valor - menor):
+                resultado.append(mayor)
+                mayor = next(mayores, None)
+            else:
+                resultado.append(menor)
+                menor = next(menores, None)
+        return resultado
+
     def amplitud(self) -> list[int]:
         if self.raiz is None:
             return []
@@ -73,7 +640,8 @@ class ArbolBinario:
         while i < len(cola):
             actual = cola[i]
             i += 1
-            resultado.append(actual.valor)
+            if not actual.borrado:
+                resultado.append(actual.valor)
             if actual.hijo_izquierdo is not None:
                 cola.append(actual.hijo_izquierdo)
             if actual.hijo_derecho is not None:
@@ -81,6 +649,8 @@ class ArbolBinario:
         return resultado
 
     def buscar(self, valor: int) -> bool:
+        if self.borrados:
+            return self._nodo_igual(valor) is not None
         actual = self.raiz
         while actual:
             if valor == actual.valor:
@@ -92,17 +662,146 @@ class ArbolBinario:
         return False
 
     def altura(self) -> int:
-        def _h(nodo: Nodo | None) -> int:
-            if nodo is None:
-                return 0
-            return 1 + max(_h(nodo.hijo_izquierdo), _h(nodo.hijo_derecho))
-
-        return _h(self.raiz)
+        """Niveles del árbol (lápidas incluidas), en O(1)."""
+        return self.raiz.altura if self.raiz is not None else 0
 
     def cantidad(self) -> int:
-        def _contar(nodo: Nodo | None) -> int:
-            if nodo is None:
-                return 0
-            return 1 + _contar(nodo.hijo_izquierdo) + _contar(nodo.hijo_derecho)
+        """Valores vivos, en O(1)."""
+        return self.agregados.cantidad
+
+
+class NodoEnhebrado(Nodo):
+    """Nodo de `ArbolBinarioEnhebrado`: sin hijo derecho, `hilo` es su sucesor inorden."""
+
+    # Los nodos con hijo derecho no lo usan; como atributo de clase no ocupa
+    # memoria hasta que el nodo se queda sin hijo derecho
+    hilo: "NodoEnhebrado | None" = None
+
+
+class ArbolBinarioEnhebrado(ArbolBinario):
+    """ABB enhebrado a derecha: cada nodo sin hijo derecho apunta a su sucesor inorden.
+
+    Con los hilos, `iter_inorden`, `sucesor` y las consultas por cercanía
+    hacia arriba (`techo`, `k_cercanos`) avanzan de un nodo al siguiente sin
+    pila, sin recursión y sin modificar el árbol, así que un recorrido
+    abandonado a mitad no deja nada que deshacer.
+
+    El hilo va en su propio atributo y no en el enlace derecho nulo: el resto
+    del paquete (instantáneas, réplicas compartidas, `estructura_json`,
+    Morris) sigue viendo un ABB normal. Insertar y eliminar (físico o
+    perezoso) mantienen los hilos en O(h); las lápidas se saltan al recorrer.
+    """
+
+    clase_nodo = NodoEnhebrado
+
+    @classmethod
+    def desde_ordenados(cls, valores: Iterable[int], cantidad: int | None = None) -> "ArbolBinarioEnhebrado":
+        arbol = super().desde_ordenados(valores, cantidad)
+        arbol._enhebrar()
+        return arbol
+
+    def _recalcular(self) -> None:
+        # Árbol armado nodo a nodo (`desde_preorden`, réplicas compartidas): faltan los hilos
+        super()._recalcular()
+        self._enhebrar()
+
+    def _enhebrar(self) -> None:
+        """Pone los hilos de todos los nodos en O(n) (con pila: el árbol aún no los tiene)."""
+        anterior: NodoEnhebrado | None = None
+        pila: list[NodoEnhebrado] = []
+        actual = self.raiz
+        while pila or actual is not None:
+            while actual is not None:
+                pila.append(actual)
+                actual = actual.hijo_izquierdo
+            actual = pila.pop()
+            if anterior is not None and anterior.hijo_derecho is None:
+                anterior.hilo = actual
+            anterior = actual
+            actual = actual.hijo_derecho
+        if anterior is not None:
+            anterior.hilo = None
+
+    @staticmethod
+    def _primero(nodo: NodoEnhebrado | None) -> NodoEnhebrado | None:
+        while nodo is not None and nodo.hijo_izquierdo is not None:
+            nodo = nodo.hijo_izquierdo
+        return nodo
+
+    def _siguiente(self, nodo: NodoEnhebrado) -> NodoEnhebrado | None:
+        """Sucesor inorden de `nodo`: el mínimo de su subárbol derecho o su hilo."""
+        if nodo.hijo_derecho is not None:
+            return self._primero(nodo.hijo_derecho)
+        return nodo.hilo
+
+    # -------------------- Mantenimiento de los hilos --------------------
+    def _colgar_hoja(self, padre: NodoEnhebrado, hoja: NodoEnhebrado, izquierda: bool) -> None:
+        if izquierda:
+            # Máximo del subárbol izquierdo de `padre`: lo sigue `padre`
+            hoja.hilo = padre
+        else:
+            # Ocupa el lugar del hilo de `padre`
+            hoja.hilo = padre.hilo
+            padre.hilo = None
+        super()._colgar_hoja(padre, hoja, izquierda)
+
+    def insertar_nodo_recursivo(self, valor: int) -> None:
+        # Los hilos se reparten al colgar la hoja, en la inserción iterativa
+        self.insertar(valor)
+
+    def insertar_lote(self, valores: Iterable[int]) -> None:
+        ordenados = sorted(valores)
+        if self.raiz is None:
+            # Un solo subárbol balanceado, enhebrado por `desde_ordenados`
+            super().insertar_lote(ordenados)
+            return
+        # Colgar subárboles construidos aparte obligaría a rehacer los hilos de
+        # sus extremos: se insertan uno a uno, O(h) cada uno
+        for valor in ordenados:
+            self.insertar(valor)
+
+    def _reemplazar(self, padre: NodoEnhebrado | None, nodo: NodoEnhebrado,
+                    hijo: NodoEnhebrado | None) -> None:
+        # `nodo` tiene a lo sumo un hijo. Solo su predecesor puede tener un
+        # hilo hacia él, y solo si es el máximo de su subárbol izquierdo.
+        if nodo.hijo_izquierdo is not None:
+            predecesor = nodo.hijo_izquierdo
+            while predecesor.hijo_derecho is not None:
+                predecesor = predecesor.hijo_derecho
+            predecesor.hilo = nodo.hilo
+        elif hijo is None and padre is not None and padre.hijo_derecho is nodo:
+            # `padre` se queda sin hijo derecho: su sucesor pasa a ser el de `nodo`
+            padre.hilo = nodo.hilo
+        super()._reemplazar(padre, nodo, hijo)
+
+    # -------------------- Recorridos sin pila --------------------
+    def iter_inorden(self) -> Iterator[int]:
+        """Genera los valores en inorden siguiendo los hilos: O(1) memoria auxiliar."""
+        nodo = self._primero(self.raiz)
+        while nodo is not None:
+            if not nodo.borrado:
+                yield nodo.valor
+            nodo = self._siguiente(nodo)
+
+    def inorden_morris(self) -> list[int]:
+        # Los hilos ya están: no hace falta enlazar y desenlazar predecesores
+        return list(self.iter_inorden())
+
+    def _ascendentes(self, valor: int, estricto: bool = False) -> Iterator[int]:
+        """Valores vivos >= `valor` (> si `estricto`) en orden creciente, sin pila."""
+        nodo = None
+        actual = self.raiz
+        while actual is not None:
+            if valor < actual.valor or (not estricto and actual.valor == valor):
+                nodo = actual
+                actual = actual.hijo_izquierdo
+            else:
+                actual = actual.hijo_derecho
+        while nodo is not None:
+            if not nodo.borrado:
+                yield nodo.valor
+            nodo = self._siguiente(nodo)
 
-        return _contar(self.raiz)
\ No newline at end of file
+    def sucesor(self, valor: int) -> int | None:
+        """Menor valor vivo estrictamente mayor que `valor`: un descenso y, si hay lápidas, los hilos."""
+        return next(self._ascendentes(valor, estricto=True), None)
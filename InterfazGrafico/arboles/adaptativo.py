@@ -0,0 +1,199 @@
+"""Árbol adaptativo: empieza como ABB y migra a AVL si detecta sesgo.
+
+Un `ArbolBinario` inserta más barato que un AVL (no rota ni mantiene
+equilibrio), pero con entradas ordenadas degenera en una lista y toda
+operación pasa a ser O(n). `ArbolAdaptativo` usa un ABB mientras su altura
+se mantiene cerca de la de un árbol aleatorio; cuando supera
+`factor_sesgo · log2(cantidad)` (la altura y la cantidad son O(1)), lo
+convierte en un `ArbolAVL` balanceado en tiempo lineal:
+
+1. Copia el inorden del ABB. Es O(n) y se hace dentro de la operación que
+   dispara la migración, con el bloqueo de quien llama tomado: las demás
+   operaciones sobre ese árbol esperan a que termine (unos 0,13 s por millón
+   de valores; queda en `segundos_copia` de cada migración). No puede
+   hacerse fuera del bloqueo porque el ABB no admite lecturas concurrentes
+   con escrituras, ni por tramos: retomar el recorrido desde un valor
+   desciende O(altura), que en un ABB sesgado es O(n) por tramo.
+2. Un hilo aparte construye el AVL con `desde_ordenados`, que es la parte
+   cara; mientras tanto el ABB sigue atendiendo lecturas y escrituras, y las
+   escrituras se anotan.
+3. La siguiente operación sobre el árbol reaplica las escrituras anotadas
+   al AVL y lo pone en servicio (`completar_migracion`).
+
+Como los demás árboles del paquete, no es seguro para hilos: quien llama
+debe serializar las operaciones (el registro de la app ya lo hace). El hilo
+de construcción solo lee su propia copia de los valores.
+"""
+import math
+import threading
+import time
+from typing import Iterable
+
+from .abb import ArbolBinario
+from .avl import ArbolAVL
+
+
+class ArbolAdaptativo:
+    """ABB que se convierte en AVL cuando su altura delata entradas sesgadas.
+
+    Las operaciones que no modifican el árbol se delegan en el motor actual
+    (`motor`), así que expone la misma interfaz de lectura que el ABB o el
+    AVL que tenga debajo.
+    """
+
+    # Se migra cuando altura > factor_sesgo · log2(cantidad). Un ABB con
+    # inserciones aleatorias ronda 3 · log2(n), así que 4 no se dispara con
+    # datos aleatorios y sí en pocas decenas de inserciones ordenadas
+    factor_sesgo = 4.0
+    # Por debajo de este tamaño una lista degenerada todavía es barata
+    minimo_nodos = 64
+    # False: la migración se hace dentro de la operación que la dispara (p. ej.
+    # en el escritor del modo compartido, que publica la forma al terminar cada lote)
+    en_segundo_plano = True
+
+    def __init__(self, motor: ArbolBinario | ArbolAVL | None = None) -> None:
+        self.motor: ArbolBinario | ArbolAVL = motor if motor is not None else ArbolBinario()
+        self.migraciones: list[dict] = []
+        # Migración en curso: escrituras anotadas desde la copia, y la caja
+        # donde su hilo deja el AVL construido (cada migración tiene la suya,
+        # así un hilo de una migración descartada no pisa a la siguiente)
+        self._pendientes: list[tuple[str, list[int]]] | None = None
+        self._construido: list[tuple[ArbolAVL, float]] | None = None
+        self._inicio: dict | None = None
+        self._avisadas = 0
+
+    def __getattr__(self, nombre: str):
+        # Solo se llama para lo que no define esta clase: lecturas del motor
+        if 'motor' not in self.__dict__:
+            raise AttributeError(nombre)
+        self.completar_migracion()
+        return getattr(self.motor, nombre)
+
+    @classmethod
+    def desde_ordenados(cls, valores: Iterable[int], cantidad: int | None = None) -> "ArbolAdaptativo":
+        # Un ABB construido desde valores ordenados ya está balanceado
+        return cls(ArbolBinario.desde_ordenados(valores, cantidad))
+
+    @classmethod
+    def desde_preorden(cls, valores: Iterable[int]) -> "ArbolAdaptativo":
+        arbol = cls(ArbolBinario.desde_preorden(valores))
+        arbol._vigilar()
+        return arbol
+
+    @property
+    def migrando(self) -> bool:
+        return self._pendientes is not None
+
+    # -------------------- Escrituras --------------------
+    def insertar(self, valor: int) -> None:
+        self.completar_migracion()
+        self.motor.insertar(valor)
+        self._anotar('insertar', [valor])
+
+    def insertar_lote(self, valores: Iterable[int]) -> None:
+        self.completar_migracion()
+        valores = list(valores)
+        self.motor.insertar_lote(valores)
+        self._anotar('insertar', valores)
+
+    def eliminar(self, valor: int) -> bool:
+        self.completar_migracion()
+        if not self.motor.eliminar(valor):
+            return False
+        self._anotar('eliminar', [valor])
+        return True
+
+    def eliminar_lote(self, valores: Iterable[int]) -> list[int]:
+        self.completar_migracion()
+        eliminados = self.motor.eliminar_lote(valores)
+        self._anotar('eliminar', eliminados)
+        return eliminados
+
+    def vaciar(self) -> None:
+        # Árbol nuevo: vuelve a empezar como ABB y descarta la migración en curso
+        self._pendientes = self._construido = self._inicio = None
+        self.motor = ArbolBinario()
+
+    def inorden(self) -> list[int]:
+        return list(self.motor.iter_inorden())
+
+    def _anotar(self, operacion: str, valores: list[int]) -> None:
+        if self._pendientes is not None:
+            if valores:
+                self._pendientes.append((operacion, valores))
+        else:
+            self._vigilar()
+
+    # -------------------- Migración --------------------
+    def sesgado(self) -> bool:
+        """True si el motor es un ABB más alto que `factor_sesgo · log2(cantidad)`."""
+        if not isinstance(self.motor, ArbolBinario):
+            return False
+        cantidad = self.motor.cantidad()
+        return cantidad >= self.minimo_nodos and self.motor.altura() > self.factor_sesgo * math.log2(cantidad)
+
+    def _vigilar(self) -> None:
+        if self.sesgado():
+            self.migrar()
+
+    def migrar(self) -> None:
+        """Empieza a convertir el ABB en un AVL (en un hilo, salvo `en_segundo_plano=False`).
+
+        La copia del inorden se hace aquí, en O(n) y sin soltar al llamador
+        (ver el paso 1 del módulo); solo la construcción va al hilo.
+        """
+        if self._pendientes is not None or not isinstance(self.motor, ArbolBinario):
+            return
+        inicio = time.perf_counter()
+        valores = list(self.motor.iter_inorden())
+        self._pendientes = []
+        self._inicio = {'cantidad': len(valores), 'altura_abb': self.motor.altura(), 'inicio': time.time(),
+                        'segundos_copia': time.perf_counter() - inicio}
+        caja: list[tuple[ArbolAVL, float]] = []
+        self._construido = caja
+
+        def _construir() -> None:
+            inicio = time.perf_counter()
+            avl = ArbolAVL.desde_ordenados(valores, len(valores))
+            # append es atómico: la operación siguiente lo recoge
+            caja.append((avl, time.perf_counter() - inicio))
+
+        if self.en_segundo_plano:
+            threading.Thread(target=_construir, name='migracion-avl', daemon=True).start()
+        else:
+            _construir()
+            self.completar_migracion()
+
+    def completar_migracion(self) -> bool:
+        """Pone en servicio el AVL si el hilo ya lo construyó; True si lo hizo ahora."""
+        if not self._construido:
+            return False
+        avl, segundos = self._construido[0]
+        # Las escrituras hechas en el ABB durante la construcción
+        for operacion, valores in self._pendientes:
+            if operacion == 'insertar':
+                avl.insertar_lote(valores)
+            else:
+                avl.eliminar_lote(valores)
+        avl.ultimas_rotaciones = []
+        self.migraciones.append(dict(self._inicio, altura_avl=avl.altura(), segundos_construccion=segundos,
+                                     pendientes=sum(len(v) for _, v in self._pendientes),
+                                     fin=time.time()))
+        self.motor = avl
+        self._pendientes = self._construido = self._inicio = None
+        return True
+
+    def migraciones_nuevas(self) -> list[dict]:
+        """Migraciones completadas desde la última llamada (para avisar de cada una una vez)."""
+        self.completar_migracion()
+        nuevas = self.migraciones[self._avisadas:]
+        self._avisadas = len(self.migraciones)
+        return nuevas
+
+    def estadisticas(self) -> dict:
+        self.completar_migracion()
+        return dict(self.motor.estadisticas(),
+                    motor='abb' if isinstance(self.motor, ArbolBinario) else 'avl',
+                    migrando=self.migrando,
+                    migraciones=len(self.migraciones),
+                    ultima_migracion=self.migraciones[-1] if self.migraciones else None)
@@ -0,0 +1,67 @@
+"""Estadísticas de un árbol (cantidad, suma, mínimo, máximo) mantenidas en O(1).
+
+Los árboles actualizan su `Agregados` en cada inserción y eliminación, así
+que consultarlas no recorre los nodos. Solo quitar el mínimo o el máximo
+obliga a buscar el nuevo extremo; eso lo hace el propio árbol con un
+descenso O(h), que ya es el costo de la eliminación.
+"""
+from typing import Iterable
+
+
+class Agregados:
+    """Cantidad, suma y extremos del multiconjunto de valores vivos de un árbol."""
+
+    __slots__ = ('cantidad', 'suma', 'minimo', 'maximo')
+
+    def __init__(self) -> None:
+        self.cantidad = 0
+        self.suma = 0
+        self.minimo: int | None = None
+        self.maximo: int | None = None
+
+    @classmethod
+    def desde_valores(cls, valores: Iterable[int]) -> "Agregados":
+        """Agregados de una colección cualquiera, en una pasada O(n)."""
+        agregados = cls()
+        for valor in valores:
+            agregados.agregar(valor)
+        return agregados
+
+    def agregar(self, valor: int) -> None:
+        if not self.cantidad:
+            self.minimo = self.maximo = valor
+        elif valor < self.minimo:
+            self.minimo = valor
+        elif valor > self.maximo:
+            self.maximo = valor
+        self.cantidad += 1
+        self.suma += valor
+
+    def agregar_ordenados(self, ordenados: list[int]) -> None:
+        """Como `agregar` para cada valor de una lista ya ordenada."""
+        if not ordenados:
+            return
+        if not self.cantidad or ordenados[0] < self.minimo:
+            self.minimo = ordenados[0]
+        if not self.cantidad or ordenados[-1] > self.maximo:
+            self.maximo = ordenados[-1]
+        self.cantidad += len(ordenados)
+        self.suma += sum(ordenados)
+
+    def quitar(self, valor: int) -> bool:
+        """Resta una aparición de `valor`; True si era un extremo y hay que recalcularlos."""
+        self.cantidad -= 1
+        self.suma -= valor
+        if not self.cantidad:
+            self.minimo = self.maximo = None
+            return False
+        return valor == self.minimo or valor == self.maximo
+
+    def como_dict(self) -> dict:
+        return {
+            'cantidad': self.cantidad,
+            'suma': self.suma,
+            'minimo': self.minimo,
+            'maximo': self.maximo,
+            'media': self.suma / self.cantidad if self.cantidad else None
+        }
@@ -1,3 +1,10 @@
+from bisect import bisect_left
+from collections import Counter
+from typing import Iterable, Iterator
+
+from .agregados import Agregados
+
+
 class NodoAVL:
     """Nodo de un Árbol AVL."""
     def __init__(self, valor: int) -> None:
@@ -17,8 +24,74 @@ class NodoAVL:
 
 class ArbolAVL:
     """Árbol AVL (ABB auto-balanceado)."""
+
+    # Clase de los nodos que crea el árbol (las subclases pueden guardar más datos por nodo)
+    clase_nodo = NodoAVL
+
     def __init__(self) -> None:
         self.raiz: NodoAVL | None = None
+        # Rotaciones (tipo, valor del pivote) hechas por la última operación
+        self.ultimas_rotaciones: list[tuple[str, int]] = []
+        # Cantidad, suma y extremos de los valores
+        self.agregados = Agregados()
+
+    @classmethod
+    def desde_ordenados(cls, valores: Iterable[int], cantidad: int | None = None) -> "ArbolAVL":
+        """Construye en O(n) un AVL perfectamente balanceado a partir de valores ya ordenados.
+
+        `valores` se consume una sola vez en orden; si se da `cantidad` puede ser
+        un iterador (no se materializa en memoria).
+        """
+        if cantidad is None:
+            valores = list(valores)
+            cantidad = len(valores)
+        siguiente = iter(valores).__next__
+        suma = 0
+
+        def _construir(n: int) -> NodoAVL | None:
+            nonlocal suma
+            if n == 0:
+                return None
+            izquierdo = _construir(n // 2)
+            nodo = cls.clase_nodo(siguiente())
+            suma += nodo.valor
+            nodo.izquierdo = izquierdo
+            nodo.derecho = _construir(n - n // 2 - 1)
+            nodo.altura = 1 + (izquierdo.altura if izquierdo else 0)
+            return nodo
+
+        arbol = cls()
+        arbol.raiz = _construir(cantidad)
+        arbol.agregados.cantidad = cantidad
+        arbol.agregados.suma = suma
+        arbol._extremos()
+        return arbol
+
+    # -------------------- Agregados --------------------
+    def _extremos(self) -> None:
+        """Recalcula mínimo y máximo con dos descensos O(log n)."""
+        if self.raiz is None:
+            self.agregados.minimo = self.agregados.maximo = None
+            return
+        nodo = self.raiz
+        while nodo.derecho:
+            nodo = nodo.derecho
+        self.agregados.minimo, self.agregados.maximo = self._min_nodo(self.raiz).valor, nodo.valor
+
+    def vaciar(self) -> None:
+        self.raiz = None
+        self.agregados = Agregados()
+
+    def altura(self) -> int:
+        """Niveles del árbol, en O(1) (cada nodo guarda la altura de su subárbol)."""
+        return self._altura(self.raiz)
+
+    def cantidad(self) -> int:
+        return self.agregados.cantidad
+
+    def estadisticas(self) -> dict:
+        """Cantidad, suma, mínimo, máximo, media y altura en O(1), sin recorrer nodos."""
+        return dict(self.agregados.como_dict(), altura=self.altura())
 
     def _altura(self, nodo: NodoAVL | None) -> int:
         return nodo.altura if nodo else 0
@@ -27,6 +100,7 @@ class ArbolAVL:
         nodo.altura = 1 + max(self._altura(nodo.izquierdo), self._altura(nodo.derecho))
 
     def _rotar_derecha(self, y: NodoAVL) -> NodoAVL:
+        self.ultimas_rotaciones.append(('derecha', y.valor))
         x = y.izquierdo
         assert x is not None
         T2 = x.derecho
@@ -37,6 +111,7 @@ class ArbolAVL:
         return x
 
     def _rotar_izquierda(self, x: NodoAVL) -> NodoAVL:
+        self.ultimas_rotaciones.append(('izquierda', x.valor))
         y = x.derecho
         assert y is not None
         T2 = y.izquierdo
@@ -67,11 +142,13 @@ class ArbolAVL:
         return nodo
 
     def insertar(self, valor: int) -> None:
+        self.ultimas_rotaciones = []
         self.raiz = self._insertar(self.raiz, valor)
+        self.agregados.agregar(valor)
 
     def _insertar(self, nodo: NodoAVL | None, valor: int) -> NodoAVL:
         if nodo is None:
-            return NodoAVL(valor)
+            return self.clase_nodo(valor)
         if valor < nodo.valor:
             nodo.izquierdo = self._insertar(nodo.izquierdo, valor)
         else:
@@ -80,8 +157,16 @@ class ArbolAVL:
         self._actualizar_altura(nodo)
         return self._balancear(nodo)
 
-    def eliminar(self, valor: int) -> None:
+    def eliminar(self, valor: int) -> bool:
+        """Quita una aparición de `valor`; False si no estaba."""
+        self.ultimas_rotaciones = []
+        self._desenganchado = False
         self.raiz = self._eliminar(self.raiz, valor)
+        if not self._desenganchado:
+            return False
+        if self.agregados.quitar(valor):
+            self._extremos()
+        return True
 
     def _eliminar(self, nodo: NodoAVL | None, valor: int) -> NodoAVL | None:
         if nodo is None:
@@ -92,6 +177,10 @@ class ArbolAVL:
         elif valor > nodo.valor:
             nodo.derecho = self._eliminar(nodo.derecho, valor)
         else:
+            # Cada eliminación desengancha exactamente un nodo con a lo sumo un hijo
+            # (el propio o, si tiene dos, su sucesor)
+            if nodo.izquierdo is None or nodo.derecho is None:
+                self._desenganchado = True
             if nodo.izquierdo is None and nodo.derecho is None:
                 return None
             if nodo.izquierdo is None:
@@ -105,6 +194,95 @@ class ArbolAVL:
         self._actualizar_altura(nodo)
         return self._balancear(nodo)
 
+    # -------------------- Operaciones por lotes --------------------
+    def insertar_lote(self, valores: Iterable[int]) -> None:
+        """Inserta varios valores en una sola pasada sobre el árbol.
+
+        Los valores se ordenan y se reparten entre los dos subárboles en cada
+        nodo, así que cada nodo tocado se visita y se rebalancea una vez por
+        lote. Un grupo que llega a un hueco se cuelga como subárbol balanceado.
+        """
+        ordenados = sorted(valores)
+        self.ultimas_rotaciones = []
+        self.raiz = self._insertar_lote(self.raiz, ordenados, 0, len(ordenados))
+        self.agregados.agregar_ordenados(ordenados)
+
+    def _insertar_lote(self, nodo: NodoAVL | None, valores: list[int], inicio: int, fin: int) -> NodoAVL | None:
+        if inicio == fin:
+            return nodo
+        if fin - inicio == 1:
+            # Un solo valor en este subárbol: descenso normal, sin repartir
+            return self._insertar(nodo, valores[inicio])
+        if nodo is None:
+            return type(self).desde_ordenados(valores[inicio:fin]).raiz
+        corte = bisect_left(valores, nodo.valor, inicio, fin)
+        nodo.izquierdo = self._insertar_lote(nodo.izquierdo, valores, inicio, corte)
+        nodo.derecho = self._insertar_lote(nodo.derecho, valores, corte, fin)
+        return self._reequilibrar(nodo)
+
+    def eliminar_lote(self, valores: Iterable[int]) -> list[int]:
+        """Elimina varios valores en pasadas compartidas; devuelve los que estaban.
+
+        Cada pasada quita una aparición de cada valor distinto del lote (las
+        repeticiones necesitan una pasada más cada una).
+        """
+        self.ultimas_rotaciones = []
+        cuentas = Counter(valores)
+        eliminados: list[int] = []
+        while cuentas:
+            distintos = sorted(cuentas)
+            encontrados: list[int] = []
+            self.raiz = self._eliminar_lote(self.raiz, distintos, 0, len(distintos), encontrados)
+            eliminados.extend(encontrados)
+            # Un valor que no se encontró no tiene más apariciones
+            cuentas = Counter({v: cuentas[v] - 1 for v in encontrados if cuentas[v] > 1})
+        extremos = False
+        for valor in eliminados:
+            extremos |= self.agregados.quitar(valor)
+        if extremos:
+            self._extremos()
+        return eliminados
+
+    def _eliminar_lote(self, nodo: NodoAVL | None, valores: list[int], inicio: int, fin: int,
+                       encontrados: list[int]) -> NodoAVL | None:
+        if nodo is None or inicio == fin:
+            return nodo
+        corte = bisect_left(valores, nodo.valor, inicio, fin)
+        coincide = corte < fin and valores[corte] == nodo.valor
+        nodo.izquierdo = self._eliminar_lote(nodo.izquierdo, valores, inicio, corte, encontrados)
+        nodo.derecho = self._eliminar_lote(nodo.derecho, valores, corte + coincide, fin, encontrados)
+        if coincide:
+            encontrados.append(nodo.valor)
+            if nodo.izquierdo is None:
+                return nodo.derecho
+            if nodo.derecho is None:
+                return nodo.izquierdo
+            sucesor = self._min_nodo(nodo.derecho)
+            nodo.valor = sucesor.valor
+            nodo.derecho = self._eliminar(nodo.derecho, sucesor.valor)
+        return self._reequilibrar(nodo)
+
+    def _reequilibrar(self, nodo: NodoAVL) -> NodoAVL:
+        # Tras un lote la diferencia de alturas puede pasar de 2: las rotaciones
+        # ya no bastan y el subárbol se reconstruye balanceado en O(tamaño)
+        self._actualizar_altura(nodo)
+        if abs(nodo.factor_equilibrio()) > 2:
+            return self._reconstruir(nodo)
+        return self._balancear(nodo)
+
+    def _reconstruir(self, nodo: NodoAVL) -> NodoAVL | None:
+        valores: list[int] = []
+        pila: list[NodoAVL] = []
+        actual: NodoAVL | None = nodo
+        while pila or actual:
+            while actual:
+                pila.append(actual)
+                actual = actual.izquierdo
+            actual = pila.pop()
+            valores.append(actual.valor)
+            actual = actual.derecho
+        return type(self).desde_ordenados(valores).raiz
+
     def _min_nodo(self, nodo: NodoAVL) -> NodoAVL:
         actual = nodo
         while actual.izquierdo:
@@ -119,6 +297,66 @@ class ArbolAVL:
             n = n.izquierdo if valor < n.valor else n.derecho
         return False
 
+    def piso(self, valor: int) -> int | None:
+        """Mayor valor <= `valor` (None si no hay), en O(log n)."""
+        candidato = None
+        n = self.raiz
+        while n:
+            if n.valor <= valor:
+                candidato = n.valor
+                n = n.derecho
+            else:
+                n = n.izquierdo
+        return candidato
+
+    def techo(self, valor: int) -> int | None:
+        """Menor valor >= `valor` (None si no hay), en O(log n)."""
+        candidato = None
+        n = self.raiz
+        while n:
+            if n.valor >= valor:
+                candidato = n.valor
+                n = n.izquierdo
+            else:
+                n = n.derecho
+        return candidato
+
+    def k_cercanos(self, valor: int, k: int) -> list[int]:
+        """Los `k` valores más cercanos a `valor`, del más cercano al más lejano.
+
+        Un descenso deja el camino de predecesores y de sucesores en dos pilas
+        y luego se avanza hacia ambos lados en O(log n + k). A igual distancia
+        va primero el menor.
+        """
+        menores: list[NodoAVL] = []
+        mayores: list[NodoAVL] = []
+        n = self.raiz
+        while n:
+            if n.valor >= valor:
+                mayores.append(n)
+                n = n.izquierdo
+            else:
+                menores.append(n)
+                n = n.derecho
+
+        res: list[int] = []
+        while len(res) < k and (menores or mayores):
+            if mayores and (not menores or mayores[-1].valor - valor < valor - menores[-1].valor):
+                n = mayores.pop()
+                res.append(n.valor)
+                siguiente = n.derecho
+                while siguiente:
+                    mayores.append(siguiente)
+                    siguiente = siguiente.izquierdo
+            else:
+                n = menores.pop()
+                res.append(n.valor)
+                siguiente = n.izquierdo
+                while siguiente:
+                    menores.append(siguiente)
+                    siguiente = siguiente.derecho
+        return res
+
     def inorden(self) -> list[int]:
         res: list[int] = []
         def _in(n: NodoAVL | None) -> None:
@@ -149,6 +387,94 @@ class ArbolAVL:
         _post(self.raiz)
         return res
 
+    def postorden_iterativo(self) -> list[int]:
+        """Postorden con una pila explícita: raíz, derecho, izquierdo, e invertido."""
+        res: list[int] = []
+        pila = [self.raiz] if self.raiz else []
+        while pila:
+            n = pila.pop()
+            res.append(n.valor)
+            if n.izquierdo:
+                pila.append(n.izquierdo)
+            if n.derecho:
+                pila.append(n.derecho)
+        res.reverse()
+        return res
+
+    def iter_inorden(self) -> Iterator[int]:
+        """Genera los valores en inorden de forma perezosa (pila de O(log n))."""
+        pila: list[NodoAVL] = []
+        n = self.raiz
+        while pila or n:
+            while n:
+                pila.append(n)
+                n = n.izquierdo
+            n = pila.pop()
+            yield n.valor
+            n = n.derecho
+
+    def a_numpy(self, cantidad: int | None = None):
+        """Valores en inorden como arreglo `numpy.int64`, sin lista intermedia.
+
+        Con `cantidad` el arreglo se reserva de antemano y se llena durante el
+        recorrido; sin ella, numpy lo hace crecer a medida que llegan valores.
+        """
+        import numpy as np
+
+        return np.fromiter(self.iter_inorden(), dtype=np.int64, count=-1 if cantidad is None else cantidad)
+
+    def congelar(self, cantidad: int | None = None):
+        """Instantánea inmutable (`ArbolCongelado`) en disposición de Eytzinger; requiere numpy."""
+        from .congelado import ArbolCongelado
+
+        return ArbolCongelado(self.a_numpy(cantidad))
+
+    def inorden_morris(self) -> list[int]:
+        """Inorden de Morris: O(1) memoria auxiliar, sin pila ni recursión.
+
+        Enlaza temporalmente cada predecesor con su nodo y deshace el enlace
+        al volver; el árbol no debe modificarse durante el recorrido.
+        """
+        res: list[int] = []
+        actual = self.raiz
+        while actual:
+            if actual.izquierdo is None:
+                res.append(actual.valor)
+                actual = actual.derecho
+                continue
+            pred = actual.izquierdo
+            while pred.derecho and pred.derecho is not actual:
+                pred = pred.derecho
+            if pred.derecho is None:
+                pred.derecho = actual
+                actual = actual.izquierdo
+            else:
+                pred.derecho = None
+                res.append(actual.valor)
+                actual = actual.derecho
+        return res
+
+    def preorden_morris(self) -> list[int]:
+        """Preorden de Morris: O(1) memoria auxiliar (ver `inorden_morris`)."""
+        res: list[int] = []
+        actual = self.raiz
+        while actual:
+            if actual.izquierdo is None:
+                res.append(actual.valor)
+                actual = actual.derecho
+                continue
+            pred = actual.izquierdo
+            while pred.derecho and pred.derecho is not actual:
+                pred = pred.derecho
+            if pred.derecho is None:
+                res.append(actual.valor)
+                pred.derecho = actual
+                actual = actual.izquierdo
+            else:
+                pred.derecho = None
+                actual = actual.derecho
+        return res
+
     def amplitud(self) -> list[int]:
         if self.raiz is None:
             return []
@@ -0,0 +1,105 @@
+"""Filtro de Bloom con contadores para descartar búsquedas de claves ausentes.
+
+Un filtro de Bloom responde "seguro que no está" o "quizá está": si alguno
+de los `k` contadores de la clave vale 0, la clave no se insertó nunca y la
+búsqueda en el árbol se puede omitir. Con contadores (en vez de bits) las
+eliminaciones restan en los mismos `k` contadores, así que el filtro sigue
+al árbol también al borrar. Un contador que llega a 255 queda fijo: restar
+en él podría producir falsos negativos.
+
+El tamaño se calcula para una capacidad y una tasa de falsos positivos; al
+superar la capacidad, el dueño debe reconstruirlo más grande a partir de
+los valores del árbol (`FiltroBloomContador.desde_valores`).
+"""
+import math
+from typing import Iterable, Iterator
+
+_SATURADO = 255
+_MASCARA = (1 << 64) - 1
+
+
+def _mezclar(valor: int) -> int:
+    # Finalizador de splitmix64: pocas operaciones enteras, mucho más barato
+    # que un hash criptográfico y suficiente para repartir claves consecutivas
+    x = (valor + 0x9E3779B97F4A7C15) & _MASCARA
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASCARA
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASCARA
+    return x ^ (x >> 31)
+
+
+class FiltroBloomContador:
+    """Filtro de Bloom con contadores de 8 bits."""
+
+    def __init__(self, capacidad: int, tasa_fp: float = 0.01) -> None:
+        if not 0 < tasa_fp < 1:
+            raise ValueError('tasa_fp debe estar entre 0 y 1')
+        self.capacidad = max(1, capacidad)
+        self.tasa_fp = tasa_fp
+        # Tamaño y número de funciones óptimos para n = capacidad y p = tasa_fp
+        self.m = max(8, math.ceil(-self.capacidad * math.log(tasa_fp) / math.log(2) ** 2))
+        self.k = max(1, round(self.m / self.capacidad * math.log(2)))
+        self.contadores = bytearray(self.m)
+        self.cantidad = 0
+        self.consultas = 0
+        self.descartadas = 0
+        self.falsos_positivos = 0
+
+    @classmethod
+    def desde_valores(cls, valores: Iterable[int], capacidad: int, tasa_fp: float = 0.01) -> "FiltroBloomContador":
+        filtro = cls(capacidad, tasa_fp)
+        for valor in valores:
+            filtro.agregar(valor)
+        return filtro
+
+    def _posiciones(self, valor: int) -> Iterator[int]:
+        # Doble hash (Kirsch-Mitzenmacher): h1 + i*h2 a partir de un solo hash de 64 bits
+        x = _mezclar(valor)
+        h1, h2 = x & 0xFFFFFFFF, (x >> 32) | 1
+        m = self.m
+        for i in range(self.k):
+            yield (h1 + i * h2) % m
+
+    def agregar(self, valor: int) -> None:
+        for i in self._posiciones(valor):
+            if self.contadores[i] < _SATURADO:
+                self.contadores[i] += 1
+        self.cantidad += 1
+
+    def quitar(self, valor: int) -> None:
+        """Resta una aparición de `valor`; solo debe llamarse si estaba en el árbol."""
+        for i in self._posiciones(valor):
+            if 0 < self.contadores[i] < _SATURADO:
+                self.contadores[i] -= 1
+        self.cantidad -= 1
+
+    def quizas_contiene(self, valor: int) -> bool:
+        """False si `valor` seguro que no está; True si puede estar."""
+        self.consultas += 1
+        contadores = self.contadores
+        for i in self._posiciones(valor):
+            if not contadores[i]:
+                self.descartadas += 1
+                return False
+        return True
+
+    def tasa_estimada(self) -> float:
+        """Tasa de falsos positivos esperada con la ocupación actual."""
+        return (1 - math.exp(-self.k * self.cantidad / self.m)) ** self.k
+
+    def estadisticas(self) -> dict:
+        # Consultas de claves ausentes = las descartadas + las que el árbol desmintió
+        ausentes = self.descartadas + self.falsos_positivos
+        return {
+            'capacidad': self.capacidad,
+            'cantidad': self.cantidad,
+            'contadores': self.m,
+            'funciones_hash': self.k,
+            'bytes': self.m,
+            'tasa_fp_objetivo': self.tasa_fp,
+            'tasa_fp_estimada': self.tasa_estimada(),
+            'consultas': self.consultas,
+            'descartadas': self.descartadas,
+            'falsos_positivos': self.falsos_positivos,
+            'tasa_descarte': self.descartadas / self.consultas if self.consultas else None,
+            'tasa_fp_observada': self.falsos_positivos / ausentes if ausentes else None
+        }
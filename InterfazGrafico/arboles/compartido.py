@@ -0,0 +1,373 @@
+"""Réplicas de solo lectura de un árbol en memoria compartida.
+
+Un árbol se congela en tres arreglos `int64` contiguos (valores en inorden y
+los índices de los hijos izquierdo y derecho, -1 si no hay) dentro de un
+segmento de `multiprocessing.shared_memory`. Cada publicación crea una nueva
+generación en su propio segmento y luego actualiza el número de generación
+en un segmento de control de 8 bytes; los lectores comparan ese número en
+cada acceso y cambian a la última generación cuando ha cambiado, de modo que
+nunca ven un árbol a medio escribir.
+
+La generación superada se borra (`unlink`) en cuanto se publica la
+siguiente: los procesos que aún la tienen mapeada la siguen leyendo y el
+sistema libera su memoria cuando el último la suelta. `destruir` borra el
+segmento de control y la última generación cuando ya nadie usa el árbol.
+
+Todos los procesos (p. ej. los workers de gunicorn) mapean los mismos
+segmentos, así que la memoria del árbol no se multiplica por el número de
+workers.
+"""
+from bisect import bisect_left, bisect_right
+from multiprocessing import resource_tracker, shared_memory
+
+from .abb import ArbolBinario
+from .adaptativo import ArbolAdaptativo
+from .agregados import Agregados
+from .avl import ArbolAVL
+from .recorridos import estructura_json
+
+# Enteros de la cabecera de cada generación: cantidad de nodos, índice de la
+# raíz y motor con que se publicó (ver `_MOTORES`)
+_CABECERA = 3
+_BYTES = 8
+# Forma publicada: la de un ABB o la de un AVL (también la del motor actual
+# de un árbol adaptativo, que cambia al migrar)
+_MOTORES = ('abb', 'avl')
+
+
+def _motor(arbol) -> str:
+    motor = getattr(arbol, 'motor', arbol)
+    return 'avl' if isinstance(motor, ArbolAVL) else 'abb'
+
+
+def _hijos(nodo):
+    if hasattr(nodo, 'hijo_izquierdo'):
+        return nodo.hijo_izquierdo, nodo.hijo_derecho
+    return nodo.izquierdo, nodo.derecho
+
+
+def _adjuntar(nombre: str) -> shared_memory.SharedMemory:
+    """Mapea un segmento existente sin que el resource_tracker lo borre al salir."""
+    segmento = shared_memory.SharedMemory(name=nombre)
+    # En Python < 3.13 adjuntar también registra el segmento para borrarlo al
+    # terminar el proceso, lo que destruiría la réplica de los demás workers.
+    resource_tracker.unregister(segmento._name, 'shared_memory')
+    return segmento
+
+
+class VistaCompartida:
+    """Árbol congelado de solo lectura respaldado por un segmento compartido."""
+
+    def __init__(self, segmento: shared_memory.SharedMemory, generacion: int) -> None:
+        self.generacion = generacion
+        self._segmento = segmento
+        enteros = segmento.buf.cast('q')
+        self.cantidad = enteros[0]
+        self.raiz = enteros[1]
+        self.motor = _MOTORES[enteros[2]]
+        n = self.cantidad
+        self._enteros = enteros
+        self.valores = enteros[_CABECERA:_CABECERA + n]
+        self.izquierdo = enteros[_CABECERA + n:_CABECERA + 2 * n]
+        self.derecho = enteros[_CABECERA + 2 * n:_CABECERA + 3 * n]
+        self._estadisticas: dict | None = None
+
+    def cerrar(self) -> None:
+        if self._segmento is None:
+            return
+        try:
+            for vista in (self.valores, self.izquierdo, self.derecho, self._enteros):
+                vista.release()
+            self._segmento.close()
+        except BufferError:
+            # Aún hay arreglos de `a_numpy` apuntando al segmento: se libera al soltarlos
+            return
+        self._segmento = None
+
+    def __del__(self) -> None:
+        self.cerrar()
+
+    def buscar(self, valor: int) -> bool:
+        i = self.raiz
+        while i != -1:
+            actual = self.valores[i]
+            if valor == actual:
+                return True
+            i = self.izquierdo[i] if valor < actual else self.derecho[i]
+        return False
+
+    def piso(self, valor: int) -> int | None:
+        i = bisect_right(self.valores, valor)
+        return self.valores[i - 1] if i else None
+
+    def techo(self, valor: int) -> int | None:
+        i = bisect_left(self.valores, valor)
+        return self.valores[i] if i < self.cantidad else None
+
+    def k_cercanos(self, valor: int, k: int) -> list[int]:
+        # Los valores están ordenados: se expande desde el punto de inserción
+        derecha = bisect_left(self.valores, valor)
+        izquierda = derecha - 1
+        resultado: list[int] = []
+        while len(resultado) < k and (izquierda >= 0 or derecha < self.cantidad):
+            if derecha < self.cantidad and (izquierda < 0 or
+                                            self.valores[derecha] - valor < valor - self.valores[izquierda]):
+                resultado.append(self.valores[derecha])
+                derecha += 1
+            else:
+                resultado.append(self.valores[izquierda])
+                izquierda -= 1
+        return resultado
+
+    def a_numpy(self, cantidad: int | None = None):
+        """Vista `numpy.int64` de solo lectura sobre los valores (sin copiar)."""
+        import numpy as np
+
+        arreglo = np.frombuffer(self.valores, dtype=np.int64)
+        arreglo.flags.writeable = False
+        return arreglo
+
+    def inorden(self) -> list[int]:
+        # Los nodos se numeran en inorden: el arreglo de valores ya está ordenado
+        return self.valores.tolist()
+
+    def preorden(self) -> list[int]:
+        if self.raiz == -1:
+            return []
+        resultado: list[int] = []
+        pila = [self.raiz]
+        while pila:
+            i = pila.pop()
+            resultado.append(self.valores[i])
+            if self.derecho[i] != -1:
+                pila.append(self.derecho[i])
+            if self.izquierdo[i] != -1:
+                pila.append(self.izquierdo[i])
+        return resultado
+
+    def postorden(self) -> list[int]:
+        if self.raiz == -1:
+            return []
+        salida: list[int] = []
+        pila = [self.raiz]
+        while pila:
+            i = pila.pop()
+            salida.append(self.valores[i])
+            if self.izquierdo[i] != -1:
+                pila.append(self.izquierdo[i])
+            if self.derecho[i] != -1:
+                pila.append(self.derecho[i])
+        salida.reverse()
+        return salida
+
+    def amplitud(self) -> list[int]:
+        if self.raiz == -1:
+            return []
+        cola = [self.raiz]
+        i = 0
+        while i < len(cola):
+            actual = cola[i]
+            i += 1
+            if self.izquierdo[actual] != -1:
+                cola.append(self.izquierdo[actual])
+            if self.derecho[actual] != -1:
+                cola.append(self.derecho[actual])
+        return [self.valores[j] for j in cola]
+
+    def estadisticas(self) -> dict:
+        """Mismo formato que `ArbolAVL.estadisticas`.
+
+        La generación es inmutable: la suma y la altura se calculan en la
+        primera consulta y después se sirven en O(1).
+        """
+        if self._estadisticas is None:
+            altura = 0
+            nivel = [self.raiz] if self.raiz != -1 else []
+            while nivel:
+                altura += 1
+                nivel = [j for i in nivel for j in (self.izquierdo[i], self.derecho[i]) if j != -1]
+            self._estadisticas = dict(Agregados.desde_valores(self.valores).como_dict(), altura=altura)
+        return self._estadisticas
+
+    def a_json(self) -> str:
+        """Texto JSON de la estructura, con el mismo formato que devuelve `/estructura`."""
+        def _desplegar(i):
+            izquierdo, derecho = self.izquierdo[i], self.derecho[i]
+            return (self.valores[i], izquierdo if izquierdo != -1 else None,
+                    derecho if derecho != -1 else None, False)
+
+        return estructura_json(self.raiz if self.raiz != -1 else None, _desplegar)
+
+    def reconstruir(self, clase):
+        """Crea un árbol mutable (`ArbolBinario`, `ArbolAVL` o `ArbolAdaptativo`) con la misma forma."""
+        if issubclass(clase, ArbolAdaptativo):
+            # Con el motor que tenía al publicarse: si ya migró, sigue siendo un AVL
+            return clase(self.reconstruir(ArbolAVL if self.motor == 'avl' else ArbolBinario))
+        arbol = clase()
+        n = self.cantidad
+        if issubclass(clase, ArbolAVL):
+            nodos = [clase.clase_nodo(v) for v in self.valores]
+            for i, nodo in enumerate(nodos):
+                if self.izquierdo[i] != -1:
+                    nodo.izquierdo = nodos[self.izquierdo[i]]
+                if self.derecho[i] != -1:
+                    nodo.derecho = nodos[self.derecho[i]]
+            # Alturas en postorden: los hijos antes que el padre
+            orden = []
+            pila = [self.raiz] if n else []
+            while pila:
+                i = pila.pop()
+                orden.append(i)
+                pila.extend(j for j in (self.izquierdo[i], self.derecho[i]) if j != -1)
+            for i in reversed(orden):
+                arbol._actualizar_altura(nodos[i])
+        else:
+            nodos = [clase.clase_nodo(v) for v in self.valores]
+            for i, nodo in enumerate(nodos):
+                if self.izquierdo[i] != -1:
+                    nodo.hijo_izquierdo = nodos[self.izquierdo[i]]
+                if self.derecho[i] != -1:
+                    nodo.hijo_derecho = nodos[self.derecho[i]]
+        arbol.raiz = nodos[self.raiz] if n else None
+        if isinstance(arbol, ArbolAVL):
+            arbol.agregados = Agregados.desde_valores(self.valores)
+        else:
+            # Alturas de los nodos y agregados del árbol en una pasada
+            arbol._recalcular()
+        return arbol
+
+
+def _nombre_generacion(nombre: str, generacion: int) -> str:
+    return f'{nombre}_g{generacion}'
+
+
+def _control(nombre: str, crear: bool) -> shared_memory.SharedMemory:
+    if crear:
+        try:
+            control = shared_memory.SharedMemory(name=nombre, create=True, size=_BYTES)
+            control.buf[:_BYTES] = bytes(_BYTES)
+            # Debe sobrevivir al proceso que lo creó
+            resource_tracker.unregister(control._name, 'shared_memory')
+            return control
+        except FileExistsError:
+            pass
+    return _adjuntar(nombre)
+
+
+def _borrar(nombre: str) -> None:
+    try:
+        segmento = shared_memory.SharedMemory(name=nombre)
+    except FileNotFoundError:
+        return
+    segmento.close()
+    segmento.unlink()
+
+
+class PublicadorArbol:
+    """Escritor: congela un árbol y lo publica como nueva generación.
+
+    Debe haber un único escritor a la vez; si varios procesos pueden publicar,
+    quien llama debe elegir uno (ver `replicas.ReplicasCompartidas`).
+    """
+
+    def __init__(self, nombre: str) -> None:
+        self.nombre = nombre
+        self._control = _control(nombre, crear=True)
+
+    def generacion(self) -> int:
+        return self._control.buf.cast('q')[0]
+
+    def publicar(self, arbol) -> int:
+        nodos = []
+        pila = []
+        actual = arbol.raiz
+        while pila or actual is not None:
+            while actual is not None:
+                pila.append(actual)
+                actual = _hijos(actual)[0]
+            actual = pila.pop()
+            nodos.append(actual)
+            actual = _hijos(actual)[1]
+
+        n = len(nodos)
+        indice = {id(nodo): i for i, nodo in enumerate(nodos)}
+        generacion = self.generacion() + 1
+        nombre = _nombre_generacion(self.nombre, generacion)
+        tamano = (_CABECERA + 3 * n) * _BYTES
+        try:
+            segmento = shared_memory.SharedMemory(name=nombre, create=True, size=tamano)
+        except FileExistsError:
+            # Resto de un escritor que terminó antes de anunciarla: nadie la lee
+            _borrar(nombre)
+            segmento = shared_memory.SharedMemory(name=nombre, create=True, size=tamano)
+        enteros = segmento.buf.cast('q')
+        enteros[0] = n
+        enteros[1] = indice[id(arbol.raiz)] if arbol.raiz is not None else -1
+        enteros[2] = _MOTORES.index(_motor(arbol))
+        for i, nodo in enumerate(nodos):
+            izquierdo, derecho = _hijos(nodo)
+            enteros[_CABECERA + i] = nodo.valor
+            enteros[_CABECERA + n + i] = indice[id(izquierdo)] if izquierdo is not None else -1
+            enteros[_CABECERA + 2 * n + i] = indice[id(derecho)] if derecho is not None else -1
+        enteros.release()
+        segmento.close()
+        # El segmento pasa a ser de todos los procesos: no debe borrarse al salir éste
+        resource_tracker.unregister(segmento._name, 'shared_memory')
+
+        # Cambio atómico: una sola escritura alineada de 8 bytes
+        self._control.buf.cast('q')[0] = generacion
+
+        # Quien ya mapeó la anterior la sigue leyendo hasta soltarla; quien leyó
+        # su número sin alcanzar a mapearla vuelve a leer el de control
+        _borrar(_nombre_generacion(self.nombre, generacion - 1))
+        return generacion
+
+    def cerrar(self) -> None:
+        self._control.close()
+
+    def destruir(self) -> None:
+        """Borra el segmento de control y la última generación (con nadie más usando el árbol)."""
+        generacion = self.generacion()
+        for g in (generacion, generacion + 1):
+            # La siguiente, por si un escritor terminó antes de anunciarla
+            _borrar(_nombre_generacion(self.nombre, g))
+        self._control.close()
+        _borrar(self.nombre)
+
+
+class LectorArbol:
+    """Lector: mapea siempre la última generación publicada."""
+
+    def __init__(self, nombre: str) -> None:
+        self.nombre = nombre
+        # Lo crea el escritor con su primera publicación
+        self._control: shared_memory.SharedMemory | None = None
+        self._vista: VistaCompartida | None = None
+
+    def actual(self) -> VistaCompartida | None:
+        """Vista de la última generación, o None si aún no se publicó ninguna."""
+        if self._control is None:
+            try:
+                self._control = _adjuntar(self.nombre)
+            except FileNotFoundError:
+                return None
+        while True:
+            generacion = self._control.buf.cast('q')[0]
+            if generacion == 0:
+                return None
+            if self._vista is not None and self._vista.generacion == generacion:
+                return self._vista
+            try:
+                segmento = _adjuntar(_nombre_generacion(self.nombre, generacion))
+            except FileNotFoundError:
+                # El escritor publicó dos generaciones más mientras tanto: releer
+                continue
+            # La vista anterior se libera cuando la suelte la última petición que la use
+            self._vista = VistaCompartida(segmento, generacion)
+            return self._vista
+
+    def cerrar(self) -> None:
+        self._vista = None
+        if self._control is not None:
+            self._control.close()
+            self._control = None
@@ -0,0 +1,99 @@
+"""Instantánea inmutable de un árbol en disposición de Eytzinger.
+
+Las claves se guardan en un único arreglo `numpy.int64` en el orden por
+niveles (BFS) de un árbol binario completo: los hijos del nodo `k` (contando
+desde 1) están en `2k` y `2k + 1`. No hay punteros ni nodos sueltos en el
+montículo, y los primeros niveles, que toda búsqueda visita, quedan juntos
+en unas pocas líneas de caché.
+
+La búsqueda por lotes baja todas las consultas a la vez con operaciones de
+arreglo: en cada nivel `k = 2k + (clave < consulta)`. Tras recorrer la
+altura completa, quitar de `k` los unos finales y un bit más deja el índice
+del menor elemento >= consulta (la "cota inferior").
+"""
+from typing import Iterable
+
+import numpy as np
+
+# Consultas por bloque en `buscar_lote` (acota la memoria de los temporales)
+TAMANO_BLOQUE = 1 << 20
+
+
+def _orden_eytzinger(n: int) -> np.ndarray:
+    """Posición (desde 0) en el arreglo de Eytzinger de cada rango en inorden."""
+    posiciones: list[int] = []
+    pila: list[int] = []
+    k = 1
+    while pila or k <= n:
+        while k <= n:
+            pila.append(k)
+            k *= 2
+        k = pila.pop()
+        posiciones.append(k - 1)
+        k = 2 * k + 1
+    return np.array(posiciones, dtype=np.int64)
+
+
+class ArbolCongelado:
+    """Árbol de solo lectura sobre un arreglo contiguo en orden de Eytzinger."""
+
+    def __init__(self, ordenados: Iterable[int]) -> None:
+        ordenados = np.asarray(ordenados, dtype=np.int64)
+        self.cantidad = len(ordenados)
+        self.claves = np.empty(self.cantidad, dtype=np.int64)
+        self.claves[_orden_eytzinger(self.cantidad)] = ordenados
+        self.claves.flags.writeable = False
+        # Los accesos escalares por memoryview devuelven int sin crear escalares numpy
+        self._vista = memoryview(self.claves)
+
+    def __len__(self) -> int:
+        return self.cantidad
+
+    def altura(self) -> int:
+        return self.cantidad.bit_length()
+
+    def buscar(self, valor: int) -> bool:
+        claves = self._vista
+        n = self.cantidad
+        k = 1
+        while k <= n:
+            clave = claves[k - 1]
+            if clave == valor:
+                return True
+            k = 2 * k + (clave < valor)
+        return False
+
+    def buscar_lote(self, consultas) -> np.ndarray:
+        """Arreglo booleano: si cada consulta está en el árbol."""
+        consultas = np.asarray(consultas, dtype=np.int64)
+        resultado = np.empty(consultas.shape, dtype=bool)
+        planas = consultas.reshape(-1)
+        salida = resultado.reshape(-1)
+        for inicio in range(0, planas.size, TAMANO_BLOQUE):
+            parte = planas[inicio:inicio + TAMANO_BLOQUE]
+            salida[inicio:inicio + parte.size] = self._buscar_bloque(parte)
+        return resultado
+
+    def _buscar_bloque(self, consultas: np.ndarray) -> np.ndarray:
+        n = self.cantidad
+        if n == 0:
+            return np.zeros(consultas.size, dtype=bool)
+        k = np.ones(consultas.size, dtype=np.int64)
+        # Iteraciones fijas (la altura): las consultas que ya salieron del
+        # árbol (k > n) se quedan quietas en vez de bifurcar por consulta
+        for _ in range(self.altura()):
+            dentro = k <= n
+            claves = self.claves[np.minimum(k, n) - 1]
+            k = np.where(dentro, 2 * k + (claves < consultas), k)
+        # Cota inferior: quitar los unos finales de k y uno más
+        k >>= np.log2((~k) & (k + 1)).astype(np.int64) + 1
+        encontrado = k > 0
+        indices = np.maximum(k, 1) - 1
+        return encontrado & (self.claves[indices] == consultas)
+
+    def amplitud(self) -> list[int]:
+        """Recorrido por niveles del árbol completo congelado: es el propio arreglo."""
+        return self.claves.tolist()
+
+    def inorden(self) -> list[int]:
+        return self.claves[_orden_eytzinger(self.cantidad)].tolist()
@@ -0,0 +1,109 @@
+"""Construcción paralela de árboles a partir de entradas muy grandes.
+
+La entrada se reparte por rangos de claves (ordenamiento por muestreo) entre
+varios procesos. Cada proceso devuelve su partición ordenada como un `array`
+de enteros de 64 bits y el proceso padre las concatena en orden de rango.
+
+Solo el ordenamiento (O(n log n)) es paralelo: los nodos son objetos Python
+que viven en un proceso, y construir subárboles en los hijos obligaría a
+serializarlos y recrearlos en el padre, que cuesta lo mismo que crearlos
+ahí. El padre enlaza los nodos en O(n) con `desde_ordenados`. La
+importación (`importacion.ordenar`, usada por `POST /importar` y la CLI)
+ordena así cada bloque en memoria cuando se le dan varios procesos.
+"""
+import os
+import random
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable
+
+from .abb import ArbolBinario
+from .avl import ArbolAVL
+
+# Por debajo de este tamaño no compensa arrancar procesos
+MINIMO_PARALELO = 100_000
+MUESTRAS_POR_PARTICION = 64
+
+
+def _ordenar_en_sitio(datos: array, corridas: bool = False) -> array:
+    """Ordena un `array('q')` sobre su propio búfer y lo devuelve.
+
+    Con numpy no se reserva nada aparte del arreglo; sin él se ordena una
+    lista de enteros Python, unas 5 veces el tamaño del bloque. Con
+    `corridas` se usa timsort, que mezcla en tiempo casi lineal las corridas
+    ya ordenadas.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        datos[:] = array('q', sorted(datos))
+        return datos
+    np.frombuffer(datos, dtype=np.int64).sort(kind='stable' if corridas else None)
+    return datos
+
+
+def _ordenar_y_repartir(datos: bytes, divisores: list[int]) -> list[bytes]:
+    """Fase 1 (en un proceso hijo): ordena un trozo y lo corta por los divisores."""
+    ordenado = array('q')
+    ordenado.frombytes(datos)
+    _ordenar_en_sitio(ordenado)
+    partes = []
+    inicio = 0
+    for divisor in divisores:
+        fin = bisect_right(ordenado, divisor, inicio)
+        partes.append(ordenado[inicio:fin].tobytes())
+        inicio = fin
+    partes.append(ordenado[inicio:].tobytes())
+    return partes
+
+
+def _fusionar_particion(partes: list[bytes]) -> bytes:
+    """Fase 2 (en un proceso hijo): une las corridas ordenadas de un rango de claves."""
+    particion = array('q')
+    for parte in partes:
+        particion.frombytes(parte)
+    return _ordenar_en_sitio(particion, corridas=True).tobytes()
+
+
+def ordenar_paralelo(valores: Iterable[int], procesos: int | None = None, en_sitio: bool = False) -> array:
+    """Ordena enteros de 64 bits repartiéndolos por rango de claves entre procesos.
+
+    Con `en_sitio` un `array('q')` recibido puede ordenarse sobre sí mismo (y
+    devolverse) en lugar de copiarse; la importación lo usa con sus bloques.
+    """
+    datos = valores if isinstance(valores, array) and valores.typecode == 'q' else array('q', valores)
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1 or not datos or len(datos) < MINIMO_PARALELO:
+        if datos is valores and not en_sitio:
+            datos = array('q', datos)
+        return _ordenar_en_sitio(datos)
+
+    # Divisores tomados de una muestra (con reemplazo) para particiones de tamaño similar
+    muestra = sorted(datos[random.randrange(len(datos))] for _ in range(procesos * MUESTRAS_POR_PARTICION))
+    paso = len(muestra) / procesos
+    divisores = [muestra[int(paso * i)] for i in range(1, procesos)]
+
+    tamano = -(-len(datos) // procesos)
+    trozos = [datos[i:i + tamano].tobytes() for i in range(0, len(datos), tamano)]
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        repartidos = list(ejecutor.map(_ordenar_y_repartir, trozos, [divisores] * len(trozos)))
+        por_rango = [[partes[j] for partes in repartidos] for j in range(procesos)]
+        particiones = list(ejecutor.map(_fusionar_particion, por_rango))
+
+    resultado = array('q')
+    for particion in particiones:
+        resultado.frombytes(particion)
+    return resultado
+
+
+def construir_avl_paralelo(valores: Iterable[int], procesos: int | None = None) -> ArbolAVL:
+    """Construye un `ArbolAVL` balanceado con los valores dados usando varios procesos."""
+    ordenados = ordenar_paralelo(valores, procesos)
+    return ArbolAVL.desde_ordenados(ordenados, len(ordenados))
+
+
+def construir_abb_paralelo(valores: Iterable[int], procesos: int | None = None) -> ArbolBinario:
+    """Construye un `ArbolBinario` balanceado con los valores dados usando varios procesos."""
+    ordenados = ordenar_paralelo(valores, procesos)
+    return ArbolBinario.desde_ordenados(ordenados, len(ordenados))
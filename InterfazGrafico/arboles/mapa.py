@@ -0,0 +1,186 @@
+"""Mapa ordenado clave → valor sobre el motor de balanceo de `ArbolAVL`.
+
+Las claves pueden ser de cualquier tipo comparable entre sí (enteros,
+cadenas, tuplas...). Cada nodo guarda su clave en `valor`, como un nodo AVL
+normal, y el dato asociado en `dato`; las rotaciones y alturas las hace el
+propio `ArbolAVL`, así que todas las operaciones por clave son O(log n) y
+los recorridos ordenados no necesitan volver a ordenar nada.
+"""
+from typing import Any, Iterable, Iterator
+
+from .avl import ArbolAVL, NodoAVL
+
+_FALTA = object()
+
+
+class NodoMapa(NodoAVL):
+    """Nodo AVL con un dato asociado a su clave."""
+
+    def __init__(self, clave: Any, dato: Any) -> None:
+        super().__init__(clave)
+        self.dato = dato
+
+    def __repr__(self) -> str:
+        return f"NodoMapa(clave={self.valor!r}, dato={self.dato!r})"
+
+
+class MapaOrdenado:
+    """Diccionario ordenado por clave (claves únicas) respaldado por un AVL."""
+
+    def __init__(self, pares: Iterable[tuple[Any, Any]] | None = None) -> None:
+        self.arbol = ArbolAVL()
+        self._cantidad = 0
+        for clave, dato in pares or ():
+            self[clave] = dato
+
+    def __len__(self) -> int:
+        return self._cantidad
+
+    def cantidad(self) -> int:
+        """Pares en el mapa, en O(1) (como `ArbolAVL.cantidad`)."""
+        return self._cantidad
+
+    def __repr__(self) -> str:
+        return f"MapaOrdenado({list(self.items())!r})"
+
+    # -------------------- Acceso por clave --------------------
+    def _nodo(self, clave: Any) -> NodoMapa | None:
+        nodo = self.arbol.raiz
+        while nodo:
+            if clave == nodo.valor:
+                return nodo
+            nodo = nodo.izquierdo if clave < nodo.valor else nodo.derecho
+        return None
+
+    def __contains__(self, clave: Any) -> bool:
+        return self._nodo(clave) is not None
+
+    def __getitem__(self, clave: Any) -> Any:
+        nodo = self._nodo(clave)
+        if nodo is None:
+            raise KeyError(clave)
+        return nodo.dato
+
+    def get(self, clave: Any, defecto: Any = None) -> Any:
+        nodo = self._nodo(clave)
+        return defecto if nodo is None else nodo.dato
+
+    def __setitem__(self, clave: Any, dato: Any) -> None:
+        self.arbol.ultimas_rotaciones = []
+        self.arbol.raiz = self._insertar(self.arbol.raiz, clave, dato)
+
+    def _insertar(self, nodo: NodoMapa | None, clave: Any, dato: Any) -> NodoMapa:
+        if nodo is None:
+            self._cantidad += 1
+            return NodoMapa(clave, dato)
+        if clave < nodo.valor:
+            nodo.izquierdo = self._insertar(nodo.izquierdo, clave, dato)
+        elif nodo.valor < clave:
+            nodo.derecho = self._insertar(nodo.derecho, clave, dato)
+        else:
+            # Clave existente: solo cambia el dato, la forma no se toca
+            nodo.dato = dato
+            return nodo
+        self.arbol._actualizar_altura(nodo)
+        return self.arbol._balancear(nodo)
+
+    def __delitem__(self, clave: Any) -> None:
+        self.pop(clave)
+
+    def pop(self, clave: Any, defecto: Any = _FALTA) -> Any:
+        nodo = self._nodo(clave)
+        if nodo is None:
+            if defecto is _FALTA:
+                raise KeyError(clave)
+            return defecto
+        dato = nodo.dato
+        self.arbol.ultimas_rotaciones = []
+        self.arbol.raiz = self._eliminar(self.arbol.raiz, clave)
+        self._cantidad -= 1
+        return dato
+
+    def _eliminar(self, nodo: NodoMapa | None, clave: Any) -> NodoMapa | None:
+        if nodo is None:
+            return None
+        if clave < nodo.valor:
+            nodo.izquierdo = self._eliminar(nodo.izquierdo, clave)
+        elif nodo.valor < clave:
+            nodo.derecho = self._eliminar(nodo.derecho, clave)
+        else:
+            if nodo.izquierdo is None:
+                return nodo.derecho
+            if nodo.derecho is None:
+                return nodo.izquierdo
+            # A diferencia de ArbolAVL._eliminar, el sucesor aporta también su dato
+            sucesor = self.arbol._min_nodo(nodo.derecho)
+            nodo.valor, nodo.dato = sucesor.valor, sucesor.dato
+            nodo.derecho = self._eliminar(nodo.derecho, sucesor.valor)
+        self.arbol._actualizar_altura(nodo)
+        return self.arbol._balancear(nodo)
+
+    def popitem_min(self) -> tuple[Any, Any]:
+        """Quita y devuelve el par de menor clave (KeyError si está vacío)."""
+        nodo = self.arbol.raiz
+        if nodo is None:
+            raise KeyError('popitem_min(): el mapa está vacío')
+        while nodo.izquierdo:
+            nodo = nodo.izquierdo
+        par = (nodo.valor, nodo.dato)
+        del self[par[0]]
+        return par
+
+    def popitem_max(self) -> tuple[Any, Any]:
+        """Quita y devuelve el par de mayor clave (KeyError si está vacío)."""
+        nodo = self.arbol.raiz
+        if nodo is None:
+            raise KeyError('popitem_max(): el mapa está vacío')
+        while nodo.derecho:
+            nodo = nodo.derecho
+        par = (nodo.valor, nodo.dato)
+        del self[par[0]]
+        return par
+
+    # -------------------- Recorridos ordenados --------------------
+    def _nodos(self, minimo: Any = None, maximo: Any = None,
+               inclusivo: tuple[bool, bool] = (True, True)) -> Iterator[NodoMapa]:
+        # Inorden con pila que poda las ramas fuera de [minimo, maximo]:
+        # O(log n + k) para k resultados
+        def _sobre_minimo(clave):
+            return minimo is None or minimo < clave or (inclusivo[0] and clave == minimo)
+
+        def _bajo_maximo(clave):
+            return maximo is None or clave < maximo or (inclusivo[1] and clave == maximo)
+
+        pila: list[NodoMapa] = []
+        nodo = self.arbol.raiz
+        while pila or nodo:
+            while nodo:
+                if _sobre_minimo(nodo.valor):
+                    pila.append(nodo)
+                    nodo = nodo.izquierdo
+                else:
+                    nodo = nodo.derecho
+            if not pila:
+                return
+            nodo = pila.pop()
+            if not _bajo_maximo(nodo.valor):
+                return
+            yield nodo
+            nodo = nodo.derecho
+
+    def __iter__(self) -> Iterator[Any]:
+        return (nodo.valor for nodo in self._nodos())
+
+    def keys(self) -> Iterator[Any]:
+        return iter(self)
+
+    def values(self) -> Iterator[Any]:
+        return (nodo.dato for nodo in self._nodos())
+
+    def items(self) -> Iterator[tuple[Any, Any]]:
+        return ((nodo.valor, nodo.dato) for nodo in self._nodos())
+
+    def irange(self, minimo: Any = None, maximo: Any = None,
+               inclusivo: tuple[bool, bool] = (True, True)) -> Iterator[tuple[Any, Any]]:
+        """Pares con clave entre `minimo` y `maximo` (None = sin límite), en orden."""
+        return ((nodo.valor, nodo.dato) for nodo in self._nodos(minimo, maximo, inclusivo))
@@ -0,0 +1,148 @@
+"""AVL con hashes de Merkle por subárbol para comparar árboles sin recorrerlos.
+
+Cada nodo guarda el hash BLAKE2b de su valor y de los hashes de sus dos
+hijos, así que el hash de la raíz resume la forma y el contenido de todo el
+árbol: dos árboles con el mismo hash de raíz son idénticos, y dos subárboles
+con el mismo hash se pueden saltar al compararlos. El hash es estructural:
+los mismos valores con otra forma (p. ej. un AVL recargado desde una
+instantánea, que se reconstruye balanceado) dan otro hash de raíz, aunque
+`diferencias` igual encuentra enseguida los subárboles compartidos.
+
+Los hashes se mantienen en `_actualizar_altura`, que el AVL ya llama de
+abajo hacia arriba en cada nodo cuyo subárbol cambia (camino de una
+inserción o eliminación, rotaciones y operaciones por lotes), así que cada
+escritura rehace O(log n) hashes.
+"""
+from hashlib import blake2b
+from typing import Iterable
+
+from .avl import ArbolAVL, NodoAVL
+
+# 16 bytes: colisiones despreciables para comparar réplicas, y la mitad de memoria
+TAMANO_HASH = 16
+HASH_VACIO = bytes(TAMANO_HASH)
+
+
+def hash_nodo(valor: int, izquierdo: bytes, derecho: bytes) -> bytes:
+    # Los hashes de los hijos tienen largo fijo: la concatenación no es ambigua
+    return blake2b(b'%s%s%d' % (izquierdo, derecho, valor), digest_size=TAMANO_HASH).digest()
+
+
+class NodoMerkle(NodoAVL):
+    """Nodo AVL que además guarda el hash de su subárbol."""
+    def __init__(self, valor: int) -> None:
+        # Sin super(): crear nodos es la parte caliente de construir un árbol
+        self.valor: int = valor
+        self.izquierdo: NodoMerkle | None = None
+        self.derecho: NodoMerkle | None = None
+        self.altura: int = 1
+        self.hash: bytes = hash_nodo(valor, HASH_VACIO, HASH_VACIO)
+
+
+class ArbolAVLMerkle(ArbolAVL):
+    """`ArbolAVL` que mantiene un hash de Merkle en cada nodo."""
+
+    clase_nodo = NodoMerkle
+
+    @classmethod
+    def desde_ordenados(cls, valores: Iterable[int], cantidad: int | None = None) -> "ArbolAVLMerkle":
+        arbol = super().desde_ordenados(valores, cantidad)
+
+        # Los nodos nacen con el hash de una hoja: falta rehacer los internos.
+        # Balanceado: la recursión no pasa de O(log n) niveles.
+        def _rehacer(nodo: NodoMerkle | None) -> bytes:
+            if nodo is None:
+                return HASH_VACIO
+            if nodo.altura > 1:
+                nodo.hash = hash_nodo(nodo.valor, _rehacer(nodo.izquierdo), _rehacer(nodo.derecho))
+            return nodo.hash
+
+        _rehacer(arbol.raiz)
+        return arbol
+
+    def _actualizar_altura(self, nodo: NodoMerkle) -> None:
+        izquierdo, derecho = nodo.izquierdo, nodo.derecho
+        nodo.altura = 1 + max(izquierdo.altura if izquierdo else 0, derecho.altura if derecho else 0)
+        nodo.hash = hash_nodo(nodo.valor, izquierdo.hash if izquierdo else HASH_VACIO,
+                              derecho.hash if derecho else HASH_VACIO)
+
+    def hash_raiz(self) -> bytes:
+        """Hash de todo el árbol, en O(1)."""
+        return self.raiz.hash if self.raiz else HASH_VACIO
+
+    def subarbol(self, ruta: str) -> NodoMerkle | None:
+        """Nodo al que se llega desde la raíz siguiendo `ruta` ('i' izquierdo, 'd' derecho)."""
+        nodo = self.raiz
+        for paso in ruta:
+            if nodo is None:
+                break
+            if paso == 'i':
+                nodo = nodo.izquierdo
+            elif paso == 'd':
+                nodo = nodo.derecho
+            else:
+                raise ValueError(f"paso de ruta inválido: {paso!r} (use 'i' o 'd')")
+        return nodo
+
+    def diferencias(self, otro: ArbolAVL) -> tuple[list[int], list[int]]:
+        """Valores que solo están en este árbol y los que solo están en `otro`, ordenados.
+
+        Recorre ambos árboles en inorden a la vez, por trozos: cada pila tiene
+        subárboles sin abrir y valores sueltos, en orden. Si los dos trozos del
+        frente son subárboles con el mismo hash se descartan juntos sin
+        visitarlos; si no, se abre el más alto (o el que no es un valor suelto)
+        y los valores sueltos se comparan como en una mezcla de listas
+        ordenadas. Con árboles que comparten la mayor parte de su forma cuesta
+        O(d · log n) para d diferencias. Si `otro` no tiene hashes se compara
+        contra su inorden completo.
+        """
+        solo_aqui: list[int] = []
+        solo_alla: list[int] = []
+        pila: list = [self.raiz] if self.raiz else []
+        if isinstance(otro, ArbolAVLMerkle):
+            pila_otro: list = [otro.raiz] if otro.raiz else []
+        else:
+            pila_otro = list(otro.iter_inorden())
+            pila_otro.reverse()
+
+        while pila and pila_otro:
+            a, b = pila[-1], pila_otro[-1]
+            a_es_nodo = isinstance(a, NodoAVL)
+            b_es_nodo = isinstance(b, NodoAVL)
+            if not a_es_nodo and not b_es_nodo:
+                if a == b:
+                    pila.pop()
+                    pila_otro.pop()
+                elif a < b:
+                    solo_aqui.append(pila.pop())
+                else:
+                    solo_alla.append(pila_otro.pop())
+            elif a_es_nodo and b_es_nodo and a.hash == b.hash:
+                pila.pop()
+                pila_otro.pop()
+            elif a_es_nodo and (not b_es_nodo or a.altura >= b.altura):
+                _abrir(pila)
+            else:
+                _abrir(pila_otro)
+
+        _agotar(pila, solo_aqui)
+        _agotar(pila_otro, solo_alla)
+        return solo_aqui, solo_alla
+
+
+def _abrir(pila: list) -> None:
+    # Reemplaza el subárbol del tope por (izquierdo, valor, derecho), en ese orden
+    nodo = pila.pop()
+    if nodo.derecho:
+        pila.append(nodo.derecho)
+    pila.append(nodo.valor)
+    if nodo.izquierdo:
+        pila.append(nodo.izquierdo)
+
+
+def _agotar(pila: list, destino: list[int]) -> None:
+    while pila:
+        if isinstance(pila[-1], NodoAVL):
+            _abrir(pila)
+        else:
+            destino.append(pila.pop())
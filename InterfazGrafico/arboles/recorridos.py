@@ -0,0 +1,59 @@
+"""Recorridos y estructura JSON de cualquier árbol del paquete, sin recursión.
+
+Un ABB degenerado tiene tantos niveles como nodos: tanto los recorridos
+recursivos como `json.dumps` de un diccionario anidado por nivel exceden el
+límite de recursión. Aquí los recorridos usan Morris o una pila explícita y
+la estructura se escribe directamente como texto JSON con una pila.
+"""
+from typing import Callable
+
+
+def recorrido(arbol, tipo: str) -> list[int]:
+    """Valores de `arbol` en el orden `tipo` (lista vacía si el tipo no existe).
+
+    Los recorridos de Morris enlazan nodos temporalmente: quien llama debe
+    tener el árbol para sí durante el recorrido.
+    """
+    if tipo == 'inorden':
+        return arbol.inorden_morris() if hasattr(arbol, 'inorden_morris') else arbol.inorden()
+    elif tipo == 'preorden':
+        return arbol.preorden_morris() if hasattr(arbol, 'preorden_morris') else arbol.preorden()
+    elif tipo == 'postorden':
+        return arbol.postorden_iterativo() if hasattr(arbol, 'postorden_iterativo') else arbol.postorden()
+    elif tipo == 'amplitud':
+        return arbol.amplitud() if hasattr(arbol, 'amplitud') else []
+    return []
+
+
+def desplegar_nodo(nodo) -> tuple[int, object, object, bool]:
+    """Valor, hijos y estado de lápida de un nodo de ABB o de AVL."""
+    if hasattr(nodo, 'hijo_izquierdo'):
+        return nodo.valor, nodo.hijo_izquierdo, nodo.hijo_derecho, nodo.borrado
+    return nodo.valor, nodo.izquierdo, nodo.derecho, False
+
+
+def estructura_json(raiz, desplegar: Callable = desplegar_nodo) -> str:
+    """Texto JSON de `{'valor', 'izquierdo', 'derecho'}` anidados (null si no hay nodo).
+
+    `desplegar(nodo)` da `(valor, izquierdo, derecho, borrado)`; un hijo None
+    se escribe como null. Las lápidas del borrado perezoso llevan además
+    `"borrado": true`.
+    """
+    partes: list[str] = []
+    # Pila de nodos por escribir y de fragmentos de texto que van entre ellos
+    pila: list = [raiz]
+    while pila:
+        elemento = pila.pop()
+        if isinstance(elemento, str):
+            partes.append(elemento)
+            continue
+        if elemento is None:
+            partes.append('null')
+            continue
+        valor, izquierdo, derecho, borrado = desplegar(elemento)
+        partes.append('{"valor": %d, "izquierdo": ' % valor)
+        pila.append(', "borrado": true}' if borrado else '}')
+        pila.append(derecho)
+        pila.append(', "derecho": ')
+        pila.append(izquierdo)
+    return ''.join(partes)
@@ -0,0 +1,229 @@
+"""Variante ASGI (asyncio) del servicio de árboles.
+
+Expone las rutas de árboles de `rutas.py` (con `tipo_arbol` y `arbol_id`)
+sin depender de Flask, sobre su propio `ServicioArboles`: el mismo registro,
+la misma cola de escrituras agrupadas y los mismos recorridos sin recursión.
+Las operaciones del servicio toman bloqueos y los recorridos son O(n), así que
+se ejecutan en un ejecutor para no bloquear el bucle de eventos, y las
+respuestas grandes se envían por partes. Las escrituras van directo a la cola
+agrupada del servicio, de modo que las que llegan juntas a un árbol forman un
+lote igual que bajo Flask; el bloqueo de cada árbol lo toma el propio servicio.
+
+Uso (desde `InterfazGrafico/`):
+    uvicorn --factory asgi:crear_app --port 8001
+"""
+import asyncio
+import atexit
+import json
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+from arboles.recorridos import recorrido
+from registro import id_valido
+from servicio import NOMBRES, ServicioArboles, clave_tipo, configuracion_entorno
+
+# Tamaño de cada parte en las respuestas por streaming
+TAMANO_PARTE = 64 * 1024
+# Hilos del ejecutor. Una escritura que espera su lote ocupa un hilo, así
+# que también acotan cuántas escrituras concurrentes caben en un lote
+HILOS_EJECUTOR = 32
+
+
+class _PeticionInvalida(Exception):
+    """Parámetro ausente o mal formado: se responde 400 con `{'error': ...}`."""
+
+
+# -------------------- Parámetros --------------------
+def _arbol_id(datos):
+    arbol_id = datos.get('arbol_id', 'default')
+    if not id_valido(arbol_id):
+        raise _PeticionInvalida('arbol_id inválido: use letras, números, "_" o "-" (máx. 64)')
+    return arbol_id
+
+
+def _entero(datos, nombre):
+    texto = datos.get(nombre)
+    if texto is None:
+        raise _PeticionInvalida(f'falta el parámetro {nombre}')
+    try:
+        return int(texto)
+    except (TypeError, ValueError):
+        raise _PeticionInvalida(f'{nombre} debe ser un entero') from None
+
+
+def _tipo_arbol(datos):
+    if 'tipo_arbol' not in datos:
+        raise _PeticionInvalida('falta el parámetro tipo_arbol')
+    return datos['tipo_arbol']
+
+
+def _consulta(scope) -> dict:
+    return {nombre: valores[0] for nombre, valores in parse_qs(scope.get('query_string', b'').decode()).items()}
+
+
+# -------------------- Respuestas --------------------
+async def _enviar_json(send, datos, estado=200):
+    cuerpo = json.dumps(datos).encode()
+    await send({'type': 'http.response.start', 'status': estado,
+                'headers': [(b'content-type', b'application/json'),
+                            (b'content-length', str(len(cuerpo)).encode())]})
+    await send({'type': 'http.response.body', 'body': cuerpo})
+
+
+async def _enviar_por_partes(send, partes):
+    await send({'type': 'http.response.start', 'status': 200,
+                'headers': [(b'content-type', b'application/json')]})
+    for parte in partes:
+        await send({'type': 'http.response.body', 'body': parte, 'more_body': True})
+        # Cede el bucle entre partes para atender otras peticiones
+        await asyncio.sleep(0)
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+def _partes_bytes(cuerpo: bytes):
+    for i in range(0, len(cuerpo), TAMANO_PARTE):
+        yield cuerpo[i:i + TAMANO_PARTE]
+
+
+def _partes_recorrido(resultado: list[int]):
+    yield b'{"recorrido": ['
+    paso = TAMANO_PARTE // 8
+    for i in range(0, len(resultado), paso):
+        prefijo = ', ' if i else ''
+        yield (prefijo + ', '.join(map(str, resultado[i:i + paso]))).encode()
+    yield b']}'
+
+
+async def _leer_json(receive):
+    cuerpo = b''
+    while True:
+        mensaje = await receive()
+        cuerpo += mensaje.get('body', b'')
+        if not mensaje.get('more_body', False):
+            break
+    try:
+        datos = json.loads(cuerpo or b'{}')
+    except ValueError:
+        raise _PeticionInvalida('el cuerpo debe ser JSON') from None
+    if not isinstance(datos, dict):
+        raise _PeticionInvalida('el cuerpo debe ser un objeto JSON')
+    return datos
+
+
+# -------------------- Aplicación --------------------
+class AppArboles:
+    """Aplicación ASGI con su propio servicio de árboles (una por `crear_app`)."""
+
+    def __init__(self, config: dict) -> None:
+        self.config = config
+        self.servicio = ServicioArboles(config)
+        self._ejecutor = ThreadPoolExecutor(max_workers=HILOS_EJECUTOR, thread_name_prefix='arboles')
+
+    async def _ejecutar(self, funcion):
+        return await asyncio.get_running_loop().run_in_executor(self._ejecutor, funcion)
+
+    async def _leer(self, scope, funcion):
+        """Ejecuta `funcion(arbol)` con el árbol de la consulta, sin mutaciones en curso."""
+        consulta = _consulta(scope)
+        tipo_arbol = consulta.get('tipo_arbol', 'abb')
+        arbol_id = _arbol_id(consulta)
+
+        def leer():
+            with self.servicio.leer(tipo_arbol, arbol_id) as arbol:
+                return funcion(arbol)
+
+        return await self._ejecutar(leer)
+
+    # -------------------- Rutas --------------------
+    async def insertar(self, scope, receive, send):
+        data = await _leer_json(receive)
+        valor = _entero(data, 'valor')
+        tipo_arbol = _tipo_arbol(data)
+        arbol_id = _arbol_id(data)
+
+        await self._ejecutar(lambda: self.servicio.escribir(tipo_arbol, arbol_id, 'insertar', valor))
+        await _enviar_json(send, {'mensaje': f'Valor {valor} insertado en {NOMBRES[clave_tipo(tipo_arbol)]}'})
+
+    async def eliminar(self, scope, receive, send):
+        data = await _leer_json(receive)
+        valor = _entero(data, 'valor')
+        tipo_arbol = _tipo_arbol(data)
+        arbol_id = _arbol_id(data)
+
+        await self._ejecutar(lambda: self.servicio.escribir(tipo_arbol, arbol_id, 'eliminar', valor))
+        await _enviar_json(send, {'mensaje': f'Valor {valor} eliminado de {NOMBRES[clave_tipo(tipo_arbol)]}'})
+
+    async def recorrido(self, scope, receive, send, tipo):
+        resultado = await self._leer(scope, lambda arbol: recorrido(arbol, tipo))
+        await _enviar_por_partes(send, _partes_recorrido(resultado))
+
+    async def estructura(self, scope, receive, send):
+        consulta = _consulta(scope)
+        tipo_arbol = consulta.get('tipo_arbol', 'abb')
+        arbol_id = _arbol_id(consulta)
+        # Mismo cuerpo que /estructura de Flask, escrito sin recursión
+        cuerpo = await self._ejecutar(lambda: self.servicio.estructura(tipo_arbol, arbol_id).encode())
+        await _enviar_por_partes(send, _partes_bytes(cuerpo))
+
+    async def limpiar(self, scope, receive, send):
+        data = await _leer_json(receive)
+        tipo_arbol = _tipo_arbol(data)
+        arbol_id = _arbol_id(data)
+
+        await self._ejecutar(lambda: self.servicio.limpiar(tipo_arbol, arbol_id))
+        nombre = NOMBRES[clave_tipo(tipo_arbol)]
+        await _enviar_json(send, {'mensaje': f'{nombre[0].upper()}{nombre[1:]} limpiado'})
+
+    async def estadisticas(self, scope, receive, send):
+        # O(1), pero las mutaciones corren en el ejecutor: se lee con el bloqueo del árbol
+        tipo_arbol = _consulta(scope).get('tipo_arbol', 'abb')
+        datos = await self._leer(scope, lambda arbol: arbol.estadisticas())
+        await _enviar_json(send, dict(datos, tipo_arbol=clave_tipo(tipo_arbol)))
+
+    async def _ciclo_de_vida(self, receive, send):
+        while True:
+            mensaje = await receive()
+            if mensaje['type'] == 'lifespan.startup':
+                if self.config['ARBOLES_PRECALENTAR']:
+                    self.servicio.precalentar_en_segundo_plano()
+                await send({'type': 'lifespan.startup.complete'})
+            elif mensaje['type'] == 'lifespan.shutdown':
+                self._ejecutor.shutdown(wait=True)
+                self.servicio.cerrar()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._ciclo_de_vida(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        metodo, ruta = scope['method'], scope['path']
+        try:
+            if metodo == 'POST' and ruta == '/insertar':
+                await self.insertar(scope, receive, send)
+            elif metodo == 'POST' and ruta == '/eliminar':
+                await self.eliminar(scope, receive, send)
+            elif metodo == 'GET' and ruta.startswith('/recorrido/'):
+                await self.recorrido(scope, receive, send, ruta[len('/recorrido/'):])
+            elif metodo == 'GET' and ruta == '/estructura':
+                await self.estructura(scope, receive, send)
+            elif metodo == 'POST' and ruta == '/limpiar':
+                await self.limpiar(scope, receive, send)
+            elif metodo == 'GET' and ruta == '/estadisticas':
+                await self.estadisticas(scope, receive, send)
+            else:
+                await _enviar_json(send, {'error': 'Ruta no encontrada'}, estado=404)
+        except _PeticionInvalida as error:
+            await _enviar_json(send, {'error': str(error)}, estado=400)
+
+
+def crear_app(**config) -> AppArboles:
+    """Crea la app ASGI; `config` reemplaza claves `ARBOLES_*` del entorno (ver `configuracion_entorno`)."""
+    configuracion = dict(configuracion_entorno(), **config)
+    app = AppArboles(configuracion)
+    # Por si el servidor no envía los eventos de ciclo de vida
+    atexit.register(app.servicio.cerrar)
+    return app
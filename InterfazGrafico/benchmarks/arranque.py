@@ -0,0 +1,120 @@
+"""Arranque en frío: tiempo hasta la primera respuesta y primera consulta a cada árbol.
+
+Genera `--arboles` instantáneas de `--nodos` valores (repartidas entre los
+tipos de `--tipos`) y, para cada modo, arranca el servidor Flask sobre una
+copia nueva del directorio y mide:
+
+- arranque: desde lanzar el proceso hasta la primera respuesta (`GET /`);
+- primera consulta: latencia del primer `/estadisticas` a cada árbol, pedido
+  `--espera` segundos después de esa respuesta (lo que tarda un cliente en
+  pedir datos tras cargar la página);
+- total: desde lanzar el proceso hasta tener respondidos todos los árboles.
+
+Los modos son `ARBOLES_PRECALENTAR=0` (cada árbol se recarga en su primera
+consulta) y `ARBOLES_PRECALENTAR=1` (se recargan en segundo plano desde la
+primera petición). Cada medida es la mediana de `--repeticiones` arranques.
+
+Uso (desde `InterfazGrafico/`):
+    python -m benchmarks.arranque --arboles 4 --nodos 200000 --espera 0.5
+    python -m benchmarks.arranque --repeticiones 5 --entorno ARBOLES_MEMORIA_MB=64
+"""
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+
+from benchmarks.cliente_http import ConexionHTTP, levantar_servidor
+from registro import RegistroArboles
+
+MODOS = (('sin precalentar', '0'), ('precalentado', '1'))
+
+
+def _generar(directorio, tipos, arboles, nodos):
+    """Guarda las instantáneas de prueba; devuelve sus (tipo, arbol_id)."""
+    registro = RegistroArboles(presupuesto_bytes=0, directorio=directorio)
+    claves = []
+    for i in range(arboles):
+        tipo = tipos[i % len(tipos)]
+        arbol_id = f'arranque-{i}'
+        with registro.usar(tipo, arbol_id) as entrada:
+            entrada.arbol = registro.clases[tipo].desde_ordenados(sorted(random.sample(range(nodos * 10), nodos)))
+        claves.append((tipo, arbol_id))
+    registro.guardar_todo()
+    return claves
+
+
+async def _consultar(url, claves, espera):
+    conexion = ConexionHTTP(url)
+    try:
+        estado, _ = await conexion.peticion('GET', '/')
+        if estado != 200:
+            raise RuntimeError(f'GET / respondió {estado}')
+        primera = time.perf_counter()
+        await asyncio.sleep(espera)
+        latencias = []
+        for tipo, arbol_id in claves:
+            estado, segundos = await conexion.medir('GET', f'/estadisticas?tipo_arbol={tipo}&arbol_id={arbol_id}')
+            if estado != 200:
+                raise RuntimeError(f'/estadisticas de {tipo}:{arbol_id} respondió {estado}')
+            latencias.append(segundos)
+        return primera, latencias
+    finally:
+        await conexion.cerrar()
+
+
+def _arrancar(original, claves, precalentar, args):
+    # Recargar borra la instantánea: cada arranque usa una copia intacta
+    with tempfile.TemporaryDirectory() as temporal:
+        directorio = os.path.join(temporal, 'instantaneas')
+        shutil.copytree(original, directorio)
+        inicio = time.perf_counter()
+        proceso, url = levantar_servidor(dict(args.entorno, ARBOLES_INSTANTANEAS=directorio,
+                                              ARBOLES_PRECALENTAR=precalentar), intervalo=0.005)
+        try:
+            primera, latencias = asyncio.run(_consultar(url, claves, args.espera))
+            fin = time.perf_counter()
+        finally:
+            proceso.terminate()
+            proceso.wait()
+    return {
+        'arranque': primera - inicio,
+        'consulta_media': statistics.mean(latencias),
+        'consulta_max': max(latencias),
+        'total': fin - inicio
+    }
+
+
+def principal(args):
+    random.seed(args.semilla)
+    tipos = args.tipos.split(',')
+    with tempfile.TemporaryDirectory() as original:
+        inicio = time.perf_counter()
+        claves = _generar(original, tipos, args.arboles, args.nodos)
+        print(f'{args.arboles} instantáneas de {args.nodos:,} valores ({", ".join(tipos)}) '
+              f'generadas en {time.perf_counter() - inicio:.1f} s')
+        print(f'{"modo":<16} {"arranque":>9} {"1ª consulta":>12} {"máx.":>9} {"total":>9}')
+        for nombre, precalentar in MODOS:
+            medidas = [_arrancar(original, claves, precalentar, args) for _ in range(args.repeticiones)]
+            mediana = {clave: statistics.median(m[clave] for m in medidas) * 1000 for clave in medidas[0]}
+            print(f'{nombre:<16} {mediana["arranque"]:>6.0f} ms {mediana["consulta_media"]:>9.0f} ms '
+                  f'{mediana["consulta_max"]:>6.0f} ms {mediana["total"]:>6.0f} ms')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tipos', default='avl,abb', help='tipos de árbol, separados por comas')
+    parser.add_argument('--arboles', type=int, default=4, help='instantáneas en disco al arrancar')
+    parser.add_argument('--nodos', type=int, default=200_000, help='valores por árbol')
+    parser.add_argument('--espera', type=float, default=0.5,
+                        help='segundos entre la primera respuesta y las consultas')
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--entorno', action='append', default=[], metavar='CLAVE=VALOR',
+                        help='variables para el servidor (repetible)')
+    parser.add_argument('--semilla', type=int, default=1)
+    args = parser.parse_args()
+    args.entorno = dict(par.split('=', 1) for par in args.entorno)
+    principal(args)
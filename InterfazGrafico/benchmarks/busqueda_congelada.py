@@ -0,0 +1,67 @@
+"""Búsqueda en el árbol de punteros frente a la instantánea de Eytzinger.
+
+Mide consultas por segundo de `ArbolAVL.buscar`, `ArbolBinario.buscar`,
+`ArbolCongelado.buscar` (escalar) y `ArbolCongelado.buscar_lote`
+(vectorizada), con `numpy.searchsorted` sobre el arreglo ordenado como
+referencia. La mitad de las consultas son claves presentes.
+
+Uso (desde `InterfazGrafico/`):
+    python -m benchmarks.busqueda_congelada --n 1000000 --consultas 2000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from arboles.abb import ArbolBinario
+from arboles.avl import ArbolAVL
+
+
+def _tasa(funcion, cantidad):
+    inicio = time.perf_counter()
+    funcion()
+    return cantidad / (time.perf_counter() - inicio)
+
+
+def principal(args):
+    generador = np.random.default_rng(args.semilla)
+    ordenados = np.unique(generador.integers(0, 1 << 62, size=args.n))
+    presentes = generador.choice(ordenados, size=args.consultas // 2)
+    ausentes = generador.integers(0, 1 << 62, size=args.consultas - presentes.size)
+    consultas = np.concatenate([presentes, ausentes])
+    generador.shuffle(consultas)
+    escalares = consultas[:args.escalares].tolist()
+
+    avl = ArbolAVL.desde_ordenados(ordenados.tolist())
+    abb = ArbolBinario.desde_ordenados(ordenados.tolist())
+    inicio = time.perf_counter()
+    congelado = avl.congelar(ordenados.size)
+    print(f'{ordenados.size} claves; congelar: {time.perf_counter() - inicio:.2f} s')
+
+    esperado = np.isin(consultas, ordenados)
+    assert (congelado.buscar_lote(consultas) == esperado).all()
+
+    def _searchsorted():
+        i = np.searchsorted(ordenados, consultas)
+        return ordenados[np.minimum(i, ordenados.size - 1)] == consultas
+
+    filas = [
+        ('ArbolAVL.buscar', _tasa(lambda: [avl.buscar(v) for v in escalares], len(escalares))),
+        ('ArbolBinario.buscar', _tasa(lambda: [abb.buscar(v) for v in escalares], len(escalares))),
+        ('ArbolCongelado.buscar', _tasa(lambda: [congelado.buscar(v) for v in escalares], len(escalares))),
+        ('ArbolCongelado.buscar_lote', _tasa(lambda: congelado.buscar_lote(consultas), consultas.size)),
+        ('numpy.searchsorted', _tasa(_searchsorted, consultas.size)),
+    ]
+    referencia = filas[0][1]
+    print(f'{"método":<28} {"consultas/s":>14} {"vs AVL":>8}')
+    for nombre, tasa in filas:
+        print(f'{nombre:<28} {tasa:>14,.0f} {tasa / referencia:>7.1f}x')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n', type=int, default=1_000_000)
+    parser.add_argument('--consultas', type=int, default=2_000_000, help='consultas del lote vectorizado')
+    parser.add_argument('--escalares', type=int, default=200_000, help='consultas de las búsquedas de a una')
+    parser.add_argument('--semilla', type=int, default=0)
+    principal(parser.parse_args())
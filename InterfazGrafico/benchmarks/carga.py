@@ -0,0 +1,276 @@
+"""Prueba de carga HTTP: rendimiento y latencias p50/p95/p99 por ruta y tamaño de árbol.
+
+Para cada tamaño de árbol se precarga un árbol propio (`arbol_id`
+`carga-<tamaño>`) con `/importar` y se lanza una mezcla de `/insertar`,
+`/eliminar`, `/recorrido/<tipo>`, `/estructura` y `/limpiar` durante
+`--duracion` segundos sobre `--conexiones` conexiones keep-alive.
+
+Con `--tasa` > 0 la carga es de lazo abierto: las peticiones se programan a
+ritmo fijo y la latencia se cuenta desde el instante programado, así que la
+espera en cola cuando el servidor no da abasto también se mide (sin omisión
+coordinada). Lo programado que no llegó a enviarse antes del final se
+informa como "atrasadas". Con `--tasa 0` cada conexión envía sin pausa.
+
+`/limpiar` va a un árbol aparte (`carga-<tamaño>-limpiar`) para que el árbol
+medido conserve su tamaño durante la fase; `/eliminar` elige valores
+presentes, de modo que cada borrado quita un nodo de verdad.
+
+Sin `--url`, levanta el servidor Flask local con un directorio de
+instantáneas temporal. `--salida` guarda los resultados en JSON y
+`--comparar` los contrasta con una ejecución anterior: si algún p99 empeora
+más de `--tolerancia` por ciento, termina con código 1.
+
+Uso (desde `InterfazGrafico/`):
+    python -m benchmarks.carga --tamanos 1000,10000,100000 --tasa 400 --conexiones 64
+    python -m benchmarks.carga --mezcla insertar=70,eliminar=20,estructura=10 --entorno ARBOLES_LOTE_MS=2
+    python -m benchmarks.carga --url http://127.0.0.1:5000 --salida base.json
+    python -m benchmarks.carga --comparar base.json --tolerancia 25
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+from benchmarks.cliente_http import ConexionHTTP, levantar_servidor, percentil
+
+RUTAS = ('insertar', 'eliminar', 'recorrido', 'estructura', 'limpiar')
+MEZCLA = 'insertar=50,eliminar=30,recorrido=8,estructura=8,limpiar=4'
+RECORRIDOS = ('inorden', 'preorden', 'postorden', 'amplitud')
+# Diferencia mínima (ms) para considerar regresión: por debajo es ruido del reloj
+UMBRAL_RUIDO_MS = 1.0
+
+
+def _mezcla(texto):
+    pesos = {}
+    for parte in texto.split(','):
+        ruta, _, peso = parte.partition('=')
+        ruta = ruta.strip()
+        if ruta not in RUTAS:
+            raise argparse.ArgumentTypeError(f'ruta desconocida: {ruta!r} (use {", ".join(RUTAS)})')
+        pesos[ruta] = float(peso or 1)
+    if not any(pesos.values()):
+        raise argparse.ArgumentTypeError('la mezcla no tiene pesos positivos')
+    return pesos
+
+
+class _Fase:
+    """Estado compartido por las conexiones durante la carga de un tamaño."""
+
+    def __init__(self, tipo_arbol, arbol_id, vivos, pesos):
+        self.tipo_arbol = tipo_arbol
+        self.arbol_id = arbol_id
+        self.vivos = vivos
+        self.rutas = list(pesos)
+        self.pesos = list(pesos.values())
+        self.latencias: dict[str, list[float]] = defaultdict(list)
+        self.errores: dict[str, int] = defaultdict(int)
+
+    def _eliminable(self):
+        # Quitar en O(1): se intercambia con el último
+        if not self.vivos:
+            return random.randrange(1 << 30)
+        i = random.randrange(len(self.vivos))
+        self.vivos[i], self.vivos[-1] = self.vivos[-1], self.vivos[i]
+        return self.vivos.pop()
+
+    def peticion(self):
+        """(ruta, método, camino, datos) de la siguiente petición según la mezcla."""
+        ruta = random.choices(self.rutas, self.pesos)[0]
+        consulta = f'tipo_arbol={self.tipo_arbol}&arbol_id={self.arbol_id}'
+        if ruta == 'insertar':
+            valor = random.randrange(1 << 30)
+            self.vivos.append(valor)
+            return ruta, 'POST', '/insertar', {'valor': valor, 'tipo_arbol': self.tipo_arbol,
+                                               'arbol_id': self.arbol_id}
+        if ruta == 'eliminar':
+            return ruta, 'POST', '/eliminar', {'valor': self._eliminable(), 'tipo_arbol': self.tipo_arbol,
+                                               'arbol_id': self.arbol_id}
+        if ruta == 'recorrido':
+            return ruta, 'GET', f'/recorrido/{random.choice(RECORRIDOS)}?{consulta}', None
+        if ruta == 'estructura':
+            return ruta, 'GET', f'/estructura?{consulta}', None
+        return ruta, 'POST', '/limpiar', {'tipo_arbol': self.tipo_arbol, 'arbol_id': f'{self.arbol_id}-limpiar'}
+
+    async def enviar(self, conexion, peticion, desde):
+        ruta, metodo, camino, datos = peticion
+        try:
+            estado, _ = await conexion.peticion(metodo, camino, datos)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            self.errores[ruta] += 1
+            return
+        if estado >= 400:
+            self.errores[ruta] += 1
+        else:
+            self.latencias[ruta].append(time.perf_counter() - desde)
+
+
+async def _precargar(url, tipo_arbol, arbol_id, tamano):
+    conexion = ConexionHTTP(url)
+    await conexion.peticion('POST', '/limpiar', {'tipo_arbol': tipo_arbol, 'arbol_id': arbol_id})
+    vivos = random.sample(range(1 << 30), tamano)
+    if vivos:
+        cuerpo = '\n'.join(map(str, vivos)).encode()
+        estado, respuesta = await conexion.peticion(
+            'POST', f'/importar?tipo_arbol={tipo_arbol}&arbol_id={arbol_id}', crudo=cuerpo)
+        if estado != 200:
+            raise RuntimeError(f'/importar respondió {estado}: {respuesta[:200]!r}')
+    await conexion.cerrar()
+    return vivos
+
+
+async def _lazo_abierto(url, fase, conexiones, tasa, duracion):
+    cola: asyncio.Queue = asyncio.Queue()
+    inicio = time.perf_counter()
+    fin = inicio + duracion
+    atrasadas = 0
+
+    async def _programar():
+        i = 0
+        while True:
+            programado = inicio + i / tasa
+            if programado >= fin:
+                break
+            espera = programado - time.perf_counter()
+            if espera > 0:
+                await asyncio.sleep(espera)
+            cola.put_nowait((fase.peticion(), programado))
+            i += 1
+        for _ in range(conexiones):
+            cola.put_nowait(None)
+
+    async def _trabajador():
+        nonlocal atrasadas
+        conexion = ConexionHTTP(url)
+        while (elemento := await cola.get()) is not None:
+            if time.perf_counter() >= fin:
+                # Programadas a tiempo pero sin conexión libre antes del final
+                atrasadas += 1
+                continue
+            await fase.enviar(conexion, *elemento)
+        await conexion.cerrar()
+
+    await asyncio.gather(_programar(), *(_trabajador() for _ in range(conexiones)))
+    return time.perf_counter() - inicio, atrasadas
+
+
+async def _lazo_cerrado(url, fase, conexiones, duracion):
+    inicio = time.perf_counter()
+    fin = inicio + duracion
+
+    async def _trabajador():
+        conexion = ConexionHTTP(url)
+        while time.perf_counter() < fin:
+            await fase.enviar(conexion, fase.peticion(), time.perf_counter())
+        await conexion.cerrar()
+
+    await asyncio.gather(*(_trabajador() for _ in range(conexiones)))
+    return time.perf_counter() - inicio, 0
+
+
+async def _nodos(url, tipo_arbol, arbol_id):
+    conexion = ConexionHTTP(url)
+    _, cuerpo = await conexion.peticion('GET', '/arboles')
+    await conexion.cerrar()
+    for arbol in json.loads(cuerpo)['arboles']:
+        if arbol['tipo_arbol'] == tipo_arbol and arbol['arbol_id'] == arbol_id:
+            return arbol['nodos']
+    return None
+
+
+async def _ejecutar(url, args):
+    resultados = []
+    print(f'{"árbol":<5} {"tamaño":>8} {"ruta":<11} {"peticiones":>10} {"errores":>7} {"req/s":>8} '
+          f'{"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"máx ms":>8}')
+    for tipo_arbol in args.tipos:
+        for tamano in args.tamanos:
+            arbol_id = f'carga-{tamano}'
+            fase = _Fase(tipo_arbol, arbol_id, await _precargar(url, tipo_arbol, arbol_id, tamano), args.mezcla)
+            if args.tasa > 0:
+                segundos, atrasadas = await _lazo_abierto(url, fase, args.conexiones, args.tasa, args.duracion)
+            else:
+                segundos, atrasadas = await _lazo_cerrado(url, fase, args.conexiones, args.duracion)
+
+            total = 0
+            for ruta in fase.rutas:
+                ms = [s * 1000 for s in fase.latencias[ruta]]
+                fila = {
+                    'tipo_arbol': tipo_arbol, 'tamano': tamano, 'ruta': ruta,
+                    'peticiones': len(ms), 'errores': fase.errores[ruta],
+                    'por_segundo': len(ms) / segundos,
+                    'p50': percentil(ms, 50), 'p95': percentil(ms, 95), 'p99': percentil(ms, 99),
+                    'max': max(ms, default=0.0)
+                }
+                total += len(ms)
+                resultados.append(fila)
+                print(f'{tipo_arbol:<5} {tamano:>8} {ruta:<11} {fila["peticiones"]:>10} {fila["errores"]:>7} '
+                      f'{fila["por_segundo"]:>8.1f} {fila["p50"]:>8.2f} {fila["p95"]:>8.2f} '
+                      f'{fila["p99"]:>8.2f} {fila["max"]:>8.2f}')
+            objetivo = f' (objetivo {args.tasa:g})' if args.tasa > 0 else ''
+            print(f'{tipo_arbol:<5} {tamano:>8} {"total":<11} {total:>10} {"":>7} {total / segundos:>8.1f}'
+                  f'{objetivo}; atrasadas: {atrasadas}; nodos al final: '
+                  f'{await _nodos(url, tipo_arbol, arbol_id)}')
+    return resultados
+
+
+def _comparar(resultados, archivo, tolerancia):
+    with open(archivo) as f:
+        base = {(r['tipo_arbol'], r['tamano'], r['ruta']): r for r in json.load(f)['resultados']}
+    regresiones = 0
+    for fila in resultados:
+        anterior = base.get((fila['tipo_arbol'], fila['tamano'], fila['ruta']))
+        if anterior is None or not fila['peticiones']:
+            continue
+        limite = max(anterior['p99'] * (1 + tolerancia / 100), anterior['p99'] + UMBRAL_RUIDO_MS)
+        if fila['p99'] > limite:
+            regresiones += 1
+            print(f'REGRESIÓN {fila["tipo_arbol"]} {fila["tamano"]} {fila["ruta"]}: '
+                  f'p99 {anterior["p99"]:.2f} ms -> {fila["p99"]:.2f} ms')
+    print(f'{regresiones} regresiones de p99 (tolerancia {tolerancia:g} %)')
+    return regresiones
+
+
+def principal(args):
+    random.seed(args.semilla)
+    if args.url:
+        resultados = asyncio.run(_ejecutar(args.url, args))
+    else:
+        with tempfile.TemporaryDirectory() as directorio:
+            proceso, url = levantar_servidor(dict(args.entorno, ARBOLES_INSTANTANEAS=directorio))
+            try:
+                resultados = asyncio.run(_ejecutar(url, args))
+            finally:
+                proceso.terminate()
+                proceso.wait()
+
+    if args.salida:
+        configuracion = {k: v for k, v in vars(args).items() if k not in ('salida', 'comparar')}
+        with open(args.salida, 'w') as f:
+            json.dump({'configuracion': configuracion, 'resultados': resultados}, f, indent=2)
+    if args.comparar and _comparar(resultados, args.comparar, args.tolerancia):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='servidor ya levantado (por defecto se arranca uno local)')
+    parser.add_argument('--tipos', default='avl', help='tipos de árbol, separados por comas')
+    parser.add_argument('--tamanos', default='1000,10000,100000', help='tamaños de árbol precargados')
+    parser.add_argument('--mezcla', type=_mezcla, default=_mezcla(MEZCLA), help=f'pesos por ruta (defecto: {MEZCLA})')
+    parser.add_argument('--tasa', type=float, default=200, help='peticiones/s programadas (0 = sin pausa)')
+    parser.add_argument('--conexiones', type=int, default=32)
+    parser.add_argument('--duracion', type=float, default=10.0, help='segundos por tamaño')
+    parser.add_argument('--entorno', action='append', default=[], metavar='CLAVE=VALOR',
+                        help='variables para el servidor local (repetible)')
+    parser.add_argument('--salida', help='guarda los resultados en este JSON')
+    parser.add_argument('--comparar', help='JSON de una ejecución anterior')
+    parser.add_argument('--tolerancia', type=float, default=20.0, help='empeoramiento de p99 admitido (%%)')
+    parser.add_argument('--semilla', type=int, default=0)
+    args = parser.parse_args()
+    args.tipos = [t.strip() for t in args.tipos.split(',')]
+    args.tamanos = [int(t) for t in args.tamanos.split(',')]
+    args.entorno = dict(e.split('=', 1) for e in args.entorno)
+    principal(args)
@@ -0,0 +1,132 @@
+"""Cliente HTTP/1.1 mínimo sobre asyncio (solo biblioteca estándar) para las pruebas de carga."""
+import asyncio
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+
+class ConexionHTTP:
+    """Conexión keep-alive a un servidor local; se reabre si el servidor la cierra."""
+
+    def __init__(self, url_base: str) -> None:
+        partes = urlsplit(url_base)
+        self.host = partes.hostname or '127.0.0.1'
+        self.puerto = partes.port or 80
+        self._lector: asyncio.StreamReader | None = None
+        self._escritor: asyncio.StreamWriter | None = None
+
+    async def _abrir(self) -> None:
+        self._lector, self._escritor = await asyncio.open_connection(self.host, self.puerto)
+
+    async def cerrar(self) -> None:
+        if self._escritor is not None:
+            self._escritor.close()
+            try:
+                await self._escritor.wait_closed()
+            except OSError:
+                pass
+        self._lector = self._escritor = None
+
+    async def peticion(self, metodo: str, ruta: str, datos: dict | None = None,
+                       crudo: bytes | None = None) -> tuple[int, bytes]:
+        """Envía una petición (JSON en `datos` o bytes tal cual en `crudo`) y devuelve (estado, cuerpo)."""
+        for intento in range(2):
+            if self._escritor is None:
+                await self._abrir()
+            try:
+                return await self._enviar(metodo, ruta, datos, crudo)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # El servidor cerró una conexión reutilizada: se reintenta una vez
+                await self.cerrar()
+                if intento:
+                    raise
+        raise ConnectionError('sin respuesta')
+
+    async def _enviar(self, metodo, ruta, datos, crudo=None):
+        cuerpo = json.dumps(datos).encode() if datos is not None else crudo or b''
+        cabeceras = [f'{metodo} {ruta} HTTP/1.1', f'Host: {self.host}:{self.puerto}',
+                     f'Content-Length: {len(cuerpo)}']
+        if datos is not None:
+            cabeceras.append('Content-Type: application/json')
+        elif crudo is not None:
+            cabeceras.append('Content-Type: text/plain')
+        self._escritor.write(('\r\n'.join(cabeceras) + '\r\n\r\n').encode() + cuerpo)
+        await self._escritor.drain()
+
+        linea = await self._lector.readuntil(b'\r\n')
+        estado = int(linea.split()[1])
+        respuesta: dict[str, str] = {}
+        while True:
+            linea = await self._lector.readuntil(b'\r\n')
+            if linea == b'\r\n':
+                break
+            nombre, _, valor = linea.decode('latin-1').partition(':')
+            respuesta[nombre.strip().lower()] = valor.strip()
+
+        if respuesta.get('transfer-encoding', '').lower() == 'chunked':
+            partes = []
+            while True:
+                tamano = int((await self._lector.readuntil(b'\r\n')).split(b';')[0], 16)
+                if tamano == 0:
+                    await self._lector.readuntil(b'\r\n')
+                    break
+                partes.append(await self._lector.readexactly(tamano))
+                await self._lector.readexactly(2)
+            contenido = b''.join(partes)
+        elif 'content-length' in respuesta:
+            contenido = await self._lector.readexactly(int(respuesta['content-length']))
+        else:
+            contenido = await self._lector.read()
+            await self.cerrar()
+            return estado, contenido
+
+        if respuesta.get('connection', '').lower() == 'close':
+            await self.cerrar()
+        return estado, contenido
+
+    async def medir(self, metodo: str, ruta: str, datos: dict | None = None) -> tuple[int, float]:
+        """Como `peticion`, pero devuelve (estado, segundos)."""
+        inicio = time.perf_counter()
+        estado, _ = await self.peticion(metodo, ruta, datos)
+        return estado, time.perf_counter() - inicio
+
+
+def percentil(muestras: list[float], p: float) -> float:
+    """Percentil por rango más cercano; `muestras` no necesita estar ordenada."""
+    if not muestras:
+        return 0.0
+    ordenadas = sorted(muestras)
+    indice = max(0, min(len(ordenadas) - 1, math.ceil(p / 100 * len(ordenadas)) - 1))
+    return ordenadas[indice]
+
+
+def _puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def levantar_servidor(entorno: dict[str, str], espera: float = 20,
+                      intervalo: float = 0.1) -> tuple[subprocess.Popen, str]:
+    """Arranca `flask run` sobre `app` (desde `InterfazGrafico/`) en un puerto libre; devuelve (proceso, url).
+
+    Vuelve en cuanto el puerto acepta conexiones, probando cada `intervalo` segundos.
+    """
+    puerto = _puerto_libre()
+    proceso = subprocess.Popen([sys.executable, '-m', 'flask', '--app', 'app', 'run', '--port', str(puerto)],
+                               env=dict(os.environ, **entorno),
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    fin = time.monotonic() + espera
+    while time.monotonic() < fin:
+        try:
+            socket.create_connection(('127.0.0.1', puerto), timeout=0.2).close()
+            return proceso, f'http://127.0.0.1:{puerto}'
+        except OSError:
+            time.sleep(intervalo)
+    proceso.kill()
+    raise RuntimeError('el servidor no arrancó')
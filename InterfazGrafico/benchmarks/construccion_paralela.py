@@ -0,0 +1,47 @@
+"""Escalado de la construcción paralela de árboles entre 1 y N procesos.
+
+Uso (desde `InterfazGrafico/`):
+    python -m benchmarks.construccion_paralela --n 5000000 --procesos 8
+"""
+import argparse
+import os
+import random
+import time
+from array import array
+
+from arboles.avl import ArbolAVL
+from arboles.construccion import construir_abb_paralelo, construir_avl_paralelo, ordenar_paralelo
+
+
+def _cronometrar(funcion, *args):
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def principal(args):
+    valores = array('q', (random.randrange(-(1 << 62), 1 << 62) for _ in range(args.n)))
+
+    base = min(args.n, args.base)
+    arbol = ArbolAVL()
+    _, segundos = _cronometrar(lambda: [arbol.insertar(v) for v in valores[:base]])
+    print(f'ArbolAVL.insertar uno a uno: {base} claves en {segundos:.2f} s '
+          f'(~{segundos * args.n / base:.1f} s extrapolado a {args.n})')
+
+    print(f'{"procesos":>8} {"ordenar s":>10} {"avl s":>8} {"abb s":>8} {"acel. avl":>10}')
+    referencia = None
+    for procesos in range(1, args.procesos + 1):
+        _, ordenar = _cronometrar(ordenar_paralelo, valores, procesos)
+        _, avl = _cronometrar(construir_avl_paralelo, valores, procesos)
+        _, abb = _cronometrar(construir_abb_paralelo, valores, procesos)
+        referencia = referencia or avl
+        print(f'{procesos:>8} {ordenar:>10.2f} {avl:>8.2f} {abb:>8.2f} {referencia / avl:>9.2f}x')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n', type=int, default=2_000_000)
+    parser.add_argument('--procesos', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--base', type=int, default=200_000,
+                        help='claves para medir la inserción uno a uno de referencia')
+    principal(parser.parse_args())
@@ -0,0 +1,91 @@
+"""Rendimiento de las escrituras agrupadas en lotes.
+
+Primero mide en el propio proceso `insertar` uno a uno frente a
+`insertar_lote` para varios tamaños de lote. Después levanta el servidor
+Flask una vez por cada ventana (`ARBOLES_LOTE_MS`) y lanza clientes que
+insertan a la vez, midiendo inserciones por segundo y latencia de cola.
+
+Uso (desde `InterfazGrafico/`):
+    python -m benchmarks.escrituras_agrupadas --ventanas 0,1,2,5 --clientes 32
+"""
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+
+from arboles.abb import ArbolBinario
+from arboles.avl import ArbolAVL
+from benchmarks.cliente_http import ConexionHTTP, levantar_servidor, percentil
+
+
+def _en_proceso(nodos, operaciones, lotes):
+    print(f'{"árbol":<6} {"lote":>6} {"ops/s":>12} {"acel.":>7}')
+    for nombre, clase in (('avl', ArbolAVL), ('abb', ArbolBinario)):
+        base = random.sample(range(nodos * 10), nodos)
+        valores = [random.randrange(nodos * 10) for _ in range(operaciones)]
+        referencia = None
+        for lote in lotes:
+            arbol = clase()
+            arbol.insertar_lote(base)
+            inicio = time.perf_counter()
+            if lote == 1:
+                for valor in valores:
+                    arbol.insertar(valor)
+            else:
+                for i in range(0, operaciones, lote):
+                    arbol.insertar_lote(valores[i:i + lote])
+            tasa = operaciones / (time.perf_counter() - inicio)
+            referencia = referencia or tasa
+            print(f'{nombre:<6} {lote:>6} {tasa:>12,.0f} {tasa / referencia:>6.2f}x')
+
+
+async def _medir(url, tipo_arbol, clientes, duracion):
+    fin = time.perf_counter() + duracion
+    latencias: list[float] = []
+
+    async def _cliente():
+        conexion = ConexionHTTP(url)
+        while time.perf_counter() < fin:
+            valor = random.randrange(1 << 30)
+            _, segundos = await conexion.medir('POST', '/insertar', {'valor': valor, 'tipo_arbol': tipo_arbol})
+            latencias.append(segundos)
+        await conexion.cerrar()
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(_cliente() for _ in range(clientes)))
+    return latencias, time.perf_counter() - inicio
+
+
+def _por_http(args):
+    print(f'{"ventana ms":>10} {"ops/s":>10} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"máx ms":>8}')
+    for ventana in args.ventanas:
+        with tempfile.TemporaryDirectory() as directorio:
+            proceso, url = levantar_servidor({'ARBOLES_LOTE_MS': str(ventana), 'ARBOLES_LOTE_MAX': str(args.maximo),
+                                              'ARBOLES_INSTANTANEAS': directorio})
+            try:
+                latencias, segundos = asyncio.run(_medir(url, args.tipo_arbol, args.clientes, args.duracion))
+            finally:
+                proceso.terminate()
+                proceso.wait()
+        ms = [s * 1000 for s in latencias]
+        print(f'{ventana:>10g} {len(ms) / segundos:>10,.0f} {percentil(ms, 50):>8.2f} '
+              f'{percentil(ms, 95):>8.2f} {percentil(ms, 99):>8.2f} {max(ms, default=0):>8.2f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--nodos', type=int, default=100_000, help='tamaño inicial del árbol (en proceso)')
+    parser.add_argument('--operaciones', type=int, default=50_000)
+    parser.add_argument('--lotes', default='1,16,64,256', help='tamaños de lote (en proceso)')
+    parser.add_argument('--ventanas', default='0,1,2,5', help='valores de ARBOLES_LOTE_MS a probar')
+    parser.add_argument('--maximo', type=int, default=256, help='ARBOLES_LOTE_MAX')
+    parser.add_argument('--clientes', type=int, default=32)
+    parser.add_argument('--duracion', type=float, default=5.0)
+    parser.add_argument('--tipo-arbol', default='avl')
+    parser.add_argument('--solo-proceso', action='store_true', help='omite la parte HTTP')
+    args = parser.parse_args()
+    args.ventanas = [float(v) for v in args.ventanas.split(',')]
+    _en_proceso(args.nodos, args.operaciones, [int(l) for l in args.lotes.split(',')])
+    if not args.solo_proceso:
+        _por_http(args)
@@ -0,0 +1,83 @@
+"""Compara la latencia de cola del servidor Flask y la variante ASGI.
+
+Con el árbol cargado, unos clientes piden recorridos y estructuras completas
+(O(n)) mientras otros insertan valores; se mide la latencia de las
+inserciones, que es la que sufre cuando un recorrido largo bloquea al servidor.
+
+Uso (desde `InterfazGrafico/`, con ambos servidores levantados):
+    python app.py                       # Flask en :5000
+    uvicorn --factory asgi:crear_app --port 8001        # ASGI en :8001
+    python -m benchmarks.latencia_asgi --flask http://127.0.0.1:5000 --asgi http://127.0.0.1:8001
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from benchmarks.cliente_http import ConexionHTTP, percentil
+
+
+async def _cargar(url, nodos, tipo_arbol, clientes=16):
+    conexiones = [ConexionHTTP(url) for _ in range(clientes)]
+    await conexiones[0].peticion('POST', '/limpiar', {'tipo_arbol': tipo_arbol})
+    valores = random.sample(range(nodos * 10), nodos)
+
+    async def _insertar(conexion, parte):
+        for valor in parte:
+            await conexion.peticion('POST', '/insertar', {'valor': valor, 'tipo_arbol': tipo_arbol})
+
+    await asyncio.gather(*(_insertar(c, valores[i::clientes]) for i, c in enumerate(conexiones)))
+    for conexion in conexiones:
+        await conexion.cerrar()
+
+
+async def _medir(url, tipo_arbol, pesados, ligeros, duracion):
+    fin = time.perf_counter() + duracion
+    latencias: list[float] = []
+    recorridos = 0
+
+    async def _cliente_pesado():
+        nonlocal recorridos
+        conexion = ConexionHTTP(url)
+        rutas = [f'/recorrido/inorden?tipo_arbol={tipo_arbol}', f'/estructura?tipo_arbol={tipo_arbol}']
+        while time.perf_counter() < fin:
+            await conexion.peticion('GET', random.choice(rutas))
+            recorridos += 1
+        await conexion.cerrar()
+
+    async def _cliente_ligero():
+        conexion = ConexionHTTP(url)
+        while time.perf_counter() < fin:
+            valor = random.randrange(1 << 30)
+            _, segundos = await conexion.medir('POST', '/insertar', {'valor': valor, 'tipo_arbol': tipo_arbol})
+            latencias.append(segundos)
+        await conexion.cerrar()
+
+    await asyncio.gather(*[_cliente_pesado() for _ in range(pesados)],
+                         *[_cliente_ligero() for _ in range(ligeros)])
+    return latencias, recorridos
+
+
+async def principal(args):
+    print(f'{"servidor":<8} {"inserciones":>11} {"recorridos":>10} '
+          f'{"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"máx ms":>8}')
+    for nombre, url in (('flask', args.flask), ('asgi', args.asgi)):
+        if not url:
+            continue
+        await _cargar(url, args.nodos, args.tipo_arbol)
+        latencias, recorridos = await _medir(url, args.tipo_arbol, args.pesados, args.ligeros, args.duracion)
+        ms = [s * 1000 for s in latencias]
+        print(f'{nombre:<8} {len(ms):>11} {recorridos:>10} {percentil(ms, 50):>8.2f} '
+              f'{percentil(ms, 95):>8.2f} {percentil(ms, 99):>8.2f} {max(ms, default=0):>8.2f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--flask', default='http://127.0.0.1:5000')
+    parser.add_argument('--asgi', default='http://127.0.0.1:8001')
+    parser.add_argument('--nodos', type=int, default=20000)
+    parser.add_argument('--tipo-arbol', default='avl')
+    parser.add_argument('--pesados', type=int, default=4, help='clientes pidiendo recorridos completos')
+    parser.add_argument('--ligeros', type=int, default=16, help='clientes insertando')
+    parser.add_argument('--duracion', type=float, default=10.0, help='segundos de medición')
+    asyncio.run(principal(parser.parse_args()))
@@ -0,0 +1,92 @@
+import json
+import queue
+import threading
+
+# Deltas pendientes por suscriptor. Un cliente que no lee a tiempo no hace
+# crecer la memoria: al llenarse su cola se descartan sus deltas y recibe un
+# evento `resincronizar` para volver a pedir la estructura completa.
+MAX_PENDIENTES = 1024
+
+
+class Suscriptor:
+    """Cola acotada de un cliente SSE y el árbol que le interesa (None: cualquiera)."""
+
+    def __init__(self, tipo_arbol: str | None, arbol_id: str | None, capacidad: int) -> None:
+        self.tipo_arbol = tipo_arbol
+        self.arbol_id = arbol_id
+        self.cola: queue.Queue = queue.Queue(maxsize=capacidad)
+        # Se perdieron deltas: lo pendiente ya no sirve
+        self.desbordado = False
+
+    def quiere(self, clave: str) -> bool:
+        tipo_arbol, _, arbol_id = clave.partition(':')
+        return (self.tipo_arbol in (None, tipo_arbol)) and (self.arbol_id in (None, arbol_id))
+
+
+class CanalEventos:
+    """Difunde los cambios de los árboles a los clientes conectados por SSE."""
+
+    def __init__(self, capacidad: int = MAX_PENDIENTES) -> None:
+        self.capacidad = capacidad
+        self._bloqueo = threading.Lock()
+        self._suscriptores: list[Suscriptor] = []
+        self._versiones: dict[str, int] = {}
+
+    def version(self, clave: str) -> int:
+        return self._versiones.get(clave, 0)
+
+    def publicar(self, clave: str, delta: dict) -> int:
+        """Asigna la siguiente versión del árbol `clave` (`tipo:id`) y envía el delta a quien lo siga."""
+        with self._bloqueo:
+            version = self._versiones.get(clave, 0) + 1
+            self._versiones[clave] = version
+            mensaje = dict(delta, version=version)
+            for suscriptor in self._suscriptores:
+                if suscriptor.desbordado or not suscriptor.quiere(clave):
+                    continue
+                try:
+                    suscriptor.cola.put_nowait(mensaje)
+                except queue.Full:
+                    suscriptor.desbordado = True
+        return version
+
+    def suscribir(self, tipo_arbol: str | None = None, arbol_id: str | None = None) -> Suscriptor:
+        suscriptor = Suscriptor(tipo_arbol, arbol_id, self.capacidad)
+        with self._bloqueo:
+            self._suscriptores.append(suscriptor)
+        return suscriptor
+
+    def desuscribir(self, suscriptor: Suscriptor) -> None:
+        with self._bloqueo:
+            if suscriptor in self._suscriptores:
+                self._suscriptores.remove(suscriptor)
+
+    def _resincronizar(self, suscriptor: Suscriptor) -> None:
+        # Con el canal tomado no entra ningún delta mientras se vacía la cola
+        with self._bloqueo:
+            while True:
+                try:
+                    suscriptor.cola.get_nowait()
+                except queue.Empty:
+                    break
+            suscriptor.desbordado = False
+
+    def flujo(self, suscriptor: Suscriptor, espera: float = 15.0):
+        """Genera el cuerpo `text/event-stream` de un suscriptor hasta que se desconecte."""
+        try:
+            while True:
+                if suscriptor.desbordado:
+                    self._resincronizar(suscriptor)
+                    # Los deltas siguientes llevan versiones con hueco: el
+                    # cliente vuelve a pedir la estructura completa
+                    yield 'event: resincronizar\ndata: {}\n\n'
+                    continue
+                try:
+                    mensaje = suscriptor.cola.get(timeout=espera)
+                except queue.Empty:
+                    # Comentario SSE para mantener viva la conexión
+                    yield ': ping\n\n'
+                    continue
+                yield f"id: {mensaje['version']}\ndata: {json.dumps(mensaje)}\n\n"
+        finally:
+            self.desuscribir(suscriptor)
@@ -0,0 +1,58 @@
+"""Fábrica de la aplicación Flask: visualizador de árboles y página de inicio.
+
+Las dos rutas del repositorio se registran como blueprints en una sola app:
+
+- `arboles` (`rutas.py`): el visualizador, en `/visualizador` y en la raíz.
+- `home` (`controllers/home_controller.py`, en la raíz del repositorio): la
+  página de inicio original, bajo `/inicio`. Con `inicio_en_raiz=True` (el
+  `app.py` de la raíz del repositorio) es ella la que atiende `/`, como antes.
+
+Cada app tiene su propio `ServicioArboles` (registro, eventos, escrituras) en
+`app.extensions['arboles']`, configurado desde `app.config`; importar los
+blueprints no crea estado. Crear la app no construye árboles: el registro crea
+cada uno (e importa el módulo de su tipo) la primera vez que se usa. Con
+persistencia (`ARBOLES_INSTANTANEAS`), las instantáneas guardadas en disco se
+recargan en segundo plano desde la primera petición (ver `ARBOLES_PRECALENTAR`).
+"""
+import atexit
+import os
+import sys
+
+from flask import Flask
+
+# La página de inicio vive en la raíz del repositorio, fuera de este directorio
+_RAIZ_REPOSITORIO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _RAIZ_REPOSITORIO not in sys.path:
+    sys.path.append(_RAIZ_REPOSITORIO)
+
+
+def crear_app(precalentar: bool | None = None, inicio_en_raiz: bool = False, **config) -> Flask:
+    """Crea la app con ambos blueprints y su servicio de árboles.
+
+    Args:
+        precalentar: recargar las instantáneas persistentes en segundo plano
+            al llegar la primera petición. Por defecto, `ARBOLES_PRECALENTAR`
+            (activado salvo que valga '0').
+        inicio_en_raiz: atender `/` con la página de inicio en vez del
+            visualizador (que sigue en `/visualizador`).
+        **config: claves `ARBOLES_*` que reemplazan a las del entorno
+            (ver `servicio.configuracion_entorno`).
+    """
+    from controllers.home_controller import home
+    from rutas import rutas
+    from servicio import ServicioArboles, configuracion_entorno
+
+    app = Flask(__name__)
+    app.config.update(configuracion_entorno())
+    app.config.update(config)
+    if precalentar is not None:
+        app.config['ARBOLES_PRECALENTAR'] = precalentar
+
+    servicio = ServicioArboles(app.config, app.logger)
+    app.extensions['arboles'] = servicio
+    # Al apagar: guarda los árboles persistentes o borra los desalojos temporales
+    atexit.register(servicio.cerrar)
+
+    app.register_blueprint(rutas, en_raiz=not inicio_en_raiz)
+    app.register_blueprint(home, url_prefix=None if inicio_en_raiz else '/inicio')
+    return app
@@ -0,0 +1,238 @@
+"""Importación por streaming de enteros desde archivos CSV o de un valor por línea.
+
+El archivo se lee por bloques y los enteros se acumulan en un `array` de
+64 bits. Si superan el presupuesto de memoria, cada bloque lleno se ordena y
+se vuelca a un archivo temporal (una "corrida"); al final las corridas se
+mezclan con `heapq.merge` leyendo también por bloques (ordenamiento externo).
+Con varios procesos, cada bloque se ordena con `ordenar_paralelo`.
+El flujo ordenado resultante alimenta `desde_ordenados`, que construye el
+árbol balanceado en tiempo lineal sin materializar la entrada completa.
+
+Uso como CLI (desde `InterfazGrafico/`):
+    python -m importacion datos.csv --tipo-arbol avl --arbol-id precios --procesos 8
+    python -m importacion datos.csv --url http://127.0.0.1:5000 --arbol-id precios
+"""
+import argparse
+import heapq
+import os
+import re
+import sys
+import tempfile
+import time
+from array import array
+from typing import BinaryIO, Callable, Iterator
+
+from arboles.construccion import ordenar_paralelo
+
+TAMANO_BLOQUE = 1 << 20
+# Valores (8 bytes cada uno) que se ordenan en memoria antes de volcar una corrida
+MEMORIA_VALORES = 8_000_000
+VALORES_POR_LECTURA = 1 << 16
+
+_SEPARADORES = re.compile(rb'[,;\s]')
+_TOKENS = re.compile(rb'[^,;\s]+')
+
+
+class Progreso:
+    """Cuenta valores leídos y avisa periódicamente del rendimiento."""
+
+    def __init__(self, aviso: Callable[[int, float], None] | None = None, cada: int = 1_000_000) -> None:
+        self.aviso = aviso
+        self.cada = cada
+        self.leidos = 0
+        self.descartados = 0
+        self.inicio = time.perf_counter()
+        self._siguiente = cada
+
+    @property
+    def segundos(self) -> float:
+        return time.perf_counter() - self.inicio
+
+    def sumar(self, cantidad: int) -> None:
+        self.leidos += cantidad
+        if self.aviso is not None and self.leidos >= self._siguiente:
+            self._siguiente += self.cada
+            self.aviso(self.leidos, self.segundos)
+
+
+def leer_enteros(flujo: BinaryIO, progreso: Progreso) -> Iterator[list[int]]:
+    """Genera listas de enteros leídos por bloques; descarta tokens no numéricos (cabeceras)."""
+    resto = b''
+    while True:
+        bloque = flujo.read(TAMANO_BLOQUE)
+        if not bloque:
+            break
+        datos = resto + bloque
+        # El último token puede estar cortado: se guarda para el siguiente bloque
+        ultimo = None
+        for ultimo in _SEPARADORES.finditer(datos):
+            pass
+        if ultimo is None:
+            resto = datos
+            continue
+        completos, resto = datos[:ultimo.end()], datos[ultimo.end():]
+        yield _convertir(_TOKENS.findall(completos), progreso)
+    if resto:
+        yield _convertir(_TOKENS.findall(resto), progreso)
+
+
+def _convertir(tokens: list[bytes], progreso: Progreso) -> list[int]:
+    valores = []
+    for token in tokens:
+        try:
+            valores.append(int(token))
+        except ValueError:
+            progreso.descartados += 1
+    progreso.sumar(len(valores))
+    return valores
+
+
+class Ordenados:
+    """Enteros ordenados listos para recorrer una sola vez (en memoria o en corridas)."""
+
+    def __init__(self, en_memoria: array, corridas: list[str], cantidad: int) -> None:
+        self._en_memoria = en_memoria
+        self.corridas = corridas
+        self.cantidad = cantidad
+
+    def __iter__(self) -> Iterator[int]:
+        if not self.corridas:
+            return iter(self._en_memoria)
+        return self._mezclar()
+
+    def _mezclar(self) -> Iterator[int]:
+        try:
+            yield from heapq.merge(*(_leer_corrida(ruta) for ruta in self.corridas))
+        finally:
+            self.cerrar()
+
+    def cerrar(self) -> None:
+        for ruta in self.corridas:
+            try:
+                os.remove(ruta)
+            except FileNotFoundError:
+                pass
+
+
+def _leer_corrida(ruta: str) -> Iterator[int]:
+    with open(ruta, 'rb') as archivo:
+        while True:
+            bloque = array('q')
+            try:
+                bloque.fromfile(archivo, VALORES_POR_LECTURA)
+            except EOFError:
+                # fromfile deja en el arreglo lo que alcanzó a leer
+                yield from bloque
+                return
+            yield from bloque
+
+
+def ordenar(flujo: BinaryIO, progreso: Progreso, memoria_valores: int = MEMORIA_VALORES,
+            directorio: str | None = None, procesos: int = 1) -> Ordenados:
+    """Lee y ordena todos los enteros del flujo, por corridas en disco si no caben en memoria.
+
+    Con `procesos` > 1 cada bloque en memoria se ordena repartido entre
+    procesos (los bloques pequeños se siguen ordenando aquí).
+    """
+    pendientes = array('q')
+    corridas: list[str] = []
+    cantidad = 0
+    try:
+        for valores in leer_enteros(flujo, progreso):
+            try:
+                pendientes.extend(valores)
+            except OverflowError:
+                raise ValueError('los valores deben caber en un entero de 64 bits') from None
+            cantidad += len(valores)
+            if len(pendientes) >= memoria_valores:
+                corridas.append(_volcar(pendientes, directorio, procesos))
+                pendientes = array('q')
+        if corridas and pendientes:
+            corridas.append(_volcar(pendientes, directorio, procesos))
+            pendientes = array('q')
+    except BaseException:
+        Ordenados(array('q'), corridas, 0).cerrar()
+        raise
+    return Ordenados(ordenar_paralelo(pendientes, procesos, en_sitio=True), corridas, cantidad)
+
+
+def _volcar(valores: array, directorio: str | None, procesos: int) -> str:
+    descriptor, ruta = tempfile.mkstemp(prefix='corrida-', suffix='.bin', dir=directorio)
+    with os.fdopen(descriptor, 'wb') as archivo:
+        ordenar_paralelo(valores, procesos, en_sitio=True).tofile(archivo)
+    return ruta
+
+
+def construir(clase, ordenados: Ordenados, existente=None, cantidad_existente: int = 0):
+    """Árbol balanceado con los valores importados (y los del árbol existente, si lo hay)."""
+    valores = iter(ordenados)
+    if existente is not None and cantidad_existente:
+        valores = heapq.merge(valores, existente.iter_inorden())
+    try:
+        return clase.desde_ordenados(valores, ordenados.cantidad + cantidad_existente)
+    finally:
+        # desde_ordenados no agota el iterador: las corridas se borran aquí
+        ordenados.cerrar()
+
+
+# -------------------- CLI --------------------
+def _subir(args) -> None:
+    import http.client
+    import json
+    from urllib.parse import urlencode, urlsplit
+
+    destino = urlsplit(args.url)
+    conexion = http.client.HTTPConnection(destino.hostname, destino.port or 80)
+    consulta = urlencode({'tipo_arbol': args.tipo_arbol, 'arbol_id': args.arbol_id})
+    inicio = time.perf_counter()
+    with open(args.archivo, 'rb') as archivo:
+        conexion.request('POST', f'/importar?{consulta}', body=archivo,
+                         headers={'Content-Type': 'application/octet-stream',
+                                  'Content-Length': str(os.path.getsize(args.archivo))})
+    respuesta = conexion.getresponse()
+    print(f'HTTP {respuesta.status} en {time.perf_counter() - inicio:.1f} s')
+    print(json.dumps(json.loads(respuesta.read()), indent=2, ensure_ascii=False))
+
+
+def _local(args) -> None:
+    from registro import RegistroArboles
+
+    def aviso(leidos, segundos):
+        print(f'  {leidos:>12,} valores  {leidos / segundos:>12,.0f} valores/s', file=sys.stderr)
+
+    progreso = Progreso(aviso)
+    if not args.instantaneas:
+        sys.exit('modo local: indique --instantaneas (o ARBOLES_INSTANTANEAS), el directorio '
+                 'de instantáneas del servidor')
+    with open(args.archivo, 'rb') as archivo:
+        ordenados = ordenar(archivo, progreso, args.memoria_mb * 1024 * 1024 // 8, procesos=args.procesos)
+    print(f'Leídos {progreso.leidos:,} valores ({progreso.descartados} descartados) en '
+          f'{progreso.segundos:.1f} s, {len(ordenados.corridas)} corridas en disco')
+
+    # La instantánea queda donde el servidor la recarga al primer acceso
+    registro = RegistroArboles(presupuesto_bytes=0, directorio=args.instantaneas)
+    with registro.usar(args.tipo_arbol, args.arbol_id) as entrada:
+        entrada.arbol = construir(registro.clases[args.tipo_arbol], ordenados, entrada.arbol, entrada.nodos)
+    registro.guardar_todo()
+    print(f'Árbol {args.tipo_arbol.upper()} "{args.arbol_id}" con {entrada.nodos:,} nodos guardado en '
+          f'{registro.directorio} ({progreso.leidos / progreso.segundos:,.0f} valores/s en total)')
+
+
+if __name__ == '__main__':
+    from registro import TIPO_MAPA, RegistroArboles
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('archivo')
+    # Los AVL con hashes de Merkle (ARBOLES_MERKLE=1) usan el tipo 'avl': la
+    # instantánea es la misma y el servidor rehace los hashes al recargarla
+    parser.add_argument('--tipo-arbol', choices=[tipo for tipo in RegistroArboles.clases if tipo != TIPO_MAPA],
+                        default='avl')
+    parser.add_argument('--arbol-id', default='default')
+    parser.add_argument('--url', help='sube el archivo a POST /importar de un servidor en marcha')
+    parser.add_argument('--memoria-mb', type=int, default=64, help='memoria para ordenar antes de usar disco')
+    parser.add_argument('--procesos', type=int, default=os.cpu_count() or 1,
+                        help='procesos para ordenar cada bloque (modo local)')
+    parser.add_argument('--instantaneas', default=os.environ.get('ARBOLES_INSTANTANEAS'),
+                        help='directorio de instantáneas del servidor (modo local)')
+    argumentos = parser.parse_args()
+    _subir(argumentos) if argumentos.url else _local(argumentos)
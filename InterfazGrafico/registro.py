@@ -0,0 +1,393 @@
+"""Registro de árboles con nombre (multi-inquilino) con desalojo LRU a disco.
+
+Cada árbol se identifica por `(tipo_arbol, arbol_id)` y se crea al usarlo por
+primera vez. La memoria total se estima por número de nodos; cuando supera el
+presupuesto, los árboles usados hace más tiempo se guardan como instantánea
+en disco y se descartan de memoria. El siguiente acceso los recarga sin que
+el cliente lo note.
+
+Sin `directorio` las instantáneas van a un directorio temporal propio del
+registro que `cerrar` borra, así que los árboles no sobreviven a un
+reinicio. Con `directorio` (persistencia explícita) las instantáneas se
+conservan: `guardar_todo` guarda ahí los árboles al apagar y `precalentar`
+los recarga al arrancar.
+"""
+import importlib
+import os
+import pickle
+import re
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from arboles.bloom import FiltroBloomContador
+
+# Bytes por nodo medidos con tracemalloc (objeto + __dict__ + entero). En los
+# mapas ordenados se supone un dato del tamaño de un entero.
+BYTES_POR_NODO = {'abb': 140, 'avl': 150, 'adaptativo': 150, 'mapa': 190}
+# Un nodo con hash de Merkle suma el objeto bytes de 16 bytes y su atributo
+BYTES_POR_NODO_MERKLE = 200
+# Un nodo enhebrado suma el atributo del hilo
+BYTES_POR_NODO_ENHEBRADO = 148
+
+# Capacidad mínima del filtro de Bloom; se dimensiona al doble de los nodos
+CAPACIDAD_MINIMA_FILTRO = 1024
+
+# Tipo de los mapas ordenados clave → valor (`MapaOrdenado`), que comparten el
+# registro con los árboles de enteros
+TIPO_MAPA = 'mapa'
+
+_ID_VALIDO = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+
+def id_valido(arbol_id: str) -> bool:
+    """Los ids se usan en nombres de archivo y de memoria compartida."""
+    return bool(_ID_VALIDO.match(arbol_id))
+
+
+class Motores:
+    """Clase de árbol de cada tipo; su módulo se importa la primera vez que se pide."""
+
+    def __init__(self, rutas: dict[str, str]) -> None:
+        # tipo -> 'módulo:Clase'
+        self._rutas = rutas
+        self._clases: dict[str, type] = {}
+
+    def __getitem__(self, tipo: str) -> type:
+        clase = self._clases.get(tipo)
+        if clase is None:
+            modulo, _, nombre = self._rutas[tipo].partition(':')
+            clase = self._clases[tipo] = getattr(importlib.import_module(modulo), nombre)
+        return clase
+
+    def __contains__(self, tipo: str) -> bool:
+        return tipo in self._rutas
+
+    def __iter__(self):
+        return iter(self._rutas)
+
+    def con(self, **rutas: str) -> "Motores":
+        """Copia con otros motores para algunos tipos."""
+        return Motores(dict(self._rutas, **rutas))
+
+
+def _preorden(raiz) -> list[int]:
+    # Iterativo: un ABB degenerado excede el límite de recursión. Las lápidas
+    # del borrado perezoso no se guardan: quitar valores de un preorden válido
+    # deja otro preorden válido.
+    resultado: list[int] = []
+    pila = [raiz] if raiz is not None else []
+    while pila:
+        nodo = pila.pop()
+        if not nodo.borrado:
+            resultado.append(nodo.valor)
+        if nodo.hijo_derecho is not None:
+            pila.append(nodo.hijo_derecho)
+        if nodo.hijo_izquierdo is not None:
+            pila.append(nodo.hijo_izquierdo)
+    return resultado
+
+
+class Entrada:
+    """Un árbol del registro con su propio bloqueo y su tamaño estimado."""
+
+    def __init__(self, tipo: str, arbol_id: str, arbol, bytes_por_nodo: int | None = None) -> None:
+        self.tipo = tipo
+        self.arbol_id = arbol_id
+        self.arbol = arbol
+        self.bytes_por_nodo = bytes_por_nodo or BYTES_POR_NODO[tipo]
+        self.bloqueo = threading.RLock()
+        # `usar` anidados que la tienen tomada; el bloqueo es reentrante, así
+        # que adquirirlo desde el mismo hilo no dice que esté libre
+        self.en_uso = 0
+        self.desalojada = False
+        self.filtro: FiltroBloomContador | None = None
+
+    @property
+    def nodos(self) -> int:
+        """Valores vivos del árbol, según su propia cuenta O(1)."""
+        return self.arbol.cantidad()
+
+    @property
+    def bytes(self) -> int:
+        filtro = self.filtro.m if self.filtro is not None else 0
+        # Las lápidas del borrado perezoso siguen ocupando su nodo
+        fisicos = self.nodos + getattr(self.arbol, 'borrados', 0)
+        return fisicos * self.bytes_por_nodo + filtro
+
+    # -------------------- Filtro de Bloom --------------------
+    def activar_filtro(self, tasa_fp: float) -> None:
+        """(Re)crea el filtro con los valores actuales del árbol, conservando sus estadísticas."""
+        anterior = self.filtro
+        capacidad = max(CAPACIDAD_MINIMA_FILTRO, 2 * self.nodos)
+        self.filtro = FiltroBloomContador.desde_valores(self.arbol.iter_inorden(), capacidad, tasa_fp)
+        if anterior is not None:
+            self.filtro.consultas = anterior.consultas
+            self.filtro.descartadas = anterior.descartadas
+            self.filtro.falsos_positivos = anterior.falsos_positivos
+
+    def rehacer_filtro(self) -> None:
+        """Tras reemplazar o vaciar el árbol completo."""
+        if self.filtro is not None:
+            self.activar_filtro(self.filtro.tasa_fp)
+
+    def buscar(self, valor: int) -> bool:
+        """Búsqueda que el filtro corta sin recorrer el árbol cuando la clave seguro no está."""
+        if self.filtro is None:
+            return self.arbol.buscar(valor)
+        if not self.filtro.quizas_contiene(valor):
+            return False
+        encontrado = self.arbol.buscar(valor)
+        if not encontrado:
+            self.filtro.falsos_positivos += 1
+        return encontrado
+
+    def agregados(self, valores) -> None:
+        if self.filtro is None:
+            return
+        for valor in valores:
+            self.filtro.agregar(valor)
+        # Pasada la capacidad los falsos positivos crecen: se rehace al doble
+        if self.filtro.cantidad > self.filtro.capacidad:
+            self.rehacer_filtro()
+
+    def quitados(self, valores) -> None:
+        """Solo valores que de verdad estaban en el árbol (si no, habría falsos negativos)."""
+        if self.filtro is None:
+            return
+        for valor in valores:
+            self.filtro.quitar(valor)
+
+
+class RegistroArboles:
+    """Árboles por `(tipo, id)` en orden LRU, con presupuesto global de memoria.
+
+    Con `tasa_bloom` cada árbol lleva además un filtro de Bloom con contadores
+    para esa tasa de falsos positivos (se reconstruye al recargarlo de disco).
+    Con `merkle` los AVL mantienen hashes de Merkle por subárbol
+    (`ArbolAVLMerkle`). Con `enhebrado` los ABB llevan hilos a su sucesor
+    inorden (`ArbolBinarioEnhebrado`). Los mapas ordenados (`TIPO_MAPA`) comparten el
+    presupuesto y el orden LRU con los árboles, pero no llevan filtro.
+    """
+
+    clases = Motores({'abb': 'arboles.abb:ArbolBinario', 'avl': 'arboles.avl:ArbolAVL',
+                      'adaptativo': 'arboles.adaptativo:ArbolAdaptativo',
+                      TIPO_MAPA: 'arboles.mapa:MapaOrdenado'})
+
+    def __init__(self, presupuesto_bytes: int, directorio: str | None = None,
+                 tasa_bloom: float | None = None, merkle: bool = False, enhebrado: bool = False) -> None:
+        self.bytes_por_nodo = dict(BYTES_POR_NODO)
+        if merkle:
+            self.clases = self.clases.con(avl='arboles.merkle:ArbolAVLMerkle')
+            self.bytes_por_nodo['avl'] = BYTES_POR_NODO_MERKLE
+        if enhebrado:
+            self.clases = self.clases.con(abb='arboles.abb:ArbolBinarioEnhebrado')
+            self.bytes_por_nodo['abb'] = BYTES_POR_NODO_ENHEBRADO
+        self.presupuesto_bytes = presupuesto_bytes
+        self.tasa_bloom = tasa_bloom
+        self.persistente = directorio is not None
+        if self.persistente:
+            os.makedirs(directorio, exist_ok=True)
+            self.directorio = directorio
+        else:
+            self.directorio = tempfile.mkdtemp(prefix='arboles_desalojados_')
+        self._entradas: OrderedDict[tuple[str, str], Entrada] = OrderedDict()
+        # Árboles que algún hilo está creando o recargando (fuera de `_bloqueo`)
+        self._cargas: dict[tuple[str, str], threading.Event] = {}
+        self._bloqueo = threading.Lock()
+        self.desalojos = 0
+        self.recargas = 0
+        self.precalentados = 0
+
+    # -------------------- Instantáneas --------------------
+    def _ruta(self, tipo: str, arbol_id: str) -> str:
+        return os.path.join(self.directorio, f'{tipo}-{arbol_id}.pickle')
+
+    def _guardar(self, entrada: Entrada) -> None:
+        arbol = entrada.arbol
+        # ABB: el preorden conserva la forma exacta. AVL y adaptativo: basta el
+        # inorden, la recarga lo reconstruye balanceado en O(n).
+        if entrada.tipo == 'abb':
+            valores = _preorden(arbol.raiz)
+        elif entrada.tipo == TIPO_MAPA:
+            valores = list(arbol.items())
+        else:
+            valores = arbol.inorden()
+        ruta = self._ruta(entrada.tipo, entrada.arbol_id)
+        temporal = ruta + '.tmp'
+        with open(temporal, 'wb') as archivo:
+            pickle.dump(valores, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporal, ruta)
+
+    def _cargar(self, tipo: str, arbol_id: str) -> Entrada | None:
+        ruta = self._ruta(tipo, arbol_id)
+        try:
+            with open(ruta, 'rb') as archivo:
+                valores = pickle.load(archivo)
+        except FileNotFoundError:
+            return None
+        if tipo == 'abb':
+            arbol = self.clases[tipo].desde_preorden(valores)
+        elif tipo == TIPO_MAPA:
+            arbol = self.clases[tipo](valores)
+        else:
+            arbol = self.clases[tipo].desde_ordenados(valores)
+        return Entrada(tipo, arbol_id, arbol, self.bytes_por_nodo[tipo])
+
+    # -------------------- Acceso --------------------
+    def obtener(self, tipo: str, arbol_id: str) -> Entrada:
+        """Entrada del árbol (creándolo o recargándolo) marcada como la más reciente.
+
+        La recarga de una instantánea grande tarda: se hace fuera del bloqueo
+        del registro, así que solo esperan las peticiones a ese mismo árbol.
+        """
+        clave = (tipo, arbol_id)
+        while True:
+            with self._bloqueo:
+                entrada = self._entradas.get(clave)
+                if entrada is not None:
+                    self._entradas.move_to_end(clave)
+                    return entrada
+                carga = self._cargas.get(clave)
+                if carga is None:
+                    carga = self._cargas[clave] = threading.Event()
+                    break
+            # Otro hilo lo está cargando (p. ej. el precalentamiento): se usa su carga
+            carga.wait()
+        try:
+            recargada = self._cargar(tipo, arbol_id)
+            entrada = recargada or Entrada(tipo, arbol_id, self.clases[tipo](), self.bytes_por_nodo[tipo])
+            if self.tasa_bloom is not None and tipo != TIPO_MAPA:
+                entrada.activar_filtro(self.tasa_bloom)
+            with self._bloqueo:
+                self._entradas[clave] = entrada
+                if recargada is not None:
+                    # Mientras está en memoria, el árbol vivo es la única fuente de
+                    # verdad. Se borra con el registro tomado: nadie lo ve sin
+                    # instantánea ni en memoria, y un desalojo no puede empezar antes.
+                    os.remove(self._ruta(tipo, arbol_id))
+                    self.recargas += 1
+        finally:
+            # Si la carga falló, el siguiente en pedirlo lo vuelve a intentar
+            with self._bloqueo:
+                del self._cargas[clave]
+            carga.set()
+        return entrada
+
+    @contextmanager
+    def usar(self, tipo: str, arbol_id: str):
+        """Da la entrada con su bloqueo tomado; al salir aplica el presupuesto de memoria."""
+        while True:
+            entrada = self.obtener(tipo, arbol_id)
+            with entrada.bloqueo:
+                # Pudo desalojarse entre obtenerla y tomar su bloqueo
+                if not entrada.desalojada:
+                    entrada.en_uso += 1
+                    try:
+                        yield entrada
+                    finally:
+                        entrada.en_uso -= 1
+                    break
+        self.aplicar_presupuesto()
+
+    def existe(self, tipo: str, arbol_id: str) -> bool:
+        with self._bloqueo:
+            return (tipo, arbol_id) in self._entradas or os.path.exists(self._ruta(tipo, arbol_id))
+
+    def listar(self) -> list[dict]:
+        with self._bloqueo:
+            en_memoria = [{'tipo_arbol': e.tipo, 'arbol_id': e.arbol_id, 'nodos': e.nodos, 'en_memoria': True}
+                          for e in self._entradas.values()]
+            claves = set(self._entradas)
+        en_disco = []
+        for nombre in sorted(os.listdir(self.directorio)):
+            tipo, _, resto = nombre.partition('-')
+            arbol_id = resto[:-len('.pickle')]
+            if nombre.endswith('.pickle') and tipo in self.clases and (tipo, arbol_id) not in claves:
+                en_disco.append({'tipo_arbol': tipo, 'arbol_id': arbol_id, 'en_memoria': False})
+        return en_memoria + en_disco
+
+    def memoria(self) -> int:
+        with self._bloqueo:
+            return sum(e.bytes for e in self._entradas.values())
+
+    # -------------------- Desalojo --------------------
+    def aplicar_presupuesto(self) -> None:
+        """Desaloja árboles en orden LRU hasta volver a estar bajo el presupuesto."""
+        with self._bloqueo:
+            total = sum(e.bytes for e in self._entradas.values())
+            candidatas = list(self._entradas.values())
+        # Siempre se conserva el árbol más reciente, aunque él solo exceda el presupuesto
+        for entrada in candidatas[:-1]:
+            if total <= self.presupuesto_bytes:
+                break
+            # Los árboles ocupados por otra petición se saltan en esta pasada
+            if not entrada.bloqueo.acquire(blocking=False):
+                continue
+            try:
+                if entrada.en_uso:
+                    # La usa este mismo hilo más afuera (p. ej. /diferencias)
+                    continue
+                self._guardar(entrada)
+                entrada.desalojada = True
+                with self._bloqueo:
+                    self._entradas.pop((entrada.tipo, entrada.arbol_id), None)
+                total -= entrada.bytes
+                self.desalojos += 1
+            finally:
+                entrada.bloqueo.release()
+
+    def precalentar(self) -> int:
+        """Recarga las instantáneas del directorio mientras quepan en el presupuesto.
+
+        Empieza por las guardadas más recientemente. Los árboles precalentados
+        quedan como los menos recientes, así que el tráfico real los desplaza
+        antes que a los que ya está usando. Devuelve cuántos recargó.
+        """
+        archivos = []
+        for archivo in os.scandir(self.directorio):
+            if archivo.name.endswith('.pickle'):
+                try:
+                    archivos.append((archivo.stat().st_mtime, archivo.name))
+                except FileNotFoundError:
+                    pass  # una petición acaba de recargarlo
+        archivos.sort(reverse=True)
+        cargados = 0
+        for _, nombre in archivos:
+            if self.memoria() >= self.presupuesto_bytes:
+                break
+            tipo, _, resto = nombre.partition('-')
+            arbol_id = resto[:-len('.pickle')]
+            if tipo not in self.clases or not id_valido(arbol_id):
+                continue
+            clave = (tipo, arbol_id)
+            with self._bloqueo:
+                if clave in self._entradas:
+                    continue
+            self.obtener(tipo, arbol_id)
+            with self._bloqueo:
+                if clave in self._entradas:
+                    self._entradas.move_to_end(clave, last=False)
+            cargados += 1
+        with self._bloqueo:
+            self.precalentados += cargados
+        # El último pudo pasarse del presupuesto: se desaloja él, que es el primero en la fila
+        self.aplicar_presupuesto()
+        return cargados
+
+    def guardar_todo(self) -> None:
+        """Guarda una instantánea de todos los árboles en memoria (p. ej. al apagar)."""
+        with self._bloqueo:
+            entradas = list(self._entradas.values())
+        for entrada in entradas:
+            with entrada.bloqueo:
+                self._guardar(entrada)
+
+    def cerrar(self) -> None:
+        """Al apagar: guarda los árboles si el registro es persistente, o borra sus desalojos si no."""
+        if self.persistente:
+            self.guardar_todo()
+        else:
+            shutil.rmtree(self.directorio, ignore_errors=True)
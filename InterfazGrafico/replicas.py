@@ -0,0 +1,309 @@
+"""Réplicas de los árboles en memoria compartida para varios procesos (p. ej. workers de gunicorn).
+
+Con `ARBOL_MEMORIA_COMPARTIDA=<prefijo>` todos los procesos sirven las
+lecturas desde la última generación publicada en memoria compartida
+(`arboles.compartido`). Las escrituras las aplica un único escritor:
+
+- El primer proceso que necesita escribir toma sin esperar un bloqueo de
+  archivo exclusivo y, mientras viva, es el escritor: guarda los árboles
+  mutables en su registro y atiende a los demás por un socket Unix
+  (`multiprocessing.connection`). Los demás le reenvían sus escrituras.
+- El escritor aplica las escrituras con la cola agrupada del servicio, así
+  que las que llegan juntas (de cualquier proceso) forman un lote, y publica
+  la generación siguiente una vez por lote. No reconstruye el árbol en cada
+  escritura: solo lo hace al tomar el relevo de un escritor que terminó.
+- Si el escritor termina, su bloqueo se libera y el siguiente proceso que
+  falle al reenviarle una escritura se postula en su lugar.
+
+Al apagarse, el último proceso que usaba el prefijo destruye los segmentos
+de todos los árboles publicados.
+
+Los bloqueos, el índice de nombres, el socket y la clave del socket viven en
+un directorio 0700 propio del usuario (ver `directorio`). Las órdenes viajan
+serializadas con pickle, así que el escritor solo atiende a clientes que
+prueban conocer la clave (`authkey` de `multiprocessing.connection`).
+"""
+import fcntl
+import os
+import stat
+import tempfile
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+# Operaciones del servicio que se reenvían al escritor
+OPERACIONES = frozenset({'escribir', 'crear', 'importar', 'limpiar'})
+
+# Espera total al reenviar mientras el escritor elegido abre su socket
+ESPERA_ESCRITOR_S = 5.0
+_PAUSA_S = 0.02
+# Bytes de la clave del socket del escritor
+BYTES_CLAVE = 32
+
+
+def directorio(prefijo: str) -> str:
+    """Directorio privado de los archivos de un prefijo (incluye el uid: uno por usuario)."""
+    return os.path.join(tempfile.gettempdir(), f'arboles-{prefijo}-{os.getuid()}')
+
+
+def _directorio_privado(ruta: str) -> None:
+    """Crea el directorio 0700, o comprueba que el existente sea uno así y de este usuario."""
+    try:
+        os.mkdir(ruta, 0o700)
+    except FileExistsError:
+        pass
+    # lstat: un enlace simbólico no cuenta como directorio
+    estado = os.lstat(ruta)
+    if not stat.S_ISDIR(estado.st_mode) or estado.st_uid != os.getuid() or estado.st_mode & 0o077:
+        raise PermissionError(f'{ruta}: se esperaba un directorio propio con permisos 0700')
+
+
+def _abrir(ruta: str, modo: str = 'a'):
+    """Abre (creándolo con permisos 0600) un archivo del directorio privado sin seguir enlaces."""
+    descriptor = os.open(ruta, os.O_RDWR | os.O_CREAT | os.O_APPEND | os.O_NOFOLLOW, 0o600)
+    return os.fdopen(descriptor, modo)
+
+
+def _leer_clave(ruta: str) -> bytes:
+    """Clave compartida por los procesos del prefijo; el primero la crea."""
+    try:
+        with open(ruta, 'rb') as archivo:
+            return archivo.read()
+    except FileNotFoundError:
+        pass
+    # Se escribe completa en un archivo propio y se enlaza: quien llegue a
+    # leerla nunca ve una clave a medio escribir, y si otro proceso ganó, se usa la suya
+    temporal = f'{ruta}.{os.getpid()}'
+    descriptor = os.open(temporal, os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_NOFOLLOW, 0o600)
+    with os.fdopen(descriptor, 'wb') as archivo:
+        archivo.write(os.urandom(BYTES_CLAVE))
+    try:
+        os.link(temporal, ruta)
+    except FileExistsError:
+        pass
+    finally:
+        os.remove(temporal)
+    with open(ruta, 'rb') as archivo:
+        return archivo.read()
+
+
+class ReplicasCompartidas:
+    """Lectores, elección del escritor y reenvío de escrituras para un prefijo."""
+
+    def __init__(self, prefijo: str, servicio, logger) -> None:
+        self.prefijo = prefijo
+        self.logger = logger
+        self._servicio = servicio
+        self.directorio = directorio(prefijo)
+        self._ruta_escritor = os.path.join(self.directorio, 'escritor')
+        self._ruta_procesos = os.path.join(self.directorio, 'procesos')
+        self._ruta_nombres = os.path.join(self.directorio, 'nombres')
+        self._ruta_socket = os.path.join(self.directorio, 'escritor.sock')
+        self._ruta_clave = os.path.join(self.directorio, 'clave')
+        self._clave = None
+        self._bloqueo = threading.Lock()
+        self._lectores = {}
+        self._publicadores = {}
+        # Árboles que este escritor ya tomó de la generación publicada
+        self._adoptados = set()
+        self._conexiones = threading.local()
+        # Archivos con los bloqueos de este proceso: el compartido de los
+        # procesos del prefijo y, si lo es, el exclusivo del escritor. Se
+        # toman con el primer uso, no al crear la app: el proceso que la crea
+        # (p. ej. el maestro de gunicorn con --preload) puede no atender.
+        self._procesos = None
+        self._escritor = None
+        self._servidor = None
+
+    @property
+    def escritor(self) -> bool:
+        return self._escritor is not None
+
+    def _nombre(self, clave, arbol_id) -> str:
+        return f'{self.prefijo}_{clave}_{arbol_id}'
+
+    def _unirse(self) -> None:
+        if self._procesos is None:
+            with self._bloqueo:
+                if self._procesos is None:
+                    _directorio_privado(self.directorio)
+                    self._clave = _leer_clave(self._ruta_clave)
+                    procesos = _abrir(self._ruta_procesos)
+                    # Espera si el último proceso de una tanda anterior está destruyendo
+                    fcntl.flock(procesos, fcntl.LOCK_SH)
+                    self._procesos = procesos
+
+    # -------------------- Lecturas --------------------
+    def actual(self, clave, arbol_id):
+        """Última generación publicada del árbol, o None si nunca se publicó."""
+        from arboles.compartido import LectorArbol
+
+        self._unirse()
+        nombre = self._nombre(clave, arbol_id)
+        lector = self._lectores.get(nombre)
+        if lector is None:
+            lector = self._lectores.setdefault(nombre, LectorArbol(nombre))
+        return lector.actual()
+
+    # -------------------- Escritor --------------------
+    def _postularse(self) -> bool:
+        """Se convierte en el escritor si no hay otro vivo; True si lo es."""
+        self._unirse()
+        with self._bloqueo:
+            if self._escritor is not None:
+                return True
+            archivo = _abrir(self._ruta_escritor)
+            try:
+                fcntl.flock(archivo, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                archivo.close()
+                return False
+            # El socket de un escritor anterior que no llegó a cerrarlo
+            try:
+                os.remove(self._ruta_socket)
+            except FileNotFoundError:
+                pass
+            # El socket nace 0600: con chmod después habría un instante abierto a todos
+            umask = os.umask(0o177)
+            try:
+                self._servidor = Listener(self._ruta_socket, family='AF_UNIX', authkey=self._clave)
+            finally:
+                os.umask(umask)
+            self._escritor = archivo
+        threading.Thread(target=self._servir, name='escritor-replicas', daemon=True).start()
+        self.logger.info('proceso %d: escritor de las réplicas %s', os.getpid(), self.prefijo)
+        return True
+
+    def _servir(self):
+        servidor = self._servidor
+        while True:
+            try:
+                conexion = servidor.accept()
+            except (AuthenticationError, EOFError, ConnectionError):
+                # Un cliente sin la clave, o que cortó durante el saludo
+                continue
+            except OSError:
+                # Socket cerrado al apagar
+                return
+            threading.Thread(target=self._atender, args=(conexion,), daemon=True).start()
+
+    def _atender(self, conexion):
+        # Un hilo por proceso (e hilo) cliente: las escrituras de varios
+        # clientes coinciden en la cola agrupada y se aplican en un mismo lote
+        with conexion:
+            while True:
+                try:
+                    operacion, argumentos = conexion.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    if operacion not in OPERACIONES:
+                        raise ValueError(f'operación desconocida: {operacion}')
+                    respuesta = (True, getattr(self._servicio, operacion)(*argumentos))
+                except Exception as error:
+                    respuesta = (False, error)
+                conexion.send(respuesta)
+
+    def reenviar(self, operacion: str, *argumentos):
+        """Ejecuta `operacion` del servicio en el escritor y devuelve su resultado.
+
+        Si este proceso gana la elección, la ejecuta él mismo. Una escritura
+        cuya respuesta se pierde porque el escritor terminó se reenvía al
+        siguiente, así que puede aplicarse dos veces.
+        """
+        limite = time.monotonic() + ESPERA_ESCRITOR_S
+        while True:
+            conexion = getattr(self._conexiones, 'conexion', None)
+            if conexion is None:
+                if self._postularse():
+                    return getattr(self._servicio, operacion)(*argumentos)
+                try:
+                    conexion = self._conexiones.conexion = Client(self._ruta_socket, family='AF_UNIX',
+                                                                  authkey=self._clave)
+                except OSError:
+                    # El escritor elegido aún no abre su socket, o terminó
+                    if time.monotonic() > limite:
+                        raise
+                    time.sleep(_PAUSA_S)
+                    continue
+            try:
+                conexion.send((operacion, argumentos))
+                correcto, resultado = conexion.recv()
+            except (EOFError, OSError):
+                conexion.close()
+                self._conexiones.conexion = None
+                if time.monotonic() > limite:
+                    raise
+                continue
+            if not correcto:
+                raise resultado
+            return resultado
+
+    def adoptar(self, entrada) -> None:
+        """Al tomar el relevo, el árbol del escritor parte de la generación publicada."""
+        llave = (entrada.tipo, entrada.arbol_id)
+        if llave in self._adoptados:
+            return
+        self._adoptados.add(llave)
+        vista = self.actual(*llave)
+        if vista is not None:
+            entrada.arbol = vista.reconstruir(type(entrada.arbol))
+            entrada.rehacer_filtro()
+
+    def publicar(self, entrada) -> None:
+        """Publica la forma actual del árbol como generación siguiente (una vez por lote)."""
+        from arboles.compartido import PublicadorArbol
+
+        nombre = self._nombre(entrada.tipo, entrada.arbol_id)
+        publicador = self._publicadores.get(nombre)
+        if publicador is None:
+            publicador = self._publicadores[nombre] = PublicadorArbol(nombre)
+            # Índice de los árboles publicados, para destruirlos al apagar
+            with _abrir(self._ruta_nombres) as nombres:
+                nombres.write(nombre + '\n')
+        publicador.publicar(entrada.arbol)
+
+    # -------------------- Cierre --------------------
+    def cerrar(self) -> None:
+        """Suelta el papel de escritor y, si es el último proceso, destruye los segmentos."""
+        for lector in self._lectores.values():
+            lector.cerrar()
+        self._lectores.clear()
+        conexion = getattr(self._conexiones, 'conexion', None)
+        if conexion is not None:
+            conexion.close()
+        if self._escritor is not None:
+            self._servidor.close()
+            try:
+                os.remove(self._ruta_socket)
+            except FileNotFoundError:
+                pass
+            for publicador in self._publicadores.values():
+                publicador.cerrar()
+            self._escritor.close()
+            self._escritor = None
+        if self._procesos is None:
+            return
+        try:
+            # Sin esperar: si otro proceso sigue con el prefijo, él destruirá
+            fcntl.flock(self._procesos, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            pass
+        else:
+            self._destruir()
+        self._procesos.close()
+        self._procesos = None
+
+    def _destruir(self) -> None:
+        from arboles.compartido import PublicadorArbol
+
+        try:
+            with open(self._ruta_nombres) as archivo:
+                nombres = set(archivo.read().split())
+        except FileNotFoundError:
+            return
+        for nombre in nombres:
+            PublicadorArbol(nombre).destruir()
+        os.remove(self._ruta_nombres)
+        self.logger.info('réplicas %s: %d árboles destruidos', self.prefijo, len(nombres))
@@ -0,0 +1,350 @@
+"""Rutas del visualizador de árboles (blueprint `arboles`); la app la arma `fabrica.crear_app`.
+
+El estado (árboles, eventos, escrituras) vive en el `ServicioArboles` de cada
+app, en `current_app.extensions['arboles']`: importar este módulo no crea nada.
+"""
+from flask import Blueprint, Response, abort, current_app, render_template, request, jsonify
+import json
+from contextlib import contextmanager
+from importacion import Progreso, ordenar
+from itertools import islice
+from arboles.recorridos import recorrido
+from registro import TIPO_MAPA, id_valido
+from servicio import NOMBRES, clave_tipo as _clave
+
+rutas = Blueprint('arboles', __name__)
+
+def _servicio():
+    return current_app.extensions['arboles']
+
+def _arbol_id(datos):
+    arbol_id = datos.get('arbol_id', 'default')
+    if not id_valido(arbol_id):
+        abort(400, description='arbol_id inválido: use letras, números, "_" o "-" (máx. 64)')
+    return arbol_id
+
+def _entero(datos, nombre, defecto=None, minimo=None):
+    """Parámetro entero de la petición; 400 si falta, no es entero o es menor que `minimo`."""
+    texto = datos.get(nombre, defecto)
+    if texto is None:
+        abort(400, description=f'falta el parámetro {nombre}')
+    try:
+        valor = int(texto)
+    except (TypeError, ValueError):
+        abort(400, description=f'{nombre} debe ser un entero')
+    if minimo is not None and valor < minimo:
+        abort(400, description=f'{nombre} debe ser mayor o igual que {minimo}')
+    return valor
+
+@rutas.errorhandler(400)
+def _peticion_invalida(error):
+    return jsonify({'error': error.description}), 400
+
+# Precalentamiento de las instantáneas persistentes con la primera petición
+@rutas.before_app_request
+def _precalentar_al_arrancar():
+    if current_app.config['ARBOLES_PRECALENTAR']:
+        _servicio().precalentar_en_segundo_plano()
+
+def index():
+    return render_template('index.html')
+
+# La página del visualizador está siempre en /visualizador y, salvo que la app
+# ponga ahí la página de inicio (`crear_app(inicio_en_raiz=True)`), también en /
+rutas.add_url_rule('/visualizador', view_func=index)
+
+@rutas.record
+def _registrar_raiz(estado):
+    if estado.options.get('en_raiz', True):
+        estado.add_url_rule('/', view_func=index)
+
+@rutas.route('/arboles', methods=['GET'])
+def listar_arboles():
+    return jsonify(_servicio().resumen())
+
+@rutas.route('/arboles', methods=['POST'])
+def crear_arbol():
+    data = request.json
+    tipo_arbol = _clave(data['tipo_arbol'])
+    arbol_id = _arbol_id(data)
+    existia = _servicio().crear(tipo_arbol, arbol_id)
+    return jsonify({'mensaje': f'Árbol {tipo_arbol.upper()} "{arbol_id}" {"ya existía" if existia else "creado"}'})
+
+@rutas.route('/insertar', methods=['POST'])
+def insertar():
+    data = request.json
+    valor = _entero(data, 'valor')
+    tipo_arbol = data['tipo_arbol']
+    arbol_id = _arbol_id(data)
+
+    _servicio().escribir(tipo_arbol, arbol_id, 'insertar', valor)
+
+    return jsonify({'mensaje': f'Valor {valor} insertado en {NOMBRES[_clave(tipo_arbol)]}'})
+
+@rutas.route('/eliminar', methods=['POST'])
+def eliminar():
+    data = request.json
+    valor = _entero(data, 'valor')
+    tipo_arbol = data['tipo_arbol']
+    arbol_id = _arbol_id(data)
+
+    _servicio().escribir(tipo_arbol, arbol_id, 'eliminar', valor)
+
+    return jsonify({'mensaje': f'Valor {valor} eliminado de {NOMBRES[_clave(tipo_arbol)]}'})
+
+@rutas.route('/recorrido/<tipo>', methods=['GET'])
+def obtener_recorrido(tipo):
+    tipo_arbol = request.args.get('tipo_arbol', 'abb')
+
+    # El bloqueo del árbol impide que otra petición lo vea durante los enlaces
+    # temporales de Morris (O(1) memoria auxiliar, sin límite de recursión)
+    with _servicio().leer(tipo_arbol, _arbol_id(request.args)) as arbol:
+        resultado = recorrido(arbol, tipo)
+
+    return jsonify({'recorrido': resultado})
+
+@rutas.route('/estructura', methods=['GET'])
+def obtener_estructura():
+    tipo_arbol = request.args.get('tipo_arbol', 'abb')
+    arbol_id = _arbol_id(request.args)
+    # El JSON se escribe sin recursión: un ABB degenerado tiene tantos niveles
+    # como nodos y excedería el límite de recursión de jsonify
+    return Response(_servicio().estructura(tipo_arbol, arbol_id), mimetype='application/json')
+
+@rutas.route('/buscar', methods=['GET'])
+def buscar():
+    valor = _entero(request.args, 'valor')
+    tipo_arbol = request.args.get('tipo_arbol', 'abb')
+    encontrado = _servicio().buscar(tipo_arbol, _arbol_id(request.args), valor)
+    return jsonify({'valor': valor, 'encontrado': encontrado})
+
+@rutas.route('/cercanos', methods=['GET'])
+def cercanos():
+    valor = _entero(request.args, 'valor')
+    k = _entero(request.args, 'k', 1, minimo=0)
+    tipo_arbol = request.args.get('tipo_arbol', 'abb')
+    with _servicio().leer(tipo_arbol, _arbol_id(request.args)) as arbol:
+        return jsonify({
+            'valor': valor,
+            'piso': arbol.piso(valor),
+            'techo': arbol.techo(valor),
+            'cercanos': arbol.k_cercanos(valor, k)
+        })
+
+# Mapas ordenados clave → valor por `mapa_id`: viven en el registro como los
+# árboles, así que cuentan para el presupuesto de memoria y se desalojan por LRU
+@contextmanager
+def _mapa(datos):
+    """Da el mapa de la petición con su bloqueo tomado."""
+    mapa_id = datos.get('mapa_id', 'default')
+    if not id_valido(mapa_id):
+        abort(400, description='mapa_id inválido: use letras, números, "_" o "-" (máx. 64)')
+    with _servicio().registro.usar(TIPO_MAPA, mapa_id) as entrada:
+        yield entrada.arbol
+
+def _clave_mapa(clave):
+    # En la URL la clave llega como texto: '5' es el número 5 y '"5"' la cadena
+    if isinstance(clave, str):
+        try:
+            clave = json.loads(clave)
+        except ValueError:
+            pass
+    if isinstance(clave, bool) or not isinstance(clave, (int, float, str)):
+        abort(400, description='la clave debe ser un número o una cadena')
+    return clave
+
+@contextmanager
+def _comparable():
+    # Las claves de un mapa deben poder compararse entre sí (no mezclar números y cadenas)
+    try:
+        yield
+    except TypeError:
+        abort(400, description='la clave no es comparable con las claves del mapa')
+
+@rutas.route('/mapa', methods=['GET'])
+def mapa_obtener():
+    if 'clave' not in request.args:
+        abort(400, description='falta el parámetro clave')
+    clave = _clave_mapa(request.args['clave'])
+    with _mapa(request.args) as mapa, _comparable():
+        if clave not in mapa:
+            return jsonify({'error': f'clave {clave!r} no encontrada'}), 404
+        return jsonify({'clave': clave, 'valor': mapa[clave]})
+
+@rutas.route('/mapa', methods=['POST'])
+def mapa_asignar():
+    data = request.json
+    if 'clave' not in data or 'valor' not in data:
+        abort(400, description='se requieren clave y valor')
+    clave = _clave_mapa(data['clave'])
+    with _mapa(data) as mapa, _comparable():
+        mapa[clave] = data['valor']
+        return jsonify({'mensaje': f'Clave {clave!r} asignada', 'cantidad': len(mapa)})
+
+@rutas.route('/mapa', methods=['DELETE'])
+def mapa_eliminar():
+    if 'clave' not in request.args:
+        abort(400, description='falta el parámetro clave')
+    clave = _clave_mapa(request.args['clave'])
+    with _mapa(request.args) as mapa, _comparable():
+        if clave not in mapa:
+            return jsonify({'error': f'clave {clave!r} no encontrada'}), 404
+        del mapa[clave]
+        return jsonify({'mensaje': f'Clave {clave!r} eliminada', 'cantidad': len(mapa)})
+
+@rutas.route('/mapa/rango', methods=['GET'])
+def mapa_rango():
+    desde = _clave_mapa(request.args['desde']) if 'desde' in request.args else None
+    hasta = _clave_mapa(request.args['hasta']) if 'hasta' in request.args else None
+    limite = _entero(request.args, 'limite', 1000, minimo=0)
+    with _mapa(request.args) as mapa, _comparable():
+        pares = [[clave, valor] for clave, valor in islice(mapa.irange(desde, hasta), limite)]
+        cantidad = len(mapa)
+    return jsonify({'pares': pares, 'cantidad': cantidad})
+
+@rutas.route('/estadisticas', methods=['GET'])
+def estadisticas():
+    # Agregados mantenidos por el árbol en cada mutación: O(1), sin recorrer nodos
+    tipo_arbol = request.args.get('tipo_arbol', 'abb')
+    with _servicio().leer(tipo_arbol, _arbol_id(request.args)) as arbol:
+        return jsonify(dict(arbol.estadisticas(), tipo_arbol=_clave(tipo_arbol)))
+
+@rutas.route('/estadisticas/percentiles', methods=['GET'])
+def estadisticas_percentiles():
+    try:
+        import numpy as np
+    except ImportError:
+        return jsonify({'error': 'numpy no está instalado'}), 501
+    textos = request.args.get('p', '50,90,99').split(',')
+    try:
+        percentiles = [float(p) for p in textos]
+    except ValueError:
+        abort(400, description='p debe ser una lista de números separados por comas')
+    if not all(0 <= p <= 100 for p in percentiles):
+        abort(400, description='p debe estar entre 0 y 100')
+    bins = _entero(request.args, 'bins', 10, minimo=1)
+    tipo_arbol = request.args.get('tipo_arbol', 'abb')
+
+    arreglo = _servicio().arreglo(tipo_arbol, _arbol_id(request.args))
+    if arreglo.size == 0:
+        return jsonify({'cantidad': 0, 'percentiles': {}, 'histograma': {'conteos': [], 'bordes': []}})
+    conteos, bordes = np.histogram(arreglo, bins=bins)
+    return jsonify({
+        'cantidad': int(arreglo.size),
+        'percentiles': dict(zip(textos, np.percentile(arreglo, percentiles).tolist())),
+        'histograma': {'conteos': conteos.tolist(), 'bordes': bordes.tolist()}
+    })
+
+@rutas.route('/importar', methods=['POST'])
+def importar():
+    # Archivo como multipart (campo `archivo`) o como cuerpo crudo de la petición
+    datos = request.form if request.files else request.args
+    tipo_arbol = _clave(datos.get('tipo_arbol', 'avl'))
+    arbol_id = _arbol_id(datos)
+    flujo = request.files['archivo'].stream if 'archivo' in request.files else request.stream
+    servicio = _servicio()
+
+    def aviso(leidos, segundos):
+        current_app.logger.info('importar %s:%s: %d valores (%.0f valores/s)', tipo_arbol, arbol_id,
+                        leidos, leidos / segundos)
+
+    # La lectura y el ordenamiento no necesitan el bloqueo del árbol
+    progreso = Progreso(aviso)
+    try:
+        ordenados = ordenar(flujo, progreso, servicio.importacion_bytes // 8, procesos=servicio.importacion_procesos)
+    except ValueError as error:
+        abort(400, description=str(error))
+    segundos_lectura = progreso.segundos
+
+    nodos = servicio.importar(tipo_arbol, arbol_id, ordenados)
+
+    segundos = progreso.segundos
+    return jsonify({
+        'mensaje': f'{ordenados.cantidad} valores importados en {tipo_arbol.upper()} "{arbol_id}"',
+        'importados': ordenados.cantidad,
+        'descartados': progreso.descartados,
+        'nodos': nodos,
+        'corridas': len(ordenados.corridas),
+        'segundos_lectura': round(segundos_lectura, 3),
+        'segundos': round(segundos, 3),
+        'valores_por_segundo': round(ordenados.cantidad / segundos) if segundos else None
+    })
+
+@rutas.route('/estadisticas/filtro', methods=['GET'])
+def estadisticas_filtro():
+    tipo_arbol = request.args.get('tipo_arbol', 'abb')
+    return jsonify(_servicio().estadisticas_filtro(tipo_arbol, _arbol_id(request.args)))
+
+_SIN_MERKLE = 'hashes de Merkle desactivados: inicie el servidor con ARBOLES_MERKLE=1 (árboles AVL)'
+
+@rutas.route('/hash', methods=['GET'])
+def hash_arbol():
+    # Hash de la raíz, o del subárbol en `ruta` ('i'/'d' desde la raíz): una caché
+    # o réplica detecta cambios en O(1) y baja solo por los hijos con hash distinto
+    tipo_arbol = request.args.get('tipo_arbol', 'avl')
+    ruta = request.args.get('ruta', '')
+    with _servicio().leer(tipo_arbol, _arbol_id(request.args)) as arbol:
+        if not hasattr(arbol, 'subarbol'):
+            abort(400, description=_SIN_MERKLE)
+        from arboles.merkle import HASH_VACIO
+        try:
+            nodo = arbol.subarbol(ruta)
+        except ValueError as error:
+            abort(400, description=str(error))
+        if nodo is None:
+            return jsonify({'ruta': ruta, 'hash': HASH_VACIO.hex(), 'valor': None, 'altura': 0,
+                            'izquierdo': None, 'derecho': None})
+        return jsonify({
+            'ruta': ruta,
+            'hash': nodo.hash.hex(),
+            'valor': nodo.valor,
+            'altura': nodo.altura,
+            'izquierdo': nodo.izquierdo.hash.hex() if nodo.izquierdo else HASH_VACIO.hex(),
+            'derecho': nodo.derecho.hash.hex() if nodo.derecho else HASH_VACIO.hex()
+        })
+
+@rutas.route('/diferencias', methods=['GET'])
+def diferencias():
+    # Valores que solo están en uno de dos árboles del mismo tipo; se saltan los
+    # subárboles con el mismo hash
+    tipo_arbol = request.args.get('tipo_arbol', 'avl')
+    arbol_id = _arbol_id(request.args)
+    otro_id = request.args.get('otro_id', '')
+    if not id_valido(otro_id):
+        abort(400, description='otro_id inválido: use letras, números, "_" o "-" (máx. 64)')
+    # Bloqueos siempre en el mismo orden: dos comparaciones cruzadas no se trancan
+    primero, segundo = sorted((arbol_id, otro_id))
+    with _servicio().leer(tipo_arbol, primero) as a, _servicio().leer(tipo_arbol, segundo) as b:
+        arbol, otro = (a, b) if primero == arbol_id else (b, a)
+        if not hasattr(arbol, 'diferencias'):
+            abort(400, description=_SIN_MERKLE)
+        solo_arbol, solo_otro = arbol.diferencias(otro)
+    return jsonify({
+        'tipo_arbol': _clave(tipo_arbol),
+        'arbol_id': arbol_id,
+        'otro_id': otro_id,
+        'iguales': not solo_arbol and not solo_otro,
+        'solo_en_arbol': solo_arbol,
+        'solo_en_otro': solo_otro
+    })
+
+@rutas.route('/eventos', methods=['GET'])
+def eventos():
+    # Server-Sent Events: un delta por cada mutación, con versión creciente por árbol.
+    # `tipo_arbol` y `arbol_id` (opcionales) limitan el flujo a los árboles que se siguen
+    tipo_arbol = _clave(request.args['tipo_arbol']) if 'tipo_arbol' in request.args else None
+    arbol_id = _arbol_id(request.args) if 'arbol_id' in request.args else None
+    canal_eventos = _servicio().canal_eventos
+    suscriptor = canal_eventos.suscribir(tipo_arbol, arbol_id)
+    return Response(canal_eventos.flujo(suscriptor), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@rutas.route('/limpiar', methods=['POST'])
+def limpiar_arbol():
+    data = request.json
+    tipo_arbol = data['tipo_arbol']
+
+    _servicio().limpiar(tipo_arbol, _arbol_id(data))
+
+    nombre = NOMBRES[_clave(tipo_arbol)]
+    return jsonify({'mensaje': f'{nombre[0].upper()}{nombre[1:]} limpiado'})
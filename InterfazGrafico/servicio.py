@@ -0,0 +1,488 @@
+"""Estado y operaciones del servicio de árboles, sin depender del framework web.
+
+`ServicioArboles` reúne el registro de árboles, el canal de eventos, la cola
+de escrituras agrupadas, la caché de arreglos y, en modo compartido, las
+réplicas en memoria compartida. `fabrica.crear_app` crea uno por app (en
+`app.extensions['arboles']`) y `asgi.py` crea el suyo, así que dos apps no
+comparten árboles y cada una toma su configuración de `app.config`.
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from arboles.recorridos import estructura_json
+from eventos import CanalEventos
+from registro import RegistroArboles
+
+# Nombre de cada tipo en los mensajes de respuesta
+NOMBRES = {'abb': 'ABB', 'avl': 'AVL', 'adaptativo': 'árbol adaptativo'}
+
+# Arreglos numpy por árbol que se conservan, válidos mientras no cambie su
+# versión. Cuentan contra el presupuesto de memoria: solo ocupan lo que los
+# árboles en memoria dejan libre (ver `_recortar_arreglos`)
+MAX_ARREGLOS_CACHE = 8
+
+
+def clave_tipo(tipo_arbol: str) -> str:
+    """Tipo del registro que atiende `tipo_arbol`: cualquiera distinto de 'abb' y 'adaptativo' es AVL."""
+    return tipo_arbol if tipo_arbol in ('abb', 'adaptativo') else 'avl'
+
+
+def configuracion_entorno(entorno=os.environ) -> dict:
+    """Configuración del servicio a partir de las variables de entorno `ARBOLES_*`."""
+    return {
+        'ARBOLES_MEMORIA_MB': int(entorno.get('ARBOLES_MEMORIA_MB', '256')),
+        # Persistencia opcional entre reinicios; sin ella los desalojos van a un
+        # directorio temporal que se borra al cerrar el servicio
+        'ARBOLES_INSTANTANEAS': entorno.get('ARBOLES_INSTANTANEAS') or None,
+        # Filtro de Bloom opcional por árbol (tasa de falsos positivos, p. ej. 0.01)
+        'ARBOLES_BLOOM_FP': float(entorno['ARBOLES_BLOOM_FP']) if entorno.get('ARBOLES_BLOOM_FP') else None,
+        # Hashes de Merkle por subárbol en los AVL (GET /hash y /diferencias)
+        'ARBOLES_MERKLE': entorno.get('ARBOLES_MERKLE') == '1',
+        'ARBOLES_LOTE_MS': float(entorno.get('ARBOLES_LOTE_MS', '0')),
+        'ARBOLES_LOTE_MAX': int(entorno.get('ARBOLES_LOTE_MAX', '256')),
+        'ARBOLES_ABB_PEREZOSO': entorno.get('ARBOLES_ABB_PEREZOSO') == '1',
+        # ABB enhebrados: inorden y sucesor siguiendo hilos, sin pila
+        'ARBOLES_ABB_ENHEBRADO': entorno.get('ARBOLES_ABB_ENHEBRADO') == '1',
+        # Memoria para ordenar una importación antes de usar corridas en disco
+        'ARBOLES_IMPORTACION_MB': int(entorno.get('ARBOLES_IMPORTACION_MB', '64')),
+        # Procesos para ordenar cada bloque de una importación (1: en el propio worker)
+        'ARBOLES_IMPORTACION_PROCESOS': int(entorno.get('ARBOLES_IMPORTACION_PROCESOS', '1')),
+        'ARBOLES_PRECALENTAR': entorno.get('ARBOLES_PRECALENTAR', '1') != '0',
+        'ARBOL_MEMORIA_COMPARTIDA': entorno.get('ARBOL_MEMORIA_COMPARTIDA') or None,
+    }
+
+
+def _rotaciones(arbol):
+    return [{'tipo': tipo, 'pivote': pivote} for tipo, pivote in getattr(arbol, 'ultimas_rotaciones', [])]
+
+
+def _valor_raiz(arbol):
+    return arbol.raiz.valor if arbol.raiz is not None else None
+
+
+class _Escritura:
+    __slots__ = ('op', 'valor', 'hecha', 'lider', 'error', 'evento')
+
+    def __init__(self, op, valor):
+        self.op = op
+        self.valor = valor
+        self.hecha = False
+        self.lider = False
+        self.error = None
+        self.evento = threading.Event()
+
+
+class ColaEscrituras:
+    """Cola por árbol en la que el primer escritor en llegar aplica los lotes de todos.
+
+    El líder espera la ventana (o a juntar `maximo` operaciones), toma el lote,
+    lo aplica y despierta a sus autores. Cuando su propia operación ya está
+    hecha cede el liderazgo al primero que siga esperando, de modo que nadie
+    aplica lotes ajenos indefinidamente.
+    """
+
+    def __init__(self, aplicar, ventana_ms, maximo):
+        self.aplicar = aplicar
+        self.ventana = ventana_ms / 1000
+        self.maximo = maximo
+        self._condicion = threading.Condition()
+        self._pendientes = {}
+        self._con_lider = set()
+        self.lotes = 0
+        self.operaciones = 0
+
+    def enviar(self, clave, op, valor):
+        """Encola la operación y vuelve cuando está aplicada (o relanza su error)."""
+        escritura = _Escritura(op, valor)
+        with self._condicion:
+            self._pendientes.setdefault(clave, []).append(escritura)
+            if clave in self._con_lider:
+                if len(self._pendientes[clave]) >= self.maximo:
+                    self._condicion.notify_all()
+            else:
+                self._con_lider.add(clave)
+                escritura.lider = True
+        while not escritura.lider:
+            escritura.evento.wait()
+            escritura.evento.clear()
+            if escritura.hecha:
+                break
+        if not escritura.hecha:
+            self._liderar(clave, escritura)
+        if escritura.error is not None:
+            raise escritura.error
+
+    def _liderar(self, clave, propia):
+        while not propia.hecha:
+            with self._condicion:
+                if self.ventana:
+                    fin = time.monotonic() + self.ventana
+                    while len(self._pendientes[clave]) < self.maximo and time.monotonic() < fin:
+                        self._condicion.wait(fin - time.monotonic())
+                pendientes = self._pendientes[clave]
+                lote, self._pendientes[clave] = pendientes[:self.maximo], pendientes[self.maximo:]
+                self.lotes += 1
+                self.operaciones += len(lote)
+            try:
+                self.aplicar(clave, lote)
+            except Exception as error:
+                for escritura in lote:
+                    escritura.error = error
+            for escritura in lote:
+                escritura.hecha = True
+                escritura.evento.set()
+        with self._condicion:
+            restantes = self._pendientes[clave]
+            if restantes:
+                restantes[0].lider = True
+                restantes[0].evento.set()
+            else:
+                del self._pendientes[clave]
+                self._con_lider.discard(clave)
+
+
+def _tramos(lote):
+    """Agrupa un lote en tramos consecutivos de la misma operación (conservan el orden)."""
+    tramos = []
+    for escritura in lote:
+        if tramos and tramos[-1][0] == escritura.op:
+            tramos[-1][1].append(escritura.valor)
+        else:
+            tramos.append((escritura.op, [escritura.valor]))
+    return tramos
+
+
+class ServicioArboles:
+    """Árboles con nombre de una app y las operaciones que le piden sus rutas.
+
+    Cada árbol se identifica por `(tipo_arbol, arbol_id)`; los fríos se
+    desalojan a disco al superar el presupuesto de memoria. Los cambios se
+    publican como deltas versionados en `canal_eventos` (para /eventos); el
+    bloqueo de cada árbol mantiene la versión publicada alineada con su estado.
+    """
+
+    def __init__(self, config: dict, logger: logging.Logger | None = None) -> None:
+        self.logger = logger or logging.getLogger(__name__)
+        self.registro = RegistroArboles(
+            presupuesto_bytes=config['ARBOLES_MEMORIA_MB'] * 1024 * 1024,
+            directorio=config['ARBOLES_INSTANTANEAS'],
+            tasa_bloom=config['ARBOLES_BLOOM_FP'],
+            merkle=config['ARBOLES_MERKLE'],
+            enhebrado=config['ARBOLES_ABB_ENHEBRADO']
+        )
+        self.canal_eventos = CanalEventos()
+        # Agrupación de escrituras: las mutaciones que llegan mientras se aplica un
+        # lote (o dentro de la ventana, si se configura) se aplican juntas en una
+        # pasada compartida sobre el árbol. Con ventana 0 no se añade espera: bajo
+        # poca carga cada petición forma su propio lote y se atiende como antes.
+        self.escrituras = ColaEscrituras(self._aplicar_escrituras, config['ARBOLES_LOTE_MS'],
+                                         config['ARBOLES_LOTE_MAX'])
+        self.importacion_bytes = config['ARBOLES_IMPORTACION_MB'] * 1024 * 1024
+        self.importacion_procesos = config['ARBOLES_IMPORTACION_PROCESOS']
+        self._arreglos_cache = OrderedDict()
+        self._bloqueo_cache = threading.Lock()
+        self._precalentamiento = None
+        self._bloqueo_precalentamiento = threading.Lock()
+        self._cerrado = False
+
+        # Modo réplicas compartidas (varios workers de gunicorn): con un prefijo
+        # en ARBOL_MEMORIA_COMPARTIDA las lecturas se sirven desde la última
+        # generación publicada en memoria compartida y las escrituras las aplica
+        # un único proceso escritor, que publica una generación por lote (ver
+        # `replicas.py`).
+        self.prefijo_compartido = config['ARBOL_MEMORIA_COMPARTIDA']
+        self.replicas = None
+        if self.prefijo_compartido:
+            from replicas import ReplicasCompartidas
+            self.replicas = ReplicasCompartidas(self.prefijo_compartido, self, self.logger)
+
+        # Borrado perezoso en los ABB: marca lápidas en vez de desenganchar nodos
+        # y compacta por lotes. No aplica a las réplicas compartidas, que
+        # publican todos los nodos físicos.
+        self.abb_perezoso = config['ARBOLES_ABB_PEREZOSO'] and not self.prefijo_compartido
+
+    # -------------------- Acceso a los árboles --------------------
+    @contextmanager
+    def leer(self, tipo_arbol, arbol_id):
+        """Árbol (o réplica compartida) sobre el que atender una lectura."""
+        clave = clave_tipo(tipo_arbol)
+        if self.replicas is not None:
+            yield self.replicas.actual(clave, arbol_id) or self.registro.clases[clave]()
+            return
+        with self.registro.usar(clave, arbol_id) as entrada:
+            yield entrada.arbol
+        # Pudo recargarse de disco
+        self._recortar_arreglos()
+
+    @contextmanager
+    def mutar(self, tipo_arbol, arbol_id):
+        """Da la entrada a modificar con su bloqueo tomado (y publica la réplica si corresponde).
+
+        En modo compartido solo lo usa el proceso escritor (ver `_reenviar`).
+        """
+        clave = clave_tipo(tipo_arbol)
+        with self.registro.usar(clave, arbol_id) as entrada:
+            if self.replicas is None:
+                yield entrada
+            else:
+                self.replicas.adoptar(entrada)
+                if clave == 'adaptativo':
+                    # La migración termina dentro del lote, así se publica con él
+                    entrada.arbol.en_segundo_plano = False
+                yield entrada
+                # La ruta puede haber reemplazado el árbol completo (p. ej. /importar)
+                self.replicas.publicar(entrada)
+        # El árbol pudo crecer sobre la memoria que ocupaban los arreglos
+        self._recortar_arreglos()
+
+    def _reenviar(self, operacion, tipo_arbol, arbol_id, *argumentos):
+        """Ejecuta la escritura en el proceso escritor de las réplicas compartidas.
+
+        Los detalles del cambio se publican en el canal de eventos del
+        escritor; aquí se avisa a los clientes de este proceso de que vuelvan
+        a pedir la estructura.
+        """
+        resultado = self.replicas.reenviar(operacion, tipo_arbol, arbol_id, *argumentos)
+        clave = clave_tipo(tipo_arbol)
+        self.canal_eventos.publicar(f'{clave}:{arbol_id}', {'op': 'replica', 'operacion': operacion,
+                                                            'tipo_arbol': clave, 'arbol_id': arbol_id})
+        return resultado
+
+    def version(self, tipo_arbol, arbol_id) -> int:
+        return self.canal_eventos.version(f'{clave_tipo(tipo_arbol)}:{arbol_id}')
+
+    def publicar(self, entrada, delta) -> None:
+        clave = f'{entrada.tipo}:{entrada.arbol_id}'
+        self.canal_eventos.publicar(clave, dict(delta, tipo_arbol=entrada.tipo, arbol_id=entrada.arbol_id))
+
+    # -------------------- Precalentamiento --------------------
+    def precalentar_en_segundo_plano(self) -> None:
+        """Recarga en un hilo las instantáneas persistentes mientras quepan en el presupuesto.
+
+        Lo dispara la primera petición (el servidor ya acepta conexiones), así
+        la primera consulta a cada árbol no paga la recarga. No se hace al crear
+        la app porque el proceso que la crea puede no ser el que atiende (p. ej.
+        el vigilante del recargador de Flask), y recargar borra la instantánea.
+        """
+        if self._precalentamiento is not None or self.prefijo_compartido or not self.registro.persistente:
+            return
+        with self._bloqueo_precalentamiento:
+            if self._precalentamiento is None:
+                self._precalentamiento = threading.Thread(target=self._precalentar, name='precalentamiento',
+                                                          daemon=True)
+                self._precalentamiento.start()
+
+    def _precalentar(self):
+        inicio = time.perf_counter()
+        cargados = self.registro.precalentar()
+        if cargados:
+            self.logger.info('precalentamiento: %d árboles recargados de %s en %.2f s',
+                             cargados, self.registro.directorio, time.perf_counter() - inicio)
+
+    # -------------------- Escrituras --------------------
+    def escribir(self, tipo_arbol, arbol_id, op, valor) -> None:
+        """Inserta o elimina `valor` (`op` es 'insertar' o 'eliminar') en su lote agrupado."""
+        if self.replicas is not None and not self.replicas.escritor:
+            self._reenviar('escribir', tipo_arbol, arbol_id, op, valor)
+            return
+        self.escrituras.enviar((clave_tipo(tipo_arbol), arbol_id), op, valor)
+
+    def _eliminar_valores(self, entrada, valores):
+        """Elimina una aparición de cada valor y devuelve los que estaban."""
+        arbol = entrada.arbol
+        if self.abb_perezoso and entrada.tipo == 'abb':
+            return [valor for valor in valores if arbol.eliminar_perezoso(valor)]
+        if len(valores) > 1:
+            return arbol.eliminar_lote(valores)
+        return valores if arbol.eliminar(valores[0]) else []
+
+    def _avisar_migraciones(self, entrada):
+        """Registra y publica las migraciones ABB -> AVL de un árbol adaptativo."""
+        if entrada.tipo != 'adaptativo':
+            return
+        for migracion in entrada.arbol.migraciones_nuevas():
+            self.logger.info('%s:%s migró de ABB a AVL: %d nodos, altura %d -> %d, copia %.3f s (bloqueante), '
+                             'construcción %.3f s', entrada.tipo, entrada.arbol_id, migracion['cantidad'],
+                             migracion['altura_abb'], migracion['altura_avl'], migracion['segundos_copia'],
+                             migracion['segundos_construccion'])
+            # Cambió la forma completa: los clientes vuelven a pedir la estructura
+            self.publicar(entrada, {'op': 'migrar', 'migracion': migracion})
+
+    def _aplicar_escrituras(self, clave, lote):
+        tipo_arbol, arbol_id = clave
+        with self.mutar(tipo_arbol, arbol_id) as entrada:
+            for op, valores in _tramos(lote):
+                # Antes del delta de la operación, que ya se aplica sobre el AVL
+                self._avisar_migraciones(entrada)
+                arbol = entrada.arbol
+                if len(valores) == 1:
+                    # Una sola operación: delta detallado que los clientes reproducen
+                    if op == 'insertar':
+                        lapidas = getattr(arbol, 'borrados', 0)
+                        arbol.insertar(valores[0])
+                        entrada.agregados(valores)
+                        if getattr(arbol, 'borrados', 0) != lapidas:
+                            # Revivió una lápida en su sitio: los clientes vuelven a pedir la estructura
+                            self.publicar(entrada, {'op': 'revivir', 'valor': valores[0]})
+                            continue
+                    else:
+                        eliminados = self._eliminar_valores(entrada, valores)
+                        entrada.quitados(eliminados)
+                        if not eliminados:
+                            # No estaba: el árbol no cambió y la versión tampoco
+                            continue
+                        if self.abb_perezoso and entrada.tipo == 'abb':
+                            # Lápida (o compactación): los clientes vuelven a pedir la estructura
+                            self.publicar(entrada, {'op': 'borrar', 'valor': valores[0]})
+                            continue
+                    self.publicar(entrada, {
+                        'op': op,
+                        'valor': valores[0],
+                        'rotaciones': _rotaciones(arbol),
+                        'raiz': _valor_raiz(arbol)
+                    })
+                    continue
+                if op == 'insertar':
+                    arbol.insertar_lote(valores)
+                    entrada.agregados(valores)
+                else:
+                    valores = self._eliminar_valores(entrada, valores)
+                    entrada.quitados(valores)
+                    if not valores:
+                        continue
+                # Sin réplica local: los clientes vuelven a pedir la estructura
+                self.publicar(entrada, {'op': 'lote', 'operacion': op, 'valores': sorted(valores)})
+            # Las migraciones sin hilo terminan dentro de la propia operación
+            self._avisar_migraciones(entrada)
+
+    def crear(self, tipo_arbol, arbol_id) -> bool:
+        """Crea el árbol si no existe; True si ya existía."""
+        if self.replicas is not None:
+            if not self.replicas.escritor:
+                return self._reenviar('crear', tipo_arbol, arbol_id)
+            # Pudo crearlo un escritor anterior
+            if self.replicas.actual(clave_tipo(tipo_arbol), arbol_id) is not None:
+                return True
+        existia = self.registro.existe(clave_tipo(tipo_arbol), arbol_id)
+        with self.mutar(tipo_arbol, arbol_id):
+            pass
+        return existia
+
+    def importar(self, tipo_arbol, arbol_id, ordenados) -> int:
+        """Mezcla los valores ya ordenados con el árbol, reconstruido balanceado; devuelve sus nodos."""
+        from importacion import construir
+
+        if self.replicas is not None and not self.replicas.escritor:
+            # Las corridas en disco están en el mismo equipo: viajan sus rutas
+            return self._reenviar('importar', tipo_arbol, arbol_id, ordenados)
+        clave = clave_tipo(tipo_arbol)
+        with self.mutar(clave, arbol_id) as entrada:
+            entrada.arbol = construir(self.registro.clases[clave], ordenados, entrada.arbol, entrada.nodos)
+            entrada.rehacer_filtro()
+            # Delta sin réplica local: los clientes vuelven a pedir la estructura
+            self.publicar(entrada, {'op': 'importar', 'cantidad': ordenados.cantidad})
+            return entrada.nodos
+
+    def limpiar(self, tipo_arbol, arbol_id) -> None:
+        if self.replicas is not None and not self.replicas.escritor:
+            self._reenviar('limpiar', tipo_arbol, arbol_id)
+            return
+        with self.mutar(tipo_arbol, arbol_id) as entrada:
+            # Árbol nuevo: también descarta las lápidas y sus contadores
+            entrada.arbol = type(entrada.arbol)()
+            entrada.rehacer_filtro()
+            self.publicar(entrada, {'op': 'limpiar'})
+
+    # -------------------- Lecturas --------------------
+    def estructura(self, tipo_arbol, arbol_id) -> str:
+        """Cuerpo JSON de `/estructura`: el árbol anidado y su versión, escrito sin recursión."""
+        with self.leer(tipo_arbol, arbol_id) as arbol:
+            # Las réplicas compartidas escriben su propio JSON a partir de sus arreglos
+            if hasattr(arbol, 'a_json'):
+                arbol_json = arbol.a_json()
+            else:
+                arbol_json = estructura_json(arbol.raiz)
+            version = self.version(tipo_arbol, arbol_id)
+        return f'{{"arbol": {arbol_json}, "version": {version}}}'
+
+    def buscar(self, tipo_arbol, arbol_id, valor) -> bool:
+        if self.prefijo_compartido:
+            with self.leer(tipo_arbol, arbol_id) as arbol:
+                return arbol.buscar(valor)
+        # La entrada consulta antes su filtro de Bloom, si lo tiene
+        with self.registro.usar(clave_tipo(tipo_arbol), arbol_id) as entrada:
+            return entrada.buscar(valor)
+
+    def arreglo(self, tipo_arbol, arbol_id):
+        """Contenido del árbol como arreglo int64 (vista sin copia en modo compartido)."""
+        clave = clave_tipo(tipo_arbol)
+        if self.replicas is not None:
+            vista = self.replicas.actual(clave, arbol_id)
+            return vista.a_numpy() if vista else self.registro.clases[clave]().a_numpy(0)
+        with self.registro.usar(clave, arbol_id) as entrada:
+            version = self.version(clave, arbol_id)
+            with self._bloqueo_cache:
+                guardado = self._arreglos_cache.get((clave, arbol_id))
+            if guardado is not None and guardado[0] == version:
+                return guardado[1]
+            arreglo = entrada.arbol.a_numpy(entrada.nodos)
+        with self._bloqueo_cache:
+            self._arreglos_cache[(clave, arbol_id)] = (version, arreglo)
+            self._arreglos_cache.move_to_end((clave, arbol_id))
+            while len(self._arreglos_cache) > MAX_ARREGLOS_CACHE:
+                self._arreglos_cache.popitem(last=False)
+        self._recortar_arreglos()
+        return arreglo
+
+    def bytes_arreglos(self) -> int:
+        with self._bloqueo_cache:
+            return sum(arreglo.nbytes for _, arreglo in self._arreglos_cache.values())
+
+    def _recortar_arreglos(self) -> None:
+        """Suelta arreglos (el menos reciente primero) hasta que quepan en el presupuesto libre.
+
+        Los árboles tienen prioridad: un arreglo nunca provoca un desalojo y
+        uno que no cabe se devuelve sin guardarlo.
+        """
+        if not self._arreglos_cache:
+            return
+        libres = self.registro.presupuesto_bytes - self.registro.memoria()
+        with self._bloqueo_cache:
+            ocupados = sum(arreglo.nbytes for _, arreglo in self._arreglos_cache.values())
+            while ocupados > libres:
+                _, (_, arreglo) = self._arreglos_cache.popitem(last=False)
+                ocupados -= arreglo.nbytes
+
+    def estadisticas_filtro(self, tipo_arbol, arbol_id) -> dict:
+        if self.prefijo_compartido or self.registro.tasa_bloom is None:
+            return {'activo': False}
+        with self.registro.usar(clave_tipo(tipo_arbol), arbol_id) as entrada:
+            return dict(entrada.filtro.estadisticas(), activo=True)
+
+    def resumen(self) -> dict:
+        """Árboles del registro, memoria y contadores (GET /arboles)."""
+        registro = self.registro
+        return {
+            'arboles': registro.listar(),
+            'memoria_bytes': registro.memoria(),
+            'presupuesto_bytes': registro.presupuesto_bytes,
+            'arreglos_bytes': self.bytes_arreglos(),
+            'desalojos': registro.desalojos,
+            'recargas': registro.recargas,
+            'precalentados': registro.precalentados,
+            'escrituras': {'lotes': self.escrituras.lotes, 'operaciones': self.escrituras.operaciones}
+        }
+
+    # -------------------- Cierre --------------------
+    def cerrar(self) -> None:
+        """Al apagar: guarda los árboles persistentes o borra los desalojos temporales."""
+        if self._cerrado:
+            return
+        self._cerrado = True
+        if self.replicas is not None:
+            self.replicas.cerrar()
+        self.registro.cerrar()
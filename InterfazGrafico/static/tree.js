@@ -1,4 +1,9 @@
 let arbolData = null;
+let versionLocal = 0;
+let eventosActivos = false;
+let fuenteEventos = null;
+// Árbol con nombre a visualizar: /?arbol_id=<id> (por defecto 'default')
+const arbolId = new URLSearchParams(window.location.search).get('arbol_id') || 'default';
 
 function mostrarMensaje(mensaje, esError = false) {
     const elemento = document.getElementById('mensaje');
@@ -27,13 +32,13 @@ async function insertarValor() {
             headers: {
                 'Content-Type': 'application/json'
             },
-            body: JSON.stringify({ valor, tipo_arbol: tipoArbol })
+            body: JSON.stringify({ valor, tipo_arbol: tipoArbol, arbol_id: arbolId })
         });
         
         const data = await response.json();
         mostrarMensaje(data.mensaje);
         valorInput.value = '';
-        await actualizarVisualizacion();
+        if (!eventosActivos) await actualizarVisualizacion();
     } catch (error) {
         mostrarMensaje('Error al insertar valor: ' + error.message, true);
     }
@@ -55,13 +60,13 @@ async function eliminarValor() {
             headers: {
                 'Content-Type': 'application/json'
             },
-            body: JSON.stringify({ valor, tipo_arbol: tipoArbol })
+            body: JSON.stringify({ valor, tipo_arbol: tipoArbol, arbol_id: arbolId })
         });
         
         const data = await response.json();
         mostrarMensaje(data.mensaje);
         valorInput.value = '';
-        await actualizarVisualizacion();
+        if (!eventosActivos) await actualizarVisualizacion();
     } catch (error) {
         mostrarMensaje('Error al eliminar valor: ' + error.message, true);
     }
@@ -71,7 +76,7 @@ async function realizarRecorrido(tipo) {
     const tipoArbol = document.getElementById('tipoArbol').value;
     
     try {
-        const response = await fetch(`/recorrido/${tipo}?tipo_arbol=${tipoArbol}`);
+        const response = await fetch(`/recorrido/${tipo}?tipo_arbol=${tipoArbol}&arbol_id=${encodeURIComponent(arbolId)}`);
         const data = await response.json();
         mostrarRecorrido(data.recorrido, tipo);
     } catch (error) {
@@ -88,12 +93,12 @@ async function limpiarArbol() {
             headers: {
                 'Content-Type': 'application/json'
             },
-            body: JSON.stringify({ tipo_arbol: tipoArbol })
+            body: JSON.stringify({ tipo_arbol: tipoArbol, arbol_id: arbolId })
         });
         
         const data = await response.json();
         mostrarMensaje(data.mensaje);
-        await actualizarVisualizacion();
+        if (!eventosActivos) await actualizarVisualizacion();
     } catch (error) {
         mostrarMensaje('Error al limpiar árbol: ' + error.message, true);
     }
@@ -103,9 +108,10 @@ async function actualizarVisualizacion() {
     const tipoArbol = document.getElementById('tipoArbol').value;
     
     try {
-        const response = await fetch(`/estructura?tipo_arbol=${tipoArbol}`);
+        const response = await fetch(`/estructura?tipo_arbol=${tipoArbol}&arbol_id=${encodeURIComponent(arbolId)}`);
         const data = await response.json();
         arbolData = data.arbol;
+        versionLocal = data.version || 0;
         dibujarArbol();
     } catch (error) {
         console.error('Error al obtener estructura del árbol:', error);
@@ -147,7 +153,7 @@ function dibujarArbol() {
     
     // Dibujar nodos
     for (const [id, pos] of Object.entries(posiciones)) {
-        dibujarNodo(ctx, pos.x, pos.y, radio, id);
+        dibujarNodo(ctx, pos.x, pos.y, radio, id, pos.borrado);
     }
 }
 
@@ -167,7 +173,7 @@ function calcularPosiciones(nodo, nivel, x, posiciones, horizontalEspacio, verti
     
     // Calcular posición actual
     const y = nivel * verticalEspacio + 50;
-    posiciones[nodo.valor] = { x, y };
+    posiciones[nodo.valor] = { x, y, borrado: !!nodo.borrado };
     
     // Calcular espacio para subárboles
     const anchoIzquierdo = calcularAnchoArbol(nodo.izquierdo || nodo.hijo_izquierdo) * horizontalEspacio;
@@ -237,11 +243,11 @@ function dibujarConexiones(ctx, nodo, posiciones, radio) {
     }
 }
 
-function dibujarNodo(ctx, x, y, radio, valor) {
-    // Círculo del nodo
+function dibujarNodo(ctx, x, y, radio, valor, borrado) {
+    // Círculo del nodo (gris si es una lápida del borrado perezoso)
     ctx.beginPath();
     ctx.arc(x, y, radio, 0, 2 * Math.PI);
-    ctx.fillStyle = '#4CAF50';
+    ctx.fillStyle = borrado ? '#BDBDBD' : '#4CAF50';
     ctx.fill();
     ctx.strokeStyle = '#333';
     ctx.lineWidth = 2;
@@ -255,5 +261,132 @@ function dibujarNodo(ctx, x, y, radio, valor) {
     ctx.fillText(valor, x, y);
 }
 
+// -------------------- Deltas por Server-Sent Events --------------------
+function buscarConPadre(valor) {
+    let padre = null;
+    let nodo = arbolData;
+    while (nodo && nodo.valor !== valor) {
+        padre = nodo;
+        nodo = valor < nodo.valor ? nodo.izquierdo : nodo.derecho;
+    }
+    return { padre, nodo };
+}
+
+function reemplazarHijo(padre, viejo, nuevo) {
+    if (!padre) arbolData = nuevo;
+    else if (padre.izquierdo === viejo) padre.izquierdo = nuevo;
+    else padre.derecho = nuevo;
+}
+
+function insertarLocal(valor) {
+    const nuevo = { valor, izquierdo: null, derecho: null };
+    if (!arbolData) {
+        arbolData = nuevo;
+        return;
+    }
+    let nodo = arbolData;
+    while (true) {
+        // Igual que en el servidor: los duplicados van a la derecha
+        const lado = valor < nodo.valor ? 'izquierdo' : 'derecho';
+        if (!nodo[lado]) {
+            nodo[lado] = nuevo;
+            return;
+        }
+        nodo = nodo[lado];
+    }
+}
+
+function eliminarLocal(valor) {
+    const { padre, nodo } = buscarConPadre(valor);
+    if (!nodo) return;
+    if (nodo.izquierdo && nodo.derecho) {
+        // Igual que ArbolAVL._eliminar: se copia el sucesor y se elimina éste
+        let padreSucesor = nodo;
+        let sucesor = nodo.derecho;
+        while (sucesor.izquierdo) {
+            padreSucesor = sucesor;
+            sucesor = sucesor.izquierdo;
+        }
+        nodo.valor = sucesor.valor;
+        reemplazarHijo(padreSucesor, sucesor, sucesor.derecho);
+    } else {
+        reemplazarHijo(padre, nodo, nodo.izquierdo || nodo.derecho);
+    }
+}
+
+function rotarLocal(tipo, pivote) {
+    const { padre, nodo } = buscarConPadre(pivote);
+    if (!nodo) return false;
+    let nuevaRaiz;
+    if (tipo === 'derecha') {
+        nuevaRaiz = nodo.izquierdo;
+        if (!nuevaRaiz) return false;
+        nodo.izquierdo = nuevaRaiz.derecho;
+        nuevaRaiz.derecho = nodo;
+    } else {
+        nuevaRaiz = nodo.derecho;
+        if (!nuevaRaiz) return false;
+        nodo.derecho = nuevaRaiz.izquierdo;
+        nuevaRaiz.izquierdo = nodo;
+    }
+    reemplazarHijo(padre, nodo, nuevaRaiz);
+    return true;
+}
+
+function aplicarDelta(delta) {
+    if (delta.op === 'limpiar') {
+        arbolData = null;
+        return true;
+    }
+    if (delta.op === 'insertar') insertarLocal(delta.valor);
+    else if (delta.op === 'eliminar') eliminarLocal(delta.valor);
+    else return false;
+
+    for (const rotacion of delta.rotaciones || []) {
+        if (!rotarLocal(rotacion.tipo, rotacion.pivote)) return false;
+    }
+    // La raíz enviada por el servidor sirve de comprobación barata
+    const raizLocal = arbolData ? arbolData.valor : null;
+    return raizLocal === delta.raiz;
+}
+
+function escucharEventos() {
+    if (!window.EventSource) return;
+    // El servidor solo envía los deltas del árbol que se muestra
+    if (fuenteEventos) fuenteEventos.close();
+    const tipoArbol = document.getElementById('tipoArbol').value;
+    const fuente = new EventSource(`/eventos?tipo_arbol=${tipoArbol}&arbol_id=${encodeURIComponent(arbolId)}`);
+    fuenteEventos = fuente;
+    fuente.onopen = () => {
+        eventosActivos = true;
+        // Pudimos perder deltas mientras no había conexión
+        actualizarVisualizacion();
+    };
+    fuente.onerror = () => {
+        eventosActivos = false;
+    };
+    // La cola de este cliente en el servidor se desbordó y se perdieron deltas
+    fuente.addEventListener('resincronizar', actualizarVisualizacion);
+    fuente.onmessage = (evento) => {
+        const delta = JSON.parse(evento.data);
+        if (delta.tipo_arbol !== document.getElementById('tipoArbol').value || delta.arbol_id !== arbolId) return;
+        if (delta.version <= versionLocal) return;
+        if (delta.version !== versionLocal + 1 || !aplicarDelta(delta)) {
+            // Hueco de versiones o delta inconsistente: resincronizar completo
+            actualizarVisualizacion();
+            return;
+        }
+        versionLocal = delta.version;
+        dibujarArbol();
+    };
+}
+
 // Inicializar la visualización al cargar la página
-document.addEventListener('DOMContentLoaded', actualizarVisualizacion);
\ No newline at end of file
+document.addEventListener('DOMContentLoaded', () => {
+    document.getElementById('tipoArbol').addEventListener('change', () => {
+        actualizarVisualizacion();
+        escucharEventos();
+    });
+    actualizarVisualizacion();
+    escucharEventos();
+});
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""Fixtures comunes: cada prueba de rutas usa su propia app y su propio servicio."""
+import os
+import sys
+
+import pytest
+
+# Los módulos del servicio se importan desde InterfazGrafico/, como al ejecutarlo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def configuracion(**cambios):
+    """Configuración aislada del entorno: sin persistencia ni réplicas compartidas."""
+    base = {'ARBOLES_INSTANTANEAS': None, 'ARBOL_MEMORIA_COMPARTIDA': None, 'ARBOLES_BLOOM_FP': None,
+            'ARBOLES_MERKLE': False, 'ARBOLES_ABB_PEREZOSO': False, 'ARBOLES_ABB_ENHEBRADO': False,
+            'ARBOLES_LOTE_MS': 0.0}
+    return dict(base, **cambios)
+
+
+@pytest.fixture
+def crear():
+    """Crea apps de Flask con la configuración dada y cierra sus servicios al terminar."""
+    from fabrica import crear_app
+
+    creadas = []
+
+    def _crear(inicio_en_raiz=False, **cambios):
+        app = crear_app(precalentar=False, inicio_en_raiz=inicio_en_raiz, **configuracion(**cambios))
+        creadas.append(app)
+        return app
+
+    yield _crear
+    for app in creadas:
+        app.extensions['arboles'].cerrar()
+
+
+@pytest.fixture
+def cliente(crear):
+    return crear().test_client()
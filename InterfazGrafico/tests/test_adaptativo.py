@@ -0,0 +1,67 @@
+import random
+import threading
+import time
+
+from arboles import adaptativo
+from arboles.abb import ArbolBinario
+from arboles.adaptativo import ArbolAdaptativo
+from arboles.avl import ArbolAVL
+from test_avl import comprobar_avl
+
+
+def test_datos_aleatorios_no_migran():
+    arbol = ArbolAdaptativo()
+    for valor in random.Random(2).sample(range(10 ** 6), 3000):
+        arbol.insertar(valor)
+    assert isinstance(arbol.motor, ArbolBinario) and arbol.migraciones == []
+
+
+def test_migracion_en_la_misma_operacion():
+    arbol = ArbolAdaptativo()
+    arbol.en_segundo_plano = False
+    for valor in range(200):
+        arbol.insertar(valor)
+    assert isinstance(arbol.motor, ArbolAVL)
+    assert comprobar_avl(arbol.motor) == list(range(200))
+    migracion, = arbol.migraciones_nuevas()
+    assert migracion['cantidad'] == ArbolAdaptativo.minimo_nodos and migracion['pendientes'] == 0
+    # La copia bloqueante queda medida aparte de la construcción
+    assert 0 <= migracion['segundos_copia'] and 0 <= migracion['segundos_construccion']
+    assert arbol.migraciones_nuevas() == []
+
+
+def test_escrituras_durante_la_construccion_se_reaplican(monkeypatch):
+    # El hilo de la migración espera a que las escrituras estén anotadas
+    puede_construir = threading.Event()
+
+    class AVLRetenido(ArbolAVL):
+        @classmethod
+        def desde_ordenados(cls, valores, cantidad=None):
+            puede_construir.wait(5)
+            return ArbolAVL.desde_ordenados(valores, cantidad)
+
+    monkeypatch.setattr(adaptativo, 'ArbolAVL', AVLRetenido)
+    arbol = ArbolAdaptativo()
+    valor = 0
+    while not arbol.migrando:
+        arbol.insertar(valor)
+        valor += 1
+    # Siguen en el ABB y quedan anotadas mientras el hilo construye el AVL
+    arbol.eliminar(0)
+    arbol.insertar_lote([-5, 10 ** 6])
+    assert isinstance(arbol.motor, ArbolBinario)
+    puede_construir.set()
+    limite = time.monotonic() + 5
+    while not arbol.completar_migracion():
+        assert time.monotonic() < limite
+        time.sleep(0.001)
+    assert comprobar_avl(arbol.motor) == [-5] + list(range(1, valor)) + [10 ** 6]
+    assert arbol.migraciones[0]['pendientes'] == 3
+
+
+def test_ruta_estadisticas_del_adaptativo(cliente):
+    for valor in range(100):
+        cliente.post('/insertar', json={'valor': valor, 'tipo_arbol': 'adaptativo'})
+    datos = cliente.get('/estadisticas?tipo_arbol=adaptativo').get_json()
+    assert (datos['motor'], datos['migraciones'], datos['cantidad']) == ('avl', 1, 100)
+    assert datos['altura'] <= 8
@@ -0,0 +1,56 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+
+def test_a_numpy_en_inorden():
+    from arboles.abb import ArbolBinario
+    from arboles.avl import ArbolAVL
+
+    for clase in (ArbolBinario, ArbolAVL):
+        arbol = clase()
+        for valor in (5, -3, 8, 5):
+            arbol.insertar(valor)
+        arreglo = arbol.a_numpy()
+        assert arreglo.dtype == np.int64 and arreglo.tolist() == [-3, 5, 5, 8]
+
+
+def test_ruta_percentiles(cliente):
+    assert cliente.get('/estadisticas/percentiles').get_json() == {
+        'cantidad': 0, 'percentiles': {}, 'histograma': {'conteos': [], 'bordes': []}}
+    cliente.post('/importar?tipo_arbol=avl', data=' '.join(map(str, range(1, 101))).encode())
+    datos = cliente.get('/estadisticas/percentiles?tipo_arbol=avl&p=0,50,100&bins=4').get_json()
+    assert datos['cantidad'] == 100
+    assert datos['percentiles'] == {'0': 1.0, '50': 50.5, '100': 100.0}
+    assert datos['histograma'] == {'conteos': [25, 25, 25, 25], 'bordes': [1.0, 25.75, 50.5, 75.25, 100.0]}
+    # Tras escribir, el arreglo guardado en caché se rehace
+    cliente.post('/insertar', json={'valor': 1000, 'tipo_arbol': 'avl'})
+    assert cliente.get('/estadisticas/percentiles?tipo_arbol=avl').get_json()['cantidad'] == 101
+
+
+@pytest.mark.parametrize('consulta, mensaje', [
+    ('p=x', 'p debe ser una lista de números separados por comas'),
+    ('p=50,101', 'p debe estar entre 0 y 100'),
+    ('bins=0', 'bins debe ser mayor o igual que 1'),
+])
+def test_ruta_percentiles_con_errores(cliente, consulta, mensaje):
+    respuesta = cliente.get(f'/estadisticas/percentiles?{consulta}')
+    assert (respuesta.status_code, respuesta.get_json()) == (400, {'error': mensaje})
+
+
+def test_arreglos_en_cache_cuentan_contra_el_presupuesto(crear):
+    servicio = crear().extensions['arboles']
+    with servicio.mutar('avl', 'a') as entrada:
+        entrada.arbol.insertar_lote(range(100))
+    registro = servicio.registro
+    # Cabe un arreglo de 100 valores en lo que el árbol deja libre
+    registro.presupuesto_bytes = registro.memoria() + 100 * 8
+    arreglo = servicio.arreglo('avl', 'a')
+    assert servicio.bytes_arreglos() == arreglo.nbytes == 800
+    assert servicio.arreglo('avl', 'a') is arreglo
+    # El árbol crece sobre esa memoria: el arreglo se suelta, el árbol se queda
+    servicio.escribir('avl', 'a', 'insertar', 100)
+    assert servicio.bytes_arreglos() == 0 and registro.desalojos == 0
+    # Uno que no cabe se devuelve sin guardarlo
+    assert servicio.arreglo('avl', 'a').tolist() == list(range(101))
+    assert servicio.bytes_arreglos() == 0
@@ -0,0 +1,100 @@
+import asyncio
+import json
+
+import pytest
+
+from asgi import crear_app
+from conftest import configuracion
+
+
+async def _pedir(app, metodo, ruta, cuerpo=None, consulta=''):
+    """Una petición HTTP por la interfaz ASGI; devuelve el estado y el cuerpo en bytes."""
+    pendiente = [{'type': 'http.request', 'body': json.dumps(cuerpo).encode() if cuerpo is not None else b''}]
+    partes, estado = [], []
+
+    async def receive():
+        return pendiente.pop() if pendiente else {'type': 'http.disconnect'}
+
+    async def send(mensaje):
+        if mensaje['type'] == 'http.response.start':
+            estado.append(mensaje['status'])
+        else:
+            partes.append(mensaje.get('body', b''))
+
+    await app({'type': 'http', 'method': metodo, 'path': ruta, 'query_string': consulta.encode()}, receive, send)
+    return estado[0], b''.join(partes)
+
+
+def _pedir_json(app, *args, **kwargs):
+    estado, cuerpo = asyncio.run(_pedir(app, *args, **kwargs))
+    return estado, json.loads(cuerpo)
+
+
+@pytest.fixture
+def app():
+    app = crear_app(**configuracion(ARBOLES_PRECALENTAR=False))
+    yield app
+    app.servicio.cerrar()
+
+
+def test_arboles_con_nombre_y_eliminacion_en_abb(app):
+    for valor in (5, 3, 8):
+        _pedir_json(app, 'POST', '/insertar', {'valor': valor, 'tipo_arbol': 'abb', 'arbol_id': 'a'})
+    assert _pedir_json(app, 'POST', '/eliminar', {'valor': 5, 'tipo_arbol': 'abb', 'arbol_id': 'a'}) == (
+        200, {'mensaje': 'Valor 5 eliminado de ABB'})
+    assert _pedir_json(app, 'GET', '/recorrido/inorden', consulta='tipo_arbol=abb&arbol_id=a') == (
+        200, {'recorrido': [3, 8]})
+    assert _pedir_json(app, 'GET', '/recorrido/inorden', consulta='tipo_arbol=abb') == (200, {'recorrido': []})
+    estado, datos = _pedir_json(app, 'GET', '/estadisticas', consulta='arbol_id=a')
+    assert (estado, datos['cantidad'], datos['tipo_arbol']) == (200, 2, 'abb')
+    assert _pedir_json(app, 'POST', '/limpiar', {'tipo_arbol': 'adaptativo'}) == (
+        200, {'mensaje': 'Árbol adaptativo limpiado'})
+
+
+def test_cada_app_tiene_su_servicio(app):
+    otra = crear_app(**configuracion(ARBOLES_PRECALENTAR=False))
+    try:
+        _pedir_json(app, 'POST', '/insertar', {'valor': 1, 'tipo_arbol': 'avl'})
+        assert _pedir_json(otra, 'GET', '/recorrido/inorden', consulta='tipo_arbol=avl')[1] == {'recorrido': []}
+    finally:
+        otra.servicio.cerrar()
+
+
+def test_arbol_degenerado(app):
+    for valor in range(3000):
+        _pedir_json(app, 'POST', '/insertar', {'valor': valor, 'tipo_arbol': 'abb'})
+    estado, cuerpo = asyncio.run(_pedir(app, 'GET', '/estructura'))
+    assert estado == 200
+    assert cuerpo.startswith(b'{"arbol": {"valor": 0, "izquierdo": null') and cuerpo.endswith(b'"version": 3000}')
+    estado, datos = _pedir_json(app, 'GET', '/recorrido/postorden')
+    assert datos['recorrido'][:2] == [2999, 2998]
+
+
+@pytest.mark.parametrize('metodo, ruta, cuerpo, consulta, mensaje', [
+    ('POST', '/insertar', {'valor': 'x', 'tipo_arbol': 'abb'}, '', 'valor debe ser un entero'),
+    ('POST', '/eliminar', {'tipo_arbol': 'abb'}, '', 'falta el parámetro valor'),
+    ('POST', '/insertar', {'valor': 1}, '', 'falta el parámetro tipo_arbol'),
+    ('GET', '/estructura', None, 'arbol_id=a/b', 'arbol_id inválido: use letras, números, "_" o "-" (máx. 64)'),
+])
+def test_parametros_invalidos(app, metodo, ruta, cuerpo, consulta, mensaje):
+    assert _pedir_json(app, metodo, ruta, cuerpo, consulta=consulta) == (400, {'error': mensaje})
+
+
+def test_ruta_desconocida(app):
+    assert _pedir_json(app, 'GET', '/nada')[0] == 404
+
+
+def test_escrituras_concurrentes_forman_lotes():
+    app = crear_app(**configuracion(ARBOLES_PRECALENTAR=False, ARBOLES_LOTE_MS=20.0))
+    try:
+        async def escenario():
+            return await asyncio.gather(*(
+                _pedir(app, 'POST', '/insertar', {'valor': valor, 'tipo_arbol': 'avl'}) for valor in range(16)))
+
+        assert {estado for estado, _ in asyncio.run(escenario())} == {200}
+        escrituras = app.servicio.escrituras
+        assert escrituras.operaciones == 16 and escrituras.lotes < 16
+        assert _pedir_json(app, 'GET', '/recorrido/inorden', consulta='tipo_arbol=avl')[1] == {
+            'recorrido': list(range(16))}
+    finally:
+        app.servicio.cerrar()
@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from arboles.abb import ArbolBinario
+from arboles.avl import ArbolAVL
+
+
+def comprobar_avl(arbol):
+    """Orden de búsqueda, alturas guardadas y factor de equilibrio de cada nodo; devuelve el inorden."""
+    valores = []
+    pila, nodo = [], arbol.raiz
+    while pila or nodo is not None:
+        while nodo is not None:
+            pila.append(nodo)
+            nodo = nodo.izquierdo
+        nodo = pila.pop()
+        valores.append(nodo.valor)
+        nodo = nodo.derecho
+    assert valores == sorted(valores)
+
+    # Alturas de abajo arriba (postorden por pila invertida)
+    orden, pila = [], [arbol.raiz] if arbol.raiz else []
+    while pila:
+        nodo = pila.pop()
+        orden.append(nodo)
+        pila.extend(hijo for hijo in (nodo.izquierdo, nodo.derecho) if hijo)
+    for nodo in reversed(orden):
+        izquierda = nodo.izquierdo.altura if nodo.izquierdo else 0
+        derecha = nodo.derecho.altura if nodo.derecho else 0
+        assert nodo.altura == 1 + max(izquierda, derecha)
+        assert abs(izquierda - derecha) <= 1
+    return valores
+
+
+def comprobar_agregados(arbol, esperados):
+    estadisticas = arbol.estadisticas()
+    assert estadisticas['cantidad'] == len(esperados)
+    assert estadisticas['suma'] == sum(esperados)
+    assert estadisticas['minimo'] == (min(esperados) if esperados else None)
+    assert estadisticas['maximo'] == (max(esperados) if esperados else None)
+
+
+def test_inserciones_y_eliminaciones_aleatorias():
+    aleatorio = random.Random(3)
+    arbol, esperados = ArbolAVL(), []
+    for _ in range(3000):
+        valor = aleatorio.randrange(300)
+        if esperados and aleatorio.random() < 0.4:
+            valor = aleatorio.choice(esperados)
+            assert arbol.eliminar(valor)
+            esperados.remove(valor)
+        else:
+            arbol.insertar(valor)
+            esperados.append(valor)
+    assert comprobar_avl(arbol) == sorted(esperados)
+    comprobar_agregados(arbol, esperados)
+    assert not arbol.eliminar(10_000)
+
+
+def test_entradas_ordenadas_quedan_balanceadas():
+    arbol = ArbolAVL()
+    for valor in range(1024):
+        arbol.insertar(valor)
+    comprobar_avl(arbol)
+    assert arbol.altura() == 11
+
+
+def test_lotes():
+    aleatorio = random.Random(5)
+    arbol = ArbolAVL.desde_ordenados(range(0, 1000, 2))
+    comprobar_avl(arbol)
+    nuevos = [aleatorio.randrange(1000) for _ in range(400)]
+    arbol.insertar_lote(nuevos)
+    esperados = sorted(list(range(0, 1000, 2)) + nuevos)
+    assert comprobar_avl(arbol) == esperados
+
+    quitar = aleatorio.sample(esperados, 300) + [5000]
+    eliminados = arbol.eliminar_lote(quitar)
+    assert sorted(eliminados) == sorted(quitar[:-1])
+    for valor in eliminados:
+        esperados.remove(valor)
+    assert comprobar_avl(arbol) == esperados
+    comprobar_agregados(arbol, esperados)
+
+
+@pytest.mark.parametrize('clase', [ArbolBinario, ArbolAVL])
+def test_agregados_en_o1(clase):
+    arbol = clase.desde_ordenados([1, 4, 9])
+    comprobar_agregados(arbol, [1, 4, 9])
+    arbol.insertar(-2)
+    arbol.eliminar(9)
+    comprobar_agregados(arbol, [-2, 1, 4])
+    arbol.vaciar()
+    comprobar_agregados(arbol, [])
+    assert arbol.estadisticas()['media'] is None
+
+
+def test_ruta_estadisticas(cliente):
+    for valor in (5, 1, 9):
+        cliente.post('/insertar', json={'valor': valor, 'tipo_arbol': 'avl', 'arbol_id': 'e'})
+    datos = cliente.get('/estadisticas?tipo_arbol=avl&arbol_id=e').json
+    assert (datos['cantidad'], datos['suma'], datos['minimo'], datos['maximo'], datos['altura']) == (3, 15, 1, 9, 2)
+    assert datos['tipo_arbol'] == 'avl'
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from arboles.bloom import FiltroBloomContador
+
+
+def test_sin_falsos_negativos_al_agregar_y_quitar():
+    aleatorio = random.Random(17)
+    valores = aleatorio.sample(range(10 ** 9), 2000)
+    filtro = FiltroBloomContador.desde_valores(valores, capacidad=2000, tasa_fp=0.01)
+    quitados, quedan = valores[:700], valores[700:]
+    for valor in quitados:
+        filtro.quitar(valor)
+    assert filtro.cantidad == len(quedan)
+    assert all(filtro.quizas_contiene(valor) for valor in quedan)
+
+
+def test_tasa_de_falsos_positivos_cercana_a_la_pedida():
+    filtro = FiltroBloomContador.desde_valores(range(5000), capacidad=5000, tasa_fp=0.01)
+    ausentes = range(10 ** 6, 10 ** 6 + 20000)
+    positivos = sum(filtro.quizas_contiene(valor) for valor in ausentes)
+    assert positivos / len(ausentes) < 0.03
+    assert filtro.tasa_estimada() == pytest.approx(0.01, rel=0.5)
+
+
+def test_contador_saturado_no_baja():
+    filtro = FiltroBloomContador(capacidad=10)
+    for _ in range(300):
+        filtro.agregar(42)
+    for _ in range(299):
+        filtro.quitar(42)
+    # Los contadores saturados no restan: restar daría falsos negativos
+    assert filtro.quizas_contiene(42)
+
+
+def test_tasa_invalida():
+    with pytest.raises(ValueError):
+        FiltroBloomContador(10, tasa_fp=1.5)
+
+
+def test_busquedas_con_filtro(crear):
+    cliente = crear(ARBOLES_BLOOM_FP=0.01).test_client()
+    for valor in range(100):
+        cliente.post('/insertar', json={'valor': valor, 'tipo_arbol': 'avl'})
+    cliente.post('/eliminar', json={'valor': 50, 'tipo_arbol': 'avl'})
+
+    assert cliente.get('/buscar?valor=49&tipo_arbol=avl').json['encontrado'] is True
+    assert cliente.get('/buscar?valor=50&tipo_arbol=avl').json['encontrado'] is False
+    assert cliente.get('/buscar?valor=5000&tipo_arbol=avl').json['encontrado'] is False
+    datos = cliente.get('/estadisticas/filtro?tipo_arbol=avl').json
+    assert datos['activo'] is True
+    assert (datos['cantidad'], datos['consultas']) == (99, 3)
+    # Al vaciar el árbol el filtro se rehace con él
+    cliente.post('/limpiar', json={'tipo_arbol': 'avl'})
+    assert cliente.get('/buscar?valor=49&tipo_arbol=avl').json['encontrado'] is False
+    assert cliente.get('/estadisticas/filtro?tipo_arbol=avl').json['cantidad'] == 0
+
+
+def test_sin_filtro(cliente):
+    assert cliente.get('/estadisticas/filtro').json == {'activo': False}
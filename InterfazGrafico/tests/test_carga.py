@@ -0,0 +1,37 @@
+import argparse
+import json
+
+import pytest
+
+from benchmarks.carga import _comparar, _mezcla
+from benchmarks.cliente_http import percentil
+
+
+def test_percentil_por_rango_mas_cercano():
+    muestras = [5.0, 1.0, 4.0, 2.0, 3.0]
+    assert [percentil(muestras, p) for p in (0, 20, 50, 99, 100)] == [1.0, 1.0, 3.0, 5.0, 5.0]
+    assert percentil([], 99) == 0.0
+
+
+def test_mezcla():
+    assert _mezcla('insertar=3, estructura') == {'insertar': 3.0, 'estructura': 1.0}
+    with pytest.raises(argparse.ArgumentTypeError, match='ruta desconocida'):
+        _mezcla('buscar=1')
+    with pytest.raises(argparse.ArgumentTypeError, match='no tiene pesos positivos'):
+        _mezcla('insertar=0')
+
+
+def test_comparar_solo_cuenta_regresiones_sobre_la_tolerancia(tmp_path, capsys):
+    def fila(ruta, p99, peticiones=10):
+        return {'tipo_arbol': 'avl', 'tamano': 1000, 'ruta': ruta, 'p99': p99, 'peticiones': peticiones}
+
+    base = tmp_path / 'base.json'
+    base.write_text(json.dumps({'resultados': [fila('insertar', 10.0), fila('eliminar', 10.0),
+                                               fila('limpiar', 0.2), fila('estructura', 10.0)]}))
+    actuales = [fila('insertar', 13.0),  # +30 %: regresión
+                fila('eliminar', 11.0),  # +10 %: dentro de la tolerancia
+                fila('limpiar', 0.5),  # +150 %, pero por debajo del ruido del reloj
+                fila('estructura', 50.0, peticiones=0),  # sin peticiones en esta fase
+                fila('recorrido', 99.0)]  # sin base con la que comparar
+    assert _comparar(actuales, base, tolerancia=25) == 1
+    assert 'REGRESIÓN avl 1000 insertar: p99 10.00 ms -> 13.00 ms' in capsys.readouterr().out
@@ -0,0 +1,178 @@
+import logging
+import multiprocessing
+import os
+import random
+import shutil
+import stat
+import sys
+import uuid
+from multiprocessing import AuthenticationError, shared_memory
+from multiprocessing.connection import Client
+
+import pytest
+
+from arboles.abb import ArbolBinario
+from arboles.adaptativo import ArbolAdaptativo
+from arboles.avl import ArbolAVL
+from arboles.compartido import LectorArbol, PublicadorArbol
+from arboles.recorridos import estructura_json
+from replicas import ReplicasCompartidas, directorio
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32', reason='réplicas con bloqueos POSIX')
+
+
+def _existe(nombre):
+    try:
+        shared_memory.SharedMemory(name=nombre).close()
+    except FileNotFoundError:
+        return False
+    return True
+
+
+@pytest.fixture
+def nombre():
+    nombre = f'prueba_{uuid.uuid4().hex[:12]}'
+    yield nombre
+    PublicadorArbol(nombre).destruir()
+
+
+def test_la_vista_responde_como_el_arbol(nombre):
+    arbol = ArbolAVL()
+    for valor in random.Random(29).sample(range(1000), 300):
+        arbol.insertar(valor)
+    PublicadorArbol(nombre).publicar(arbol)
+    vista = LectorArbol(nombre).actual()
+
+    assert vista.inorden() == arbol.inorden()
+    assert vista.preorden() == arbol.preorden()
+    assert vista.postorden() == arbol.postorden()
+    assert vista.amplitud() == arbol.amplitud()
+    assert vista.a_json() == estructura_json(arbol.raiz)
+    for consulta in (-1, 0, 500, 999, 1000):
+        assert vista.buscar(consulta) == arbol.buscar(consulta)
+        assert (vista.piso(consulta), vista.techo(consulta)) == (arbol.piso(consulta), arbol.techo(consulta))
+        assert vista.k_cercanos(consulta, 4) == arbol.k_cercanos(consulta, 4)
+    esperadas = arbol.estadisticas()
+    assert {clave: vista.estadisticas()[clave] for clave in esperadas} == esperadas
+
+
+def test_sin_publicar_no_hay_vista(nombre):
+    assert LectorArbol(nombre).actual() is None
+
+
+def test_generacion_superada_se_borra(nombre):
+    publicador, lector = PublicadorArbol(nombre), LectorArbol(nombre)
+    publicador.publicar(ArbolAVL.desde_ordenados([1, 2]))
+    anterior = lector.actual()
+    publicador.publicar(ArbolAVL.desde_ordenados([1, 2, 3]))
+
+    assert not _existe(f'{nombre}_g1')
+    # Quien ya la tenía mapeada la sigue leyendo
+    assert anterior.inorden() == [1, 2]
+    assert lector.actual().inorden() == [1, 2, 3]
+
+    publicador.destruir()
+    assert not _existe(f'{nombre}_g2') and not _existe(nombre)
+
+
+def test_reconstruir_respeta_el_motor(nombre):
+    publicador, lector = PublicadorArbol(nombre), LectorArbol(nombre)
+    adaptativo = ArbolAdaptativo()
+    adaptativo.en_segundo_plano = False
+    for valor in range(200):
+        adaptativo.insertar(valor)
+    assert isinstance(adaptativo.motor, ArbolAVL)
+    publicador.publicar(adaptativo)
+
+    vista = lector.actual()
+    assert vista.motor == 'avl'
+    reconstruido = vista.reconstruir(ArbolAdaptativo)
+    assert isinstance(reconstruido.motor, ArbolAVL)
+    assert reconstruido.inorden() == list(range(200))
+
+    publicador.publicar(ArbolBinario.desde_ordenados([1, 2, 3]))
+    vista = lector.actual()
+    assert vista.motor == 'abb'
+    assert isinstance(vista.reconstruir(ArbolAdaptativo).motor, ArbolBinario)
+    assert vista.reconstruir(ArbolBinario).preorden_recursivo() == [2, 1, 3]
+
+
+def _trabajador(prefijo, inicio, barrera, resultados):
+    from conftest import configuracion
+    from fabrica import crear_app
+
+    app = crear_app(precalentar=False, **configuracion(ARBOL_MEMORIA_COMPARTIDA=prefijo))
+    cliente = app.test_client()
+    barrera.wait()
+    for valor in range(inicio, inicio + 50):
+        cliente.post('/insertar', json={'valor': valor, 'tipo_arbol': 'avl'})
+    barrera.wait()
+    recorrido = cliente.get('/recorrido/inorden?tipo_arbol=avl').json['recorrido']
+    resultados.put((app.extensions['arboles'].replicas.escritor, recorrido))
+    barrera.wait()
+    app.extensions['arboles'].cerrar()
+
+
+def test_un_solo_escritor_entre_procesos():
+    prefijo = f'prueba_{uuid.uuid4().hex[:12]}'
+    contexto = multiprocessing.get_context('fork')
+    barrera, resultados = contexto.Barrier(3), contexto.Queue()
+    procesos = [contexto.Process(target=_trabajador, args=(prefijo, 100 * i, barrera, resultados))
+                for i in range(3)]
+    for proceso in procesos:
+        proceso.start()
+    vistos = [resultados.get(timeout=30) for _ in procesos]
+    for proceso in procesos:
+        proceso.join(timeout=30)
+
+    assert [proceso.exitcode for proceso in procesos] == [0, 0, 0]
+    assert sorted(escritor for escritor, _ in vistos) == [False, False, True]
+    esperado = sorted(v for i in range(3) for v in range(100 * i, 100 * i + 50))
+    assert all(recorrido == esperado for _, recorrido in vistos)
+    # El último en cerrar destruyó los segmentos
+    assert not _existe(f'{prefijo}_avl_default')
+    # Los archivos de bloqueo se conservan entre tandas de procesos
+    shutil.rmtree(directorio(prefijo))
+
+
+@pytest.fixture
+def replicas():
+    class Servicio:
+        def escribir(self, *argumentos):
+            return argumentos
+
+    replicas = ReplicasCompartidas(f'prueba_{uuid.uuid4().hex[:12]}', Servicio(), logging.getLogger(__name__))
+    yield replicas
+    replicas.cerrar()
+    shutil.rmtree(replicas.directorio, ignore_errors=True)
+
+
+def test_el_escritor_solo_atiende_a_quien_tiene_la_clave(replicas):
+    assert replicas._postularse()
+    assert stat.S_IMODE(os.stat(replicas.directorio).st_mode) == 0o700
+    socket_escritor = os.path.join(replicas.directorio, 'escritor.sock')
+    assert stat.S_IMODE(os.stat(socket_escritor).st_mode) & 0o077 == 0
+    with pytest.raises(AuthenticationError):
+        Client(socket_escritor, family='AF_UNIX', authkey=b'otra clave')
+    # El rechazo no detiene al escritor
+    with Client(socket_escritor, family='AF_UNIX', authkey=replicas._clave) as conexion:
+        conexion.send(('escribir', ('avl', 'a', 'insertar', 1)))
+        assert conexion.recv() == (True, ('avl', 'a', 'insertar', 1))
+        conexion.send(('__init__', ()))
+        correcto, error = conexion.recv()
+        assert not correcto and isinstance(error, ValueError)
+
+
+@pytest.mark.parametrize('ajeno', ['abierto', 'enlace'])
+def test_rechaza_un_directorio_ajeno_o_abierto(replicas, ajeno, tmp_path):
+    if ajeno == 'abierto':
+        os.mkdir(replicas.directorio, 0o755)
+    else:
+        # Aunque apunte a un directorio 0700 propio
+        os.symlink(tmp_path, replicas.directorio)
+    try:
+        with pytest.raises(PermissionError):
+            replicas.actual('avl', 'a')
+    finally:
+        if os.path.islink(replicas.directorio):
+            os.remove(replicas.directorio)
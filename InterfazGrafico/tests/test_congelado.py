@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from arboles.abb import ArbolBinario
+from arboles.avl import ArbolAVL
+from arboles.congelado import ArbolCongelado
+
+
+@pytest.mark.parametrize('n', [0, 1, 2, 3, 7, 8, 100, 1023, 1024])
+def test_disposicion_de_eytzinger(n):
+    ordenados = sorted(random.Random(n).sample(range(10 * n + 1), n))
+    arbol = ArbolCongelado(ordenados)
+    claves = arbol.claves.tolist()
+    # Hijos del nodo k (desde 1) en 2k y 2k + 1, con el orden de un ABB
+    for k in range(1, n + 1):
+        if 2 * k <= n:
+            assert claves[2 * k - 1] < claves[k - 1]
+        if 2 * k + 1 <= n:
+            assert claves[2 * k] > claves[k - 1]
+    assert arbol.inorden() == ordenados
+    assert arbol.amplitud() == claves
+    assert len(arbol) == n and arbol.altura() == n.bit_length()
+    assert not arbol.claves.flags.writeable
+
+
+def test_busquedas_escalar_y_por_lote():
+    aleatorio = random.Random(19)
+    valores = sorted(aleatorio.sample(range(-5000, 5000), 3000))
+    arbol = ArbolCongelado(valores)
+    presentes = set(valores)
+    consultas = np.array([aleatorio.randrange(-5100, 5100) for _ in range(5000)], dtype=np.int64)
+    esperado = np.array([int(c) in presentes for c in consultas])
+    assert (arbol.buscar_lote(consultas) == esperado).all()
+    assert [arbol.buscar(int(c)) for c in consultas[:500]] == esperado[:500].tolist()
+    # Conserva la forma de la entrada
+    assert arbol.buscar_lote(consultas.reshape(50, 100)).shape == (50, 100)
+
+
+def test_arbol_vacio():
+    arbol = ArbolCongelado([])
+    assert not arbol.buscar(1)
+    assert arbol.buscar_lote([1, 2]).tolist() == [False, False]
+
+
+@pytest.mark.parametrize('clase', [ArbolBinario, ArbolAVL])
+def test_congelar_arboles(clase):
+    arbol = clase()
+    for valor in (5, 3, 8, 1, 4):
+        arbol.insertar(valor)
+    congelado = arbol.congelar(arbol.cantidad())
+    assert congelado.inorden() == [1, 3, 4, 5, 8]
+    arbol.insertar(9)
+    # Es una instantánea: no ve las escrituras posteriores
+    assert not congelado.buscar(9)
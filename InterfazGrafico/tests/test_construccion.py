@@ -0,0 +1,41 @@
+import random
+import sys
+from array import array
+
+import pytest
+
+from arboles import construccion
+from arboles.construccion import construir_abb_paralelo, construir_avl_paralelo, ordenar_paralelo
+from test_avl import comprobar_avl
+
+
+def test_ordenar_paralelo_con_duplicados_y_extremos(monkeypatch):
+    # Pocas claves distintas: varios divisores coinciden y hay particiones vacías
+    monkeypatch.setattr(construccion, 'MINIMO_PARALELO', 0)
+    valores = random.Random(9).choices([-2 ** 63, -1, 0, 7, 2 ** 63 - 1], k=3000)
+    assert list(ordenar_paralelo(valores, procesos=3)) == sorted(valores)
+    assert list(ordenar_paralelo([], procesos=3)) == []
+
+
+def test_construccion_paralela_balanceada(monkeypatch):
+    monkeypatch.setattr(construccion, 'MINIMO_PARALELO', 0)
+    valores = random.Random(1).sample(range(10 ** 6), 5000)
+    assert comprobar_avl(construir_avl_paralelo(valores, procesos=2)) == sorted(valores)
+    abb = construir_abb_paralelo(valores, procesos=2)
+    assert abb.inorden_recursivo() == sorted(valores)
+    assert abb.estadisticas()['altura'] == len(bin(len(valores))) - 2
+
+
+@pytest.mark.parametrize('con_numpy', [True, False])
+def test_ordenar_en_un_proceso_sobre_el_mismo_arreglo(monkeypatch, con_numpy):
+    if con_numpy:
+        pytest.importorskip('numpy')
+    else:
+        # Sin numpy se ordena por una lista intermedia
+        monkeypatch.setitem(sys.modules, 'numpy', None)
+    valores = random.Random(4).choices(range(-50, 50), k=500) + [-2 ** 63, 2 ** 63 - 1]
+    bloque = array('q', valores)
+    # Sin `en_sitio` el arreglo del llamador no se toca
+    assert list(ordenar_paralelo(bloque, procesos=1)) == sorted(valores) and list(bloque) == valores
+    assert ordenar_paralelo(bloque, procesos=1, en_sitio=True) is bloque
+    assert list(bloque) == sorted(valores)
@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from arboles.abb import ArbolBinario
+from arboles.avl import ArbolAVL
+
+
+def _referencia(valores, consulta, k):
+    return sorted(valores, key=lambda v: (abs(v - consulta), v))[:k]
+
+
+@pytest.mark.parametrize('clase', [ArbolBinario, ArbolAVL])
+def test_piso_techo_y_cercanos(clase):
+    aleatorio = random.Random(7)
+    valores = aleatorio.sample(range(0, 2000, 3), 200)
+    arbol = clase()
+    for valor in valores:
+        arbol.insertar(valor)
+    for consulta in range(-5, 2005, 37):
+        menores = [v for v in valores if v <= consulta]
+        mayores = [v for v in valores if v >= consulta]
+        assert arbol.piso(consulta) == (max(menores) if menores else None)
+        assert arbol.techo(consulta) == (min(mayores) if mayores else None)
+        cercanos = arbol.k_cercanos(consulta, 5)
+        assert len(cercanos) == 5
+        # Ante empates cualquier lado vale: se comparan las distancias
+        assert sorted(abs(v - consulta) for v in cercanos) == \
+            [abs(v - consulta) for v in _referencia(valores, consulta, 5)]
+
+
+def test_arbol_vacio():
+    arbol = ArbolAVL()
+    assert (arbol.piso(3), arbol.techo(3), arbol.k_cercanos(3, 2)) == (None, None, [])
+
+
+def test_ruta_cercanos(cliente):
+    for valor in (10, 20, 30):
+        cliente.post('/insertar', json={'valor': valor, 'tipo_arbol': 'avl'})
+    assert cliente.get('/cercanos?valor=22&k=2&tipo_arbol=avl').json == {
+        'valor': 22, 'piso': 20, 'techo': 30, 'cercanos': [20, 30]}
+
+
+@pytest.mark.parametrize('ruta, mensaje', [
+    ('/cercanos', 'falta el parámetro valor'),
+    ('/cercanos?valor=x', 'valor debe ser un entero'),
+    ('/cercanos?valor=1&k=dos', 'k debe ser un entero'),
+    ('/cercanos?valor=1&k=-1', 'k debe ser mayor o igual que 0'),
+    ('/buscar?valor=1.5', 'valor debe ser un entero'),
+    ('/mapa/rango?limite=-3', 'limite debe ser mayor o igual que 0'),
+    ('/estadisticas/percentiles?bins=0', 'bins debe ser mayor o igual que 1'),
+    ('/estadisticas/percentiles?p=50,200', 'p debe estar entre 0 y 100'),
+    ('/recorrido/inorden?arbol_id=../otro', 'arbol_id inválido: use letras, números, "_" o "-" (máx. 64)'),
+])
+def test_parametros_invalidos_responden_400(cliente, ruta, mensaje):
+    respuesta = cliente.get(ruta)
+    assert respuesta.status_code == 400
+    assert respuesta.json == {'error': mensaje}
+
+
+@pytest.mark.parametrize('cuerpo, mensaje', [
+    ({'tipo_arbol': 'avl'}, 'falta el parámetro valor'),
+    ({'valor': 'cinco', 'tipo_arbol': 'avl'}, 'valor debe ser un entero'),
+])
+def test_escrituras_invalidas_responden_400(cliente, cuerpo, mensaje):
+    for ruta in ('/insertar', '/eliminar'):
+        respuesta = cliente.post(ruta, json=cuerpo)
+        assert respuesta.status_code == 400
+        assert respuesta.json == {'error': mensaje}
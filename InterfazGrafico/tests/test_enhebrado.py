@@ -0,0 +1,125 @@
+import bisect
+import random
+
+import pytest
+
+from arboles.abb import ArbolBinario, ArbolBinarioEnhebrado
+
+
+def _nodos_inorden(raiz):
+    # Referencia con pila, por los enlaces de hijos (sin hilos)
+    nodos, pila, actual = [], [], raiz
+    while pila or actual is not None:
+        while actual is not None:
+            pila.append(actual)
+            actual = actual.hijo_izquierdo
+        actual = pila.pop()
+        nodos.append(actual)
+        actual = actual.hijo_derecho
+    return nodos
+
+
+def comprobar_hilos(arbol):
+    """Cada nodo sin hijo derecho apunta a su sucesor inorden (el último, a None)."""
+    nodos = _nodos_inorden(arbol.raiz)
+    for nodo, siguiente in zip(nodos, nodos[1:] + [None]):
+        if nodo.hijo_derecho is None:
+            assert nodo.hilo is siguiente, nodo
+
+
+def test_operaciones_mezcladas_conservan_los_hilos():
+    aleatorio = random.Random(7)
+    arbol, vivos = ArbolBinarioEnhebrado(), []
+    for paso in range(3000):
+        valor = aleatorio.randrange(400)
+        operacion = aleatorio.random()
+        if operacion < 0.45:
+            arbol.insertar(valor)
+            bisect.insort(vivos, valor)
+        elif operacion < 0.7:
+            assert arbol.eliminar(valor) == (valor in vivos)
+            if valor in vivos:
+                vivos.remove(valor)
+        elif operacion < 0.9:
+            assert arbol.eliminar_perezoso(valor) == (valor in vivos)
+            if valor in vivos:
+                vivos.remove(valor)
+        else:
+            lote = aleatorio.choices(range(400), k=5)
+            arbol.insertar_lote(lote)
+            for v in lote:
+                bisect.insort(vivos, v)
+        if paso % 50 == 0:
+            comprobar_hilos(arbol)
+            assert list(arbol.iter_inorden()) == vivos == arbol.inorden_recursivo()
+    comprobar_hilos(arbol)
+    assert arbol.estadisticas()['cantidad'] == len(vivos)
+
+
+def test_sucesor_y_cercanos_con_lapidas():
+    arbol = ArbolBinarioEnhebrado.desde_ordenados(range(0, 100, 2))
+    for valor in (12, 14, 16):
+        arbol.eliminar_perezoso(valor)
+    assert arbol.borrados == 3
+    assert [arbol.sucesor(v) for v in (9, 10, 11, 98, -5)] == [10, 18, 18, None, 0]
+    assert arbol.techo(13) == 18 and arbol.piso(17) == 10
+    assert arbol.k_cercanos(14, 3) == [10, 18, 8]
+
+
+def test_iter_inorden_no_usa_pila(monkeypatch):
+    arbol = ArbolBinarioEnhebrado()
+    for valor in range(5000):
+        arbol.insertar(valor)
+    # Si recurriera a los recorridos con pila del ABB, fallaría
+    monkeypatch.setattr(ArbolBinario, 'iter_inorden', None)
+    monkeypatch.setattr(ArbolBinario, '_ascendentes', None)
+    assert list(arbol.iter_inorden()) == list(range(5000))
+    arbol.eliminar_perezoso(2500)
+    assert arbol.sucesor(2499) == 2501
+
+
+@pytest.mark.parametrize('reconstruir', ['desde_preorden', 'compactar'])
+def test_reconstrucciones_quedan_enhebradas(reconstruir):
+    arbol = ArbolBinarioEnhebrado()
+    for valor in random.Random(2).sample(range(1000), 200):
+        arbol.insertar(valor)
+    esperado = arbol.inorden_recursivo()
+    if reconstruir == 'desde_preorden':
+        arbol = ArbolBinarioEnhebrado.desde_preorden(arbol.preorden_recursivo())
+    else:
+        arbol.eliminar_perezoso(esperado.pop(0))
+        arbol.compactar()
+    comprobar_hilos(arbol)
+    assert list(arbol.iter_inorden()) == esperado
+
+
+def test_registro_enhebrado_desaloja_y_recarga():
+    from registro import RegistroArboles
+
+    registro = RegistroArboles(0, enhebrado=True)
+    try:
+        with registro.usar('abb', 'a') as entrada:
+            for valor in (5, 3, 8, 1, 4):
+                entrada.arbol.insertar(valor)
+        with registro.usar('abb', 'b'):
+            pass
+        assert registro.desalojos == 1
+        with registro.usar('abb', 'a') as entrada:
+            assert isinstance(entrada.arbol, ArbolBinarioEnhebrado)
+            comprobar_hilos(entrada.arbol)
+            assert entrada.arbol.preorden_recursivo() == [5, 3, 1, 4, 8]
+    finally:
+        registro.cerrar()
+
+
+def test_rutas_con_abb_enhebrado(crear):
+    app = crear(ARBOLES_ABB_ENHEBRADO=True)
+    cliente = app.test_client()
+    for valor in (50, 30, 70, 20, 40, 60, 80):
+        cliente.post('/insertar', json={'valor': valor, 'tipo_arbol': 'abb'})
+    cliente.post('/eliminar', json={'valor': 30, 'tipo_arbol': 'abb'})
+    assert cliente.get('/recorrido/inorden').get_json() == {'recorrido': [20, 40, 50, 60, 70, 80]}
+    assert cliente.get('/cercanos?valor=45&k=2').get_json() == {
+        'valor': 45, 'piso': 40, 'techo': 50, 'cercanos': [40, 50]}
+    with app.extensions['arboles'].leer('abb', 'default') as arbol:
+        comprobar_hilos(arbol)
@@ -0,0 +1,63 @@
+import random
+import threading
+
+import pytest
+
+from servicio import ColaEscrituras
+from test_avl import comprobar_avl
+
+
+def test_lotes_avl_equivalen_a_operaciones_sueltas():
+    from arboles.avl import ArbolAVL
+
+    aleatorio = random.Random(4)
+    arbol, esperado = ArbolAVL(), []
+    for _ in range(50):
+        insertar = aleatorio.choices(range(200), k=aleatorio.randrange(1, 40))
+        arbol.insertar_lote(insertar)
+        esperado.extend(insertar)
+        eliminar = aleatorio.choices(range(200), k=aleatorio.randrange(1, 20))
+        eliminados = arbol.eliminar_lote(eliminar)
+        for valor in eliminados:
+            esperado.remove(valor)
+        assert comprobar_avl(arbol) == sorted(esperado)
+
+
+def test_escrituras_concurrentes_se_agrupan():
+    aplicados, lotes = [], []
+
+    def aplicar(clave, lote):
+        lotes.append(len(lote))
+        aplicados.extend(escritura.valor for escritura in lote)
+
+    cola = ColaEscrituras(aplicar, ventana_ms=50, maximo=8)
+    hilos = [threading.Thread(target=cola.enviar, args=('a', 'insertar', i)) for i in range(20)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert sorted(aplicados) == list(range(20))
+    assert max(lotes) <= 8 and len(lotes) < 20
+    assert (cola.lotes, cola.operaciones) == (len(lotes), 20)
+
+
+def test_el_error_de_un_lote_llega_a_cada_autor():
+    def aplicar(clave, lote):
+        raise ValueError('lote rechazado')
+
+    cola = ColaEscrituras(aplicar, ventana_ms=0, maximo=8)
+    with pytest.raises(ValueError, match='lote rechazado'):
+        cola.enviar('a', 'insertar', 1)
+    # La cola queda libre para la siguiente escritura
+    with pytest.raises(ValueError):
+        cola.enviar('a', 'insertar', 2)
+    assert cola.lotes == 2
+
+
+def test_ruta_con_ventana_de_lote(crear):
+    cliente = crear(ARBOLES_LOTE_MS=5.0).test_client()
+    for valor in (4, 2, 6):
+        cliente.post('/insertar', json={'valor': valor, 'tipo_arbol': 'avl'})
+    cliente.post('/eliminar', json={'valor': 2, 'tipo_arbol': 'avl'})
+    assert cliente.get('/recorrido/inorden?tipo_arbol=avl').get_json() == {'recorrido': [4, 6]}
+    assert cliente.get('/arboles').get_json()['escrituras'] == {'lotes': 4, 'operaciones': 4}
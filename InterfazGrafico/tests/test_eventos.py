@@ -0,0 +1,88 @@
+import json
+
+from werkzeug.test import EnvironBuilder
+
+from conftest import configuracion
+from eventos import CanalEventos
+from servicio import ServicioArboles, _Escritura, configuracion_entorno
+
+
+def test_deltas_versionados_por_arbol():
+    servicio = ServicioArboles(dict(configuracion_entorno(), **configuracion()))
+    try:
+        cola = servicio.canal_eventos.suscribir().cola
+        for valor in (1, 2, 3):
+            servicio.escribir('avl', 'a', 'insertar', valor)
+        servicio.escribir('abb', 'a', 'insertar', 9)
+        servicio.escribir('abb', 'a', 'eliminar', 9)
+        # Eliminar lo que no está no cambia el árbol: sin delta ni versión nueva
+        servicio.escribir('abb', 'a', 'eliminar', 9)
+        deltas = [cola.get_nowait() for _ in range(cola.qsize())]
+        assert [(d['tipo_arbol'], d['op'], d['valor'], d['version']) for d in deltas] == [
+            ('avl', 'insertar', 1, 1), ('avl', 'insertar', 2, 2), ('avl', 'insertar', 3, 3),
+            ('abb', 'insertar', 9, 1), ('abb', 'eliminar', 9, 2)]
+        # La tercera inserción rota a la izquierda sobre 1 y deja 2 como raíz
+        assert (deltas[2]['rotaciones'], deltas[2]['raiz']) == ([{'tipo': 'izquierda', 'pivote': 1}], 2)
+        assert servicio.version('avl', 'a') == 3 and servicio.version('avl', 'b') == 0
+        assert servicio.version('abb', 'a') == 2
+    finally:
+        servicio.cerrar()
+
+
+def test_ruta_eventos(crear):
+    app = crear()
+    canal = app.extensions['arboles'].canal_eventos
+    # Sin el cliente de pruebas, que lee la primera parte antes de volver
+    cabeceras = {}
+    entorno = EnvironBuilder(path='/eventos', query_string={'tipo_arbol': 'abb', 'arbol_id': 'x'}).get_environ()
+    cuerpo = app(entorno, lambda estado, lista: cabeceras.update(lista))
+    assert cabeceras['Content-Type'].startswith('text/event-stream')
+    # Los deltas de otros árboles no llegan a este suscriptor
+    app.test_client().post('/limpiar', json={'tipo_arbol': 'abb', 'arbol_id': 'y'})
+    app.test_client().post('/limpiar', json={'tipo_arbol': 'avl', 'arbol_id': 'x'})
+    app.test_client().post('/limpiar', json={'tipo_arbol': 'abb', 'arbol_id': 'x'})
+    linea_id, linea_datos = next(iter(cuerpo)).decode().strip().split('\n')
+    assert linea_id == 'id: 1'
+    assert json.loads(linea_datos[len('data: '):]) == {'op': 'limpiar', 'tipo_arbol': 'abb', 'arbol_id': 'x',
+                                                       'version': 1}
+    # Al cerrar la conexión el suscriptor deja de recibir deltas
+    cuerpo.close()
+    assert canal._suscriptores == []
+
+
+def test_filtra_por_arbol():
+    canal = CanalEventos()
+    todos, de_avl, de_a = canal.suscribir(), canal.suscribir('avl'), canal.suscribir('avl', 'a')
+    canal.publicar('avl:a', {'op': 'limpiar'})
+    canal.publicar('avl:b', {'op': 'limpiar'})
+    canal.publicar('abb:a', {'op': 'limpiar'})
+    assert (todos.cola.qsize(), de_avl.cola.qsize(), de_a.cola.qsize()) == (3, 2, 1)
+
+
+def test_cola_llena_pide_resincronizar():
+    canal = CanalEventos(capacidad=2)
+    suscriptor = canal.suscribir()
+    flujo = canal.flujo(suscriptor, espera=0)
+    for _ in range(5):
+        canal.publicar('avl:a', {'op': 'limpiar'})
+    # Los deltas que no cabían se descartan y lo pendiente ya no se envía
+    assert suscriptor.cola.qsize() == 2 and suscriptor.desbordado
+    assert next(flujo) == 'event: resincronizar\ndata: {}\n\n'
+    assert suscriptor.cola.empty() and not suscriptor.desbordado
+    canal.publicar('avl:a', {'op': 'limpiar'})
+    assert next(flujo).startswith('id: 6\n')
+    flujo.close()
+    assert canal._suscriptores == []
+
+
+def test_lote_publica_solo_lo_eliminado(crear):
+    servicio = crear().extensions['arboles']
+    suscriptor = servicio.canal_eventos.suscribir('avl', 'a')
+    with servicio.mutar('avl', 'a') as entrada:
+        entrada.arbol.insertar_lote([1, 2, 3])
+    # Un lote agrupado como los que arma la cola de escrituras
+    servicio._aplicar_escrituras(('avl', 'a'), [_Escritura('eliminar', 7), _Escritura('eliminar', 8)])
+    assert suscriptor.cola.empty() and servicio.version('avl', 'a') == 0
+    servicio._aplicar_escrituras(('avl', 'a'), [_Escritura('eliminar', v) for v in (3, 8, 1)])
+    delta = suscriptor.cola.get_nowait()
+    assert (delta['op'], delta['operacion'], delta['valores']) == ('lote', 'eliminar', [1, 3])
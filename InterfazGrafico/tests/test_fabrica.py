@@ -0,0 +1,33 @@
+import importlib
+
+
+def test_importar_las_rutas_no_crea_estado():
+    rutas = importlib.import_module('rutas')
+    for nombre in ('registro', 'canal_eventos', 'escrituras', 'mapas'):
+        assert not hasattr(rutas, nombre)
+
+
+def test_cada_app_tiene_sus_arboles(crear):
+    primera, segunda = crear().test_client(), crear().test_client()
+    primera.post('/insertar', json={'valor': 7, 'tipo_arbol': 'avl'})
+
+    assert primera.get('/recorrido/inorden?tipo_arbol=avl').json == {'recorrido': [7]}
+    assert segunda.get('/recorrido/inorden?tipo_arbol=avl').json == {'recorrido': []}
+
+
+def test_la_configuracion_viene_de_la_app(crear):
+    app = crear(ARBOLES_MEMORIA_MB=1)
+    assert app.extensions['arboles'].registro.presupuesto_bytes == 1024 * 1024
+
+
+def test_visualizador_en_la_raiz_por_defecto(crear):
+    cliente = crear().test_client()
+    assert 'Visualizador' in cliente.get('/').get_data(as_text=True)
+    assert 'Visualizador' in cliente.get('/visualizador').get_data(as_text=True)
+    assert cliente.get('/inicio/').status_code == 200
+
+
+def test_inicio_en_raiz(crear):
+    cliente = crear(inicio_en_raiz=True).test_client()
+    assert 'Mi Página de Inicio' in cliente.get('/').get_data(as_text=True)
+    assert 'Visualizador' in cliente.get('/visualizador').get_data(as_text=True)
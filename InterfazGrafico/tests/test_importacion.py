@@ -0,0 +1,48 @@
+import io
+import os
+import random
+
+import importacion
+from arboles.avl import ArbolAVL
+from importacion import Progreso, construir, ordenar
+from test_avl import comprobar_avl
+
+
+def test_ordenar_por_corridas_en_disco(tmp_path, monkeypatch):
+    # Bloques de lectura pequeños: varias corridas de unos 1000 valores
+    monkeypatch.setattr(importacion, 'TAMANO_BLOQUE', 4096)
+    valores = random.Random(5).choices(range(-10 ** 6, 10 ** 6), k=5000)
+    flujo = io.BytesIO(('valor\n' + '\n'.join(map(str, valores)) + ' x7').encode())
+    progreso = Progreso()
+    ordenados = ordenar(flujo, progreso, memoria_valores=1000, directorio=str(tmp_path))
+    # 'valor' y 'x7' no son enteros: se descartan
+    assert (ordenados.cantidad, progreso.descartados, len(ordenados.corridas) > 1) == (5000, 2, True)
+    assert list(ordenados) == sorted(valores)
+    assert os.listdir(tmp_path) == []
+
+
+def test_construir_mezcla_con_el_arbol_existente(tmp_path):
+    existente = ArbolAVL.desde_ordenados([2, 4, 6])
+    ordenados = ordenar(io.BytesIO(b'5 1 3'), Progreso(), memoria_valores=2, directorio=str(tmp_path))
+    arbol = construir(ArbolAVL, ordenados, existente, 3)
+    assert comprobar_avl(arbol) == [1, 2, 3, 4, 5, 6]
+    assert os.listdir(tmp_path) == []
+
+
+def test_ruta_importar(cliente):
+    cliente.post('/insertar', json={'valor': 10, 'tipo_arbol': 'avl', 'arbol_id': 'i'})
+    respuesta = cliente.post('/importar?tipo_arbol=avl&arbol_id=i', data=b'3,1\n2')
+    datos = respuesta.get_json()
+    assert (datos['importados'], datos['descartados'], datos['nodos']) == (3, 0, 4)
+    assert cliente.get('/recorrido/inorden?tipo_arbol=avl&arbol_id=i').get_json() == {'recorrido': [1, 2, 3, 10]}
+
+    archivo = {'archivo': (io.BytesIO(b'7 8'), 'valores.txt'), 'tipo_arbol': 'abb', 'arbol_id': 'j'}
+    assert cliente.post('/importar', data=archivo).get_json()['nodos'] == 2
+
+
+def test_ruta_importar_con_errores(cliente):
+    respuesta = cliente.post('/importar', data=str(2 ** 64).encode())
+    assert (respuesta.status_code, respuesta.get_json()) == (
+        400, {'error': 'los valores deben caber en un entero de 64 bits'})
+    assert cliente.post('/importar?arbol_id=a/b', data=b'1').status_code == 400
+    assert cliente.get('/recorrido/inorden?tipo_arbol=avl').get_json() == {'recorrido': []}
@@ -0,0 +1,85 @@
+import random
+
+from arboles.abb import ArbolBinario
+
+
+def _nodos_fisicos(arbol):
+    cuenta, pila = 0, [arbol.raiz] if arbol.raiz else []
+    while pila:
+        nodo = pila.pop()
+        cuenta += 1
+        pila.extend(hijo for hijo in (nodo.hijo_izquierdo, nodo.hijo_derecho) if hijo)
+    return cuenta
+
+
+def _arbol(valores):
+    arbol = ArbolBinario()
+    for valor in valores:
+        arbol.insertar(valor)
+    return arbol
+
+
+def test_lapida_se_salta_y_se_revive():
+    arbol = _arbol([50, 30, 70, 20, 40, 60, 80, 10, 90])
+    assert arbol.eliminar_perezoso(40)
+    assert not arbol.eliminar_perezoso(40)
+    assert not arbol.buscar(40)
+    assert 40 not in arbol.inorden_morris()
+    assert (arbol.piso(45), arbol.techo(35)) == (30, 50)
+    assert _nodos_fisicos(arbol) == 9 and arbol.borrados == 1
+    assert arbol.cantidad() == 8
+
+    # Reinsertar revive la lápida en su sitio, sin nodo nuevo
+    arbol.insertar(40)
+    assert arbol.buscar(40) and arbol.borrados == 0
+    assert _nodos_fisicos(arbol) == 9
+
+
+def test_compactacion_al_superar_el_umbral():
+    valores = random.Random(23).sample(range(1000), 200)
+    arbol = _arbol(valores)
+    limite = int(arbol.umbral_compactacion * 200)
+    for valor in valores[:limite]:
+        arbol.eliminar_perezoso(valor)
+    assert arbol.borrados == limite
+    # La siguiente lápida supera el umbral: se compacta en un árbol balanceado
+    arbol.eliminar_perezoso(valores[limite])
+    vivos = sorted(valores[limite + 1:])
+    assert arbol.borrados == 0
+    assert _nodos_fisicos(arbol) == len(vivos)
+    assert arbol.inorden_morris() == vivos
+    assert arbol.altura() == len(vivos).bit_length()
+    assert arbol.estadisticas()['suma'] == sum(vivos)
+
+
+def test_eliminacion_fisica_iterativa_en_arbol_degenerado():
+    arbol = _arbol(range(5000))
+    for valor in range(0, 5000, 2):
+        assert arbol.eliminar(valor)
+    assert not arbol.eliminar(0)
+    assert arbol.inorden_morris() == list(range(1, 5000, 2))
+    assert arbol.estadisticas()['altura'] == 2500
+
+
+def test_eliminar_sucesor_con_dos_hijos():
+    arbol = _arbol([50, 30, 70, 60, 80, 65])
+    arbol.eliminar_perezoso(60)
+    # 50 toma el valor y el estado de lápida de su sucesor (60)
+    assert arbol.eliminar(50)
+    assert arbol.inorden_morris() == [30, 65, 70, 80]
+    assert arbol.borrados == 1
+
+
+def test_rutas_con_borrado_perezoso(crear):
+    app = crear(ARBOLES_ABB_PEREZOSO=True)
+    cliente = app.test_client()
+    for valor in range(1, 21):
+        cliente.post('/insertar', json={'valor': valor, 'tipo_arbol': 'abb'})
+    cliente.post('/eliminar', json={'valor': 7, 'tipo_arbol': 'abb'})
+
+    assert cliente.get('/estadisticas?tipo_arbol=abb').json['borrados'] == 1
+    assert 7 not in cliente.get('/recorrido/inorden?tipo_arbol=abb').json['recorrido']
+    assert '"borrado": true' in cliente.get('/estructura?tipo_arbol=abb').get_data(as_text=True)
+    # La lápida sigue ocupando memoria en el registro
+    with app.extensions['arboles'].registro.usar('abb', 'default') as entrada:
+        assert entrada.bytes == 20 * entrada.bytes_por_nodo
@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from arboles.mapa import MapaOrdenado
+from test_avl import comprobar_avl
+
+
+def test_mapa_coincide_con_dict_y_sigue_balanceado():
+    aleatorio = random.Random(3)
+    mapa, esperado = MapaOrdenado(), {}
+    for _ in range(2000):
+        clave = aleatorio.randrange(300)
+        if aleatorio.random() < 0.6:
+            mapa[clave] = esperado[clave] = aleatorio.random()
+        else:
+            assert mapa.pop(clave, None) == esperado.pop(clave, None)
+    assert comprobar_avl(mapa.arbol) == sorted(esperado)
+    assert len(mapa) == len(esperado)
+    assert list(mapa.items()) == sorted(esperado.items())
+
+
+def test_rangos_y_extremos():
+    mapa = MapaOrdenado((palabra, len(palabra)) for palabra in ['pera', 'ajo', 'kiwi', 'uva', 'lima'])
+    assert list(mapa.irange('b', 'lima')) == [('kiwi', 4), ('lima', 4)]
+    assert list(mapa.irange('kiwi', 'pera', inclusivo=(False, False))) == [('lima', 4)]
+    assert mapa.popitem_min() == ('ajo', 3) and mapa.popitem_max() == ('uva', 3)
+    with pytest.raises(KeyError):
+        mapa['ajo']
+    with pytest.raises(KeyError):
+        MapaOrdenado().popitem_min()
+
+
+def test_rutas_del_mapa(cliente):
+    assert cliente.post('/mapa', json={'clave': 'b', 'valor': [1, 2]}).get_json()['cantidad'] == 1
+    cliente.post('/mapa', json={'clave': 'a', 'valor': None})
+    assert cliente.get('/mapa?clave="b"').get_json() == {'clave': 'b', 'valor': [1, 2]}
+    assert cliente.get('/mapa/rango?limite=1').get_json() == {'pares': [['a', None]], 'cantidad': 2}
+    assert cliente.delete('/mapa?clave=a').get_json()['cantidad'] == 1
+    # Cada mapa_id es un mapa distinto
+    assert cliente.get('/mapa/rango?mapa_id=otro').get_json() == {'pares': [], 'cantidad': 0}
+
+
+def test_rutas_del_mapa_con_errores(cliente):
+    cliente.post('/mapa', json={'clave': 1, 'valor': 'uno'})
+    respuesta = cliente.get('/mapa?clave=2')
+    assert (respuesta.status_code, respuesta.get_json()) == (404, {'error': 'clave 2 no encontrada'})
+    assert cliente.delete('/mapa?clave=2').status_code == 404
+    casos = [
+        (cliente.get('/mapa'), 'falta el parámetro clave'),
+        (cliente.post('/mapa', json={'clave': 1}), 'se requieren clave y valor'),
+        (cliente.post('/mapa', json={'clave': [1], 'valor': 0}), 'la clave debe ser un número o una cadena'),
+        (cliente.post('/mapa', json={'clave': 'x', 'valor': 0}), 'la clave no es comparable con las claves del mapa'),
+        (cliente.get('/mapa?clave=1&mapa_id=a/b'), 'mapa_id inválido: use letras, números, "_" o "-" (máx. 64)'),
+    ]
+    for respuesta, mensaje in casos:
+        assert (respuesta.status_code, respuesta.get_json()) == (400, {'error': mensaje})
+    # El mapa no cambió con las peticiones rechazadas
+    assert cliente.get('/mapa/rango').get_json() == {'pares': [[1, 'uno']], 'cantidad': 1}
@@ -0,0 +1,79 @@
+import random
+from collections import Counter
+
+from arboles.avl import ArbolAVL
+from arboles.merkle import HASH_VACIO, ArbolAVLMerkle, hash_nodo
+from test_avl import comprobar_avl
+
+
+def _recalcular(nodo):
+    """Hash esperado del subárbol, comprobando de paso el guardado en cada nodo."""
+    if nodo is None:
+        return HASH_VACIO
+    esperado = hash_nodo(nodo.valor, _recalcular(nodo.izquierdo), _recalcular(nodo.derecho))
+    assert nodo.hash == esperado
+    return esperado
+
+
+def _diferencia(a, b):
+    return sorted((Counter(a) - Counter(b)).elements())
+
+
+def test_hashes_tras_cada_tipo_de_escritura():
+    aleatorio = random.Random(11)
+    arbol = ArbolAVLMerkle.desde_ordenados(range(0, 400, 4))
+    assert _recalcular(arbol.raiz) == arbol.hash_raiz()
+    for valor in aleatorio.sample(range(400), 60):
+        arbol.insertar(valor)
+    arbol.insertar_lote(aleatorio.randrange(400) for _ in range(50))
+    for valor in aleatorio.sample(arbol.inorden(), 40):
+        arbol.eliminar(valor)
+    arbol.eliminar_lote(aleatorio.sample(arbol.inorden(), 30))
+    comprobar_avl(arbol)
+    assert _recalcular(arbol.raiz) == arbol.hash_raiz()
+
+
+def test_mismo_contenido_y_forma_mismo_hash():
+    a = ArbolAVLMerkle.desde_ordenados(range(100))
+    b = ArbolAVLMerkle.desde_ordenados(range(100))
+    assert a.hash_raiz() == b.hash_raiz()
+    assert ArbolAVLMerkle().hash_raiz() == HASH_VACIO
+    assert a.subarbol('') is a.raiz
+    assert a.subarbol('iiiiiiiiii') is None
+
+
+def test_diferencias():
+    aleatorio = random.Random(13)
+    base = list(range(0, 2000, 2))
+    a, b = ArbolAVLMerkle.desde_ordenados(base), ArbolAVLMerkle.desde_ordenados(base)
+    for valor in aleatorio.sample(base, 5):
+        a.eliminar(valor)
+    for valor in (1, 999, 999, 4001):
+        b.insertar(valor)
+    solo_a, solo_b = a.diferencias(b)
+    assert solo_a == _diferencia(a.inorden(), b.inorden())
+    assert solo_b == _diferencia(b.inorden(), a.inorden())
+    # Contra un AVL sin hashes se compara su inorden completo
+    assert a.diferencias(ArbolAVL.desde_ordenados(b.inorden())) == (solo_a, solo_b)
+    assert a.diferencias(a) == ([], [])
+
+
+def test_rutas(crear):
+    cliente = crear(ARBOLES_MERKLE=True).test_client()
+    for arbol_id, valores in (('a', [1, 2, 3]), ('b', [2, 3, 4])):
+        for valor in valores:
+            cliente.post('/insertar', json={'valor': valor, 'tipo_arbol': 'avl', 'arbol_id': arbol_id})
+
+    raiz = cliente.get('/hash?arbol_id=a').json
+    assert (raiz['valor'], raiz['altura']) == (2, 2)
+    assert cliente.get('/hash?arbol_id=a&ruta=i').json['hash'] == raiz['izquierdo']
+    assert cliente.get('/hash?arbol_id=a&ruta=x').status_code == 400
+    datos = cliente.get('/diferencias?arbol_id=a&otro_id=b').json
+    assert (datos['solo_en_arbol'], datos['solo_en_otro'], datos['iguales']) == ([1], [4], False)
+    assert cliente.get('/diferencias?arbol_id=a&otro_id=..').status_code == 400
+
+
+def test_rutas_sin_merkle(cliente):
+    respuesta = cliente.get('/hash')
+    assert respuesta.status_code == 400
+    assert 'error' in respuesta.json
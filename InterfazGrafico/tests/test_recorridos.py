@@ -0,0 +1,111 @@
+import json
+import random
+
+import pytest
+
+from arboles.abb import ArbolBinario
+from arboles.adaptativo import ArbolAdaptativo
+from arboles.avl import ArbolAVL
+from arboles.recorridos import estructura_json, recorrido
+
+# Más niveles que el límite de recursión por defecto
+DEGENERADO = 5000
+
+
+def _degenerado(clase, n=DEGENERADO):
+    arbol = clase()
+    for valor in range(n):
+        arbol.insertar(valor)
+    return arbol
+
+
+def _anidado(nodo):
+    # Referencia recursiva, solo para árboles poco profundos
+    if nodo is None:
+        return None
+    izquierdo = nodo.hijo_izquierdo if hasattr(nodo, 'hijo_izquierdo') else nodo.izquierdo
+    derecho = nodo.hijo_derecho if hasattr(nodo, 'hijo_derecho') else nodo.derecho
+    return {'valor': nodo.valor, 'izquierdo': _anidado(izquierdo), 'derecho': _anidado(derecho)}
+
+
+@pytest.mark.parametrize('clase', [ArbolBinario, ArbolAVL])
+def test_recorridos_coinciden_con_los_recursivos(clase):
+    arbol = clase()
+    for valor in random.Random(1).sample(range(1000), 300):
+        arbol.insertar(valor)
+    # El ABB conserva sus versiones recursivas con sufijo; las del AVL no lo llevan
+    sufijo = '_recursivo' if clase is ArbolBinario else ''
+    esperados = {tipo: getattr(arbol, tipo + sufijo)() for tipo in ('inorden', 'preorden', 'postorden')}
+    for tipo, esperado in esperados.items():
+        assert recorrido(arbol, tipo) == esperado
+    # Morris deshace sus enlaces temporales: el árbol queda igual
+    assert recorrido(arbol, 'inorden') == esperados['inorden']
+    assert json.loads(estructura_json(arbol.raiz)) == _anidado(arbol.raiz)
+
+
+def test_abb_degenerado_sin_recursion():
+    arbol = _degenerado(ArbolBinario)
+    assert recorrido(arbol, 'inorden') == list(range(DEGENERADO))
+    assert recorrido(arbol, 'preorden') == list(range(DEGENERADO))
+    assert recorrido(arbol, 'postorden') == list(range(DEGENERADO - 1, -1, -1))
+    texto = estructura_json(arbol.raiz)
+    assert texto.startswith('{"valor": 0, "izquierdo": null, "derecho": {"valor": 1,')
+    assert texto.count('{') == DEGENERADO
+
+
+def test_lapidas_en_el_json():
+    arbol = ArbolBinario()
+    # Pocas lápidas para no llegar al umbral de compactación
+    for valor in (4, 2, 6, 1, 3, 5, 7):
+        arbol.insertar(valor)
+    arbol.eliminar_perezoso(1)
+    assert json.loads(estructura_json(arbol.raiz))['izquierdo']['izquierdo'] == {
+        'valor': 1, 'izquierdo': None, 'derecho': None, 'borrado': True}
+    assert recorrido(arbol, 'postorden') == [3, 2, 5, 7, 6, 4]
+
+
+def test_tipo_desconocido():
+    assert recorrido(ArbolAVL(), 'zigzag') == []
+
+
+@pytest.mark.parametrize('tipo_arbol', ['abb', 'adaptativo'])
+def test_rutas_con_arbol_degenerado(cliente, tipo_arbol):
+    for valor in range(DEGENERADO):
+        cliente.post('/insertar', json={'valor': valor, 'tipo_arbol': tipo_arbol})
+
+    respuesta = cliente.get(f'/recorrido/postorden?tipo_arbol={tipo_arbol}')
+    assert respuesta.status_code == 200
+    assert len(respuesta.json['recorrido']) == DEGENERADO
+    respuesta = cliente.get(f'/estructura?tipo_arbol={tipo_arbol}')
+    assert respuesta.status_code == 200
+    # Una versión por inserción (más las migraciones del adaptativo)
+    version = int(respuesta.get_data(as_text=True).rpartition('"version": ')[2].rstrip('}'))
+    assert version >= DEGENERADO
+
+
+def test_adaptativo_migra_con_entradas_ordenadas():
+    arbol = _degenerado(ArbolAdaptativo, 500)
+    arbol.completar_migracion()
+    assert recorrido(arbol, 'inorden') == list(range(500))
+
+
+def test_todas_las_inserciones_usan_clase_nodo():
+    from arboles.abb import Nodo
+
+    class NodoMarcado(Nodo):
+        pass
+
+    class ArbolMarcado(ArbolBinario):
+        clase_nodo = NodoMarcado
+
+    arbol = ArbolMarcado.desde_ordenados([10, 20])
+    arbol.insertar(5)
+    arbol.insertar_nodo_recursivo(15)
+    arbol.insertar_lote([1, 30, 31])
+    pila, tipos = [arbol.raiz], set()
+    while pila:
+        nodo = pila.pop()
+        tipos.add(type(nodo))
+        pila.extend(hijo for hijo in (nodo.hijo_izquierdo, nodo.hijo_derecho) if hijo is not None)
+    assert tipos == {NodoMarcado}
+    assert arbol.inorden_recursivo() == [1, 5, 10, 15, 20, 30, 31]
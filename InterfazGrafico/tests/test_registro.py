@@ -0,0 +1,83 @@
+import os
+
+from registro import BYTES_POR_NODO, RegistroArboles
+
+
+def _llenar(registro, tipo, arbol_id, valores):
+    with registro.usar(tipo, arbol_id) as entrada:
+        for valor in valores:
+            entrada.arbol.insertar(valor)
+
+
+def test_nodos_segun_la_cuenta_del_arbol():
+    registro = RegistroArboles(10 ** 9)
+    try:
+        _llenar(registro, 'avl', 'a', [5, 3, 8, 3])
+        with registro.usar('avl', 'a') as entrada:
+            entrada.arbol.eliminar(8)
+            assert entrada.nodos == entrada.arbol.cantidad() == 3
+            assert entrada.bytes == 3 * BYTES_POR_NODO['avl']
+    finally:
+        registro.cerrar()
+
+
+def test_desalojo_lru_y_recarga_transparente():
+    registro = RegistroArboles(0)
+    try:
+        _llenar(registro, 'abb', 'a', [5, 3, 8, 1])
+        _llenar(registro, 'avl', 'b', range(10))
+        # Con presupuesto 0 solo se conserva el árbol más reciente
+        assert registro.desalojos == 1
+        assert {(a['arbol_id'], a['en_memoria']) for a in registro.listar()} == {('a', False), ('b', True)}
+        with registro.usar('abb', 'a') as entrada:
+            # El preorden de la instantánea conserva la forma del ABB
+            assert entrada.arbol.preorden_recursivo() == [5, 3, 1, 8]
+        assert registro.recargas == 1
+        assert registro.existe('avl', 'b') and not registro.existe('abb', 'c')
+    finally:
+        registro.cerrar()
+
+
+def test_usar_anidado_no_desaloja_el_arbol_de_afuera():
+    registro = RegistroArboles(0)
+    try:
+        _llenar(registro, 'avl', 'a', [1, 2, 3])
+        with registro.usar('avl', 'a') as afuera:
+            # Como /diferencias: el otro árbol pasa a ser el más reciente
+            _llenar(registro, 'avl', 'b', [4])
+            assert not afuera.desalojada
+            afuera.arbol.insertar(5)
+        # Al soltarlo sí se desaloja, con la inserción hecha dentro
+        assert afuera.desalojada and registro.desalojos == 1
+        with registro.usar('avl', 'a') as entrada:
+            assert entrada.arbol.inorden() == [1, 2, 3, 5]
+    finally:
+        registro.cerrar()
+
+
+def test_cerrar_borra_el_directorio_temporal():
+    registro = RegistroArboles(0)
+    _llenar(registro, 'abb', 'a', [1])
+    _llenar(registro, 'abb', 'b', [2])
+    assert os.listdir(registro.directorio) == ['abb-a.pickle']
+    registro.cerrar()
+    assert not os.path.exists(registro.directorio)
+
+
+def test_registro_persistente_guarda_y_precalienta(tmp_path):
+    registro = RegistroArboles(10 ** 9, directorio=str(tmp_path))
+    _llenar(registro, 'avl', 'a', [4, 2, 6])
+    with registro.usar('mapa', 'm') as entrada:
+        entrada.arbol['x'] = 1
+    registro.cerrar()
+    assert sorted(os.listdir(tmp_path)) == ['avl-a.pickle', 'mapa-m.pickle']
+
+    nuevo = RegistroArboles(10 ** 9, directorio=str(tmp_path))
+    try:
+        assert nuevo.precalentar() == 2
+        with nuevo.usar('avl', 'a') as entrada:
+            assert entrada.arbol.inorden() == [2, 4, 6]
+        with nuevo.usar('mapa', 'm') as entrada:
+            assert list(entrada.arbol.items()) == [('x', 1)]
+    finally:
+        nuevo.cerrar()
@@ -1,11 +1,13 @@
+import os
+import sys
 
-from flask import Flask
-from controllers.home_controller import index
+# La app (rutas del visualizador y de la página de inicio) se arma en InterfazGrafico/fabrica.py
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "InterfazGrafico"))
 
-app = Flask(__name__)
+from fabrica import crear_app
 
-# Registrar rutas
-app.add_url_rule("/", view_func=index)
+# Como antes de la fábrica, / es la página de inicio; el visualizador queda en /visualizador
+app = crear_app(inicio_en_raiz=True)
 
 if __name__ == "__main__":
-    app.run(host='0.0.0.0', port=8000, debug=True)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=8000, debug=True)
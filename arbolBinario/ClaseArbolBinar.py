@@ -1,3 +1,6 @@
+from typing import Iterator
+
+
 class Nodo:
     """
     Clase que representa un nodo de un árbol binario.
@@ -40,7 +43,7 @@ class ArbolBinario:
     - Altura (en niveles)
     - Cantidad (número de nodos)
     - Amplitud (recorrido por niveles / BFS)
-    - InOrden (rec/it), PreOrden (rec/it), PostOrden (rec/it)
+    - InOrden (rec/it/Morris), PreOrden (rec/it/Morris), PostOrden (rec/it)
     """
 
     def __init__(self) -> None:
@@ -218,6 +221,55 @@ class ArbolBinario:
                 actual = actual.hijo_derecho
         return False
 
+    # -------------------- Eliminar --------------------
+    def eliminar(self, valor: int) -> bool:
+        """
+        Elimina una aparición de un valor del árbol (iterativo, sin recursión).
+
+        Si el nodo tiene dos hijos, toma el valor de su sucesor en inorden
+        (el menor del subárbol derecho) y se desengancha el sucesor.
+
+        Args:
+            valor (int): Valor a eliminar.
+        Returns:
+            bool: True si el valor estaba y se eliminó, False en caso contrario.
+        """
+        padre: Nodo | None = None
+        actual = self.raiz
+        while actual and actual.valor != valor:
+            padre = actual
+            actual = actual.hijo_izquierdo if valor < actual.valor else actual.hijo_derecho
+        if actual is None:
+            return False
+
+        if actual.hijo_izquierdo and actual.hijo_derecho:
+            padre, sucesor = actual, actual.hijo_derecho
+            while sucesor.hijo_izquierdo:
+                padre, sucesor = sucesor, sucesor.hijo_izquierdo
+            actual.valor = sucesor.valor
+            actual = sucesor
+
+        # Ahora `actual` tiene como mucho un hijo: ese hijo ocupa su lugar
+        hijo = actual.hijo_izquierdo or actual.hijo_derecho
+        if padre is None:
+            self.raiz = hijo
+        elif padre.hijo_izquierdo is actual:
+            padre.hijo_izquierdo = hijo
+        else:
+            padre.hijo_derecho = hijo
+        return True
+
+    def Eliminar(self, valor: int) -> bool:
+        """
+        Elimina un valor del árbol (alias con mayúscula).
+
+        Args:
+            valor (int): Valor a eliminar.
+        Returns:
+            bool: True si el valor estaba y se eliminó, False en caso contrario.
+        """
+        return self.eliminar(valor)
+
     # -------------------- Altura (niveles) --------------------
     def altura(self) -> int:
         """
@@ -341,6 +393,56 @@ class ArbolBinario:
             actual = actual.hijo_derecho
         return resultado
 
+    def inorden_morris(self) -> list[int]:
+        """
+        Devuelve los valores en recorrido inorden con el algoritmo de Morris.
+
+        Usa O(1) memoria auxiliar: en lugar de una pila, enlaza temporalmente
+        el predecesor de cada nodo con el nodo y deshace el enlace al volver.
+        El árbol no debe modificarse mientras tanto.
+        
+        Returns:
+            list[int]: Lista de valores en orden.
+        """
+        resultado: list[int] = []
+        actual = self.raiz
+        while actual:
+            if actual.hijo_izquierdo is None:
+                resultado.append(actual.valor)
+                actual = actual.hijo_derecho
+                continue
+            predecesor = actual.hijo_izquierdo
+            while predecesor.hijo_derecho and predecesor.hijo_derecho is not actual:
+                predecesor = predecesor.hijo_derecho
+            if predecesor.hijo_derecho is None:
+                predecesor.hijo_derecho = actual  # enlace temporal
+                actual = actual.hijo_izquierdo
+            else:
+                predecesor.hijo_derecho = None  # se restaura el árbol
+                resultado.append(actual.valor)
+                actual = actual.hijo_derecho
+        return resultado
+
+    def iter_inorden(self) -> Iterator[int]:
+        """
+        Genera los valores en inorden de forma perezosa.
+
+        Usa una pila de O(h): Morris no sirve aquí porque, si el generador se
+        abandona a mitad, quedarían enlaces temporales en el árbol.
+        
+        Yields:
+            int: Siguiente valor en orden.
+        """
+        pila: list[Nodo] = []
+        actual = self.raiz
+        while pila or actual:
+            while actual:
+                pila.append(actual)
+                actual = actual.hijo_izquierdo
+            actual = pila.pop()
+            yield actual.valor
+            actual = actual.hijo_derecho
+
     def preorden_recursivo(self) -> list[int]:
         """
         Devuelve los valores en recorrido preorden de forma recursiva.
@@ -378,6 +480,34 @@ class ArbolBinario:
                 pila.append(nodo.hijo_izquierdo)
         return resultado
 
+    def preorden_morris(self) -> list[int]:
+        """
+        Devuelve los valores en recorrido preorden con el algoritmo de Morris.
+
+        Usa O(1) memoria auxiliar (ver `inorden_morris`).
+        
+        Returns:
+            list[int]: Lista de valores en preorden.
+        """
+        resultado: list[int] = []
+        actual = self.raiz
+        while actual:
+            if actual.hijo_izquierdo is None:
+                resultado.append(actual.valor)
+                actual = actual.hijo_derecho
+                continue
+            predecesor = actual.hijo_izquierdo
+            while predecesor.hijo_derecho and predecesor.hijo_derecho is not actual:
+                predecesor = predecesor.hijo_derecho
+            if predecesor.hijo_derecho is None:
+                resultado.append(actual.valor)
+                predecesor.hijo_derecho = actual  # enlace temporal
+                actual = actual.hijo_izquierdo
+            else:
+                predecesor.hijo_derecho = None  # se restaura el árbol
+                actual = actual.hijo_derecho
+        return resultado
+
     def postorden_recursivo(self) -> list[int]:
         """
         Devuelve los valores en recorrido postorden de forma recursiva.
@@ -434,5 +564,8 @@ if __name__ == "__main__":
     print("InOrden iterativo:", arbol.inorden_iterativo())
     print("PreOrden recursivo:", arbol.preorden_recursivo())
     print("PreOrden iterativo:", arbol.preorden_iterativo())
+    print("InOrden Morris:", arbol.inorden_morris())
+    print("PreOrden Morris:", arbol.preorden_morris())
     print("PostOrden recursivo:", arbol.postorden_recursivo())
-    print("PostOrden iterativo:", arbol.postorden_iterativo())
\ No newline at end of file
+    print("PostOrden iterativo:", arbol.postorden_iterativo())
+    print("Eliminar(90):", arbol.Eliminar(90), "->", arbol.inorden_iterativo())
\ No newline at end of file
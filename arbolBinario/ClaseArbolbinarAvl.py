@@ -172,6 +172,52 @@ class ArbolAVL:
         _post(self.raiz)
         return res
 
+    def inorden_morris(self) -> List[int]:
+        """Inorden de Morris: O(1) memoria auxiliar, sin pila ni recursión.
+
+        Enlaza temporalmente cada predecesor con su nodo y deshace el enlace
+        al volver; el árbol no debe modificarse durante el recorrido.
+        """
+        res: List[int] = []
+        actual = self.raiz
+        while actual:
+            if actual.izquierdo is None:
+                res.append(actual.valor)
+                actual = actual.derecho
+                continue
+            pred = actual.izquierdo
+            while pred.derecho and pred.derecho is not actual:
+                pred = pred.derecho
+            if pred.derecho is None:
+                pred.derecho = actual
+                actual = actual.izquierdo
+            else:
+                pred.derecho = None
+                res.append(actual.valor)
+                actual = actual.derecho
+        return res
+
+    def preorden_morris(self) -> List[int]:
+        """Preorden de Morris: O(1) memoria auxiliar (ver `inorden_morris`)."""
+        res: List[int] = []
+        actual = self.raiz
+        while actual:
+            if actual.izquierdo is None:
+                res.append(actual.valor)
+                actual = actual.derecho
+                continue
+            pred = actual.izquierdo
+            while pred.derecho and pred.derecho is not actual:
+                pred = pred.derecho
+            if pred.derecho is None:
+                res.append(actual.valor)
+                pred.derecho = actual
+                actual = actual.izquierdo
+            else:
+                pred.derecho = None
+                actual = actual.derecho
+        return res
+
 
 if __name__ == "__main__":
     avl = ArbolAVL()
@@ -1,8 +1,12 @@
-from flask import render_template
+from flask import Blueprint, render_template
 
+# Plantillas en templates/home/: el visualizador ya usa templates/index.html
+home = Blueprint("home", __name__, template_folder="../templates")
+
+@home.route("/")
 def index():
     data = {
         "title": "Mi Página de Inicio",
         "message": "Bienvenido a mi sitio web!"
     }
-    return render_template("index.html", data=data)
\ No newline at end of file
+    return render_template("home/index.html", data=data)